@@ -6,17 +6,26 @@ Dashboard interaktif untuk menganalisis data penjualan, pengiriman, dan pembayar
 import streamlit as st
 import pandas as pd
 from utils.data_processor import (
+    find_kaggle_csv,
     load_from_kaggle,
     load_from_csv,
-    validate_dataframe,
-    clean_and_transform,
-    get_date_range
+    read_csv_header,
+    compute_fingerprint,
+    get_date_range,
+    format_bytes
 )
-from components.overview import render_overview
-from components.sales_analysis import render_sales_analysis
-from components.shipping_analysis import render_shipping_analysis
-from components.payment_analysis import render_payment_analysis
-from components.geographic_analysis import render_geographic_analysis
+from utils import dataset_cache, partitioned_store, polars_pipeline, sql_backend
+from utils.dataset_registry import open_dataset, get_dataset_registry
+from utils.figure_cache import get_figure_cache
+from utils.schema import COLUMN_SCHEMA
+from components.overview import render_overview, COLUMNS as OVERVIEW_COLUMNS
+from components.sales_analysis import render_sales_analysis, COLUMNS as SALES_COLUMNS
+from components.shipping_analysis import render_shipping_analysis, COLUMNS as SHIPPING_COLUMNS
+from components.payment_analysis import render_payment_analysis, COLUMNS as PAYMENT_COLUMNS
+from components.geographic_analysis import render_geographic_analysis, COLUMNS as GEOGRAPHIC_COLUMNS
+from components.raw_data import render_raw_data, render_raw_data_pages
+from components.navigation import render_sections
+from components.filter_panel import render_filter_panel, render_filter_widgets
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -79,10 +88,55 @@ with st.sidebar:
     st.divider()
     
     # Initialize session state untuk data
-    if 'df' not in st.session_state:
-        st.session_state.df = None
+    # Sesi hanya menyimpan handle; DataFrame-nya dipakai bersama lewat registry proses
+    if 'dataset' not in st.session_state:
+        st.session_state.dataset = None
     if 'data_loaded' not in st.session_state:
         st.session_state.data_loaded = False
+    # Mode out-of-core: sesi menyimpan dataset Parquet terpartisi, bukan DataFrame
+    if 'store' not in st.session_state:
+        st.session_state.store = None
+    
+    # Opsi lanjutan: secara default hanya kolom yang dipakai dashboard yang dibaca
+    advanced_options = st.expander("⚙️ Opsi Lanjutan")
+    with advanced_options:
+        load_all_columns = st.checkbox(
+            "Muat semua kolom",
+            help="Secara default hanya kolom yang dipakai dashboard yang dibaca agar parsing lebih cepat dan hemat memori"
+        )
+        compact_mode = st.checkbox(
+            "Mode hemat memori",
+            value=True,
+            help="Simpan kolom teks sebagai kategori dan turunkan tipe numerik (mis. int32, float32)"
+        )
+        # Mesin agregasi opsional (DuckDB) jika terpasang; hasilnya sama dengan pandas
+        backends = sql_backend.available_backends()
+        if len(backends) > 1:
+            st.radio(
+                "Mesin agregasi",
+                backends,
+                index=backends.index(sql_backend.get_backend()),
+                horizontal=True,
+                key='backend',
+                help="DuckDB menjalankan agregasi cube dan bucket sebagai SQL multi-thread; default bisa diatur lewat ECOMMERCE_BACKEND"
+            )
+        # Pipeline pemuatan opsional (Polars lazy) jika terpasang; hasilnya sama dengan pandas
+        pipelines = polars_pipeline.available_pipelines()
+        if len(pipelines) > 1:
+            st.radio(
+                "Pipeline pemuatan",
+                pipelines,
+                index=pipelines.index(polars_pipeline.get_pipeline()),
+                horizontal=True,
+                key='load_pipeline',
+                help="Polars menjalankan parsing, konversi tipe, dan kolom waktu sebagai satu rencana lazy multi-thread; default bisa diatur lewat ECOMMERCE_PIPELINE"
+            )
+        out_of_core = partitioned_store.is_available() and st.checkbox(
+            "Mode out-of-core (Parquet terpartisi)",
+            help="Tulis data ke Parquet terpartisi per Tahun/Bulan lalu baca hanya kolom dan partisi yang dibutuhkan tiap bagian; untuk riwayat yang tidak muat di memori"
+        )
+        if dataset_cache.is_available() and st.button("🗑️ Kosongkan Cache Dataset", use_container_width=True):
+            st.toast(f"🗑️ {dataset_cache.clear() + partitioned_store.clear()} file/dataset cache dihapus")
     
     # Mode 1: Load dari Kaggle
     if data_source == "🌐 Load dari Kaggle":
@@ -90,18 +144,35 @@ with st.sidebar:
         
         if st.button("🚀 Muat Data dari Kaggle", type="primary", use_container_width=True):
             with st.spinner("⏳ Memuat data dari Kaggle..."):
-                df = load_from_kaggle()
+                csv_file = find_kaggle_csv()
                 
-                if df is not None:
-                    # Validasi data
-                    is_valid, message = validate_dataframe(df)
+                if csv_file is not None:
+                    # Hasil bersih diambil dari cache disk jika file sumber tidak berubah
+                    extra_columns = None if load_all_columns else ()
+                    handle, store = None, None
+                    if out_of_core:
+                        store, message = partitioned_store.ingest(
+                            csv_file,
+                            compute_fingerprint(csv_file),
+                            extra_columns,
+                            compact_mode
+                        )
+                    else:
+                        handle, message = open_dataset(
+                            compute_fingerprint(csv_file),
+                            lambda: load_from_kaggle(extra_columns, csv_file),
+                            extra_columns,
+                            compact_mode,
+                            polars_pipeline.pipeline_for(csv_file, extra_columns, compact_mode)
+                        )
                     
-                    if is_valid:
-                        # Clean dan transform
-                        df = clean_and_transform(df)
-                        st.session_state.df = df
+                    if handle is not None or store is not None:
+                        st.session_state.dataset = handle
+                        st.session_state.store = store
                         st.session_state.data_loaded = True
-                        st.success(f"✅ Data berhasil dimuat! ({len(df):,} baris)")
+                        st.session_state.pipeline_key = ('kaggle', load_all_columns, compact_mode, out_of_core)
+                        num_rows = store.num_rows if store is not None else len(handle.df)
+                        st.success(f"✅ Data berhasil dimuat! ({num_rows:,} baris)")
                     else:
                         st.error(f"❌ {message}")
                 else:
@@ -118,32 +189,90 @@ with st.sidebar:
         )
         
         if uploaded_file is not None:
-            with st.spinner("⏳ Memproses file CSV..."):
-                df = load_from_csv(uploaded_file)
+            # Fingerprint konten dan header dihitung sekali per upload (file_id unik untuk tiap upload)
+            upload_info = st.session_state.get('upload_info')
+            if upload_info is None or upload_info[0] != uploaded_file.file_id:
+                upload_info = (
+                    uploaded_file.file_id,
+                    compute_fingerprint(uploaded_file),
+                    read_csv_header(uploaded_file)
+                )
+                st.session_state.upload_info = upload_info
+            _, upload_fingerprint, upload_header = upload_info
+            
+            # Kolom di luar skema dashboard yang ingin ikut dimuat
+            extra_columns = None
+            if not load_all_columns:
+                with advanced_options:
+                    extra_options = [col for col in upload_header if col not in COLUMN_SCHEMA]
+                    extra_columns = tuple(st.multiselect(
+                        "Kolom tambahan:",
+                        extra_options,
+                        help="Kolom dari file yang tidak dipakai dashboard tetapi ingin ditampilkan di Data Mentah"
+                    ))
+            
+            # Pipeline load → validasi → clean hanya dijalankan jika file atau opsinya berubah,
+            # rerun karena slider/tab/pagination cukup memakai hasil yang tersimpan
+            pipeline_key = ('upload', upload_fingerprint, extra_columns, compact_mode, out_of_core)
+            
+            if st.session_state.get('pipeline_key') != pipeline_key:
+                st.session_state.pipeline_key = pipeline_key
+                st.session_state.pipeline_error = None
                 
-                if df is not None:
-                    # Validasi data
-                    is_valid, message = validate_dataframe(df)
+                with st.spinner("⏳ Memproses file CSV..."):
+                    handle, store = None, None
+                    if out_of_core:
+                        store, message = partitioned_store.ingest(
+                            uploaded_file,
+                            upload_fingerprint,
+                            extra_columns,
+                            compact_mode
+                        )
+                    else:
+                        handle, message = open_dataset(
+                            upload_fingerprint,
+                            lambda: load_from_csv(uploaded_file, extra_columns),
+                            extra_columns,
+                            compact_mode,
+                            polars_pipeline.pipeline_for(uploaded_file, extra_columns, compact_mode)
+                        )
                     
-                    if is_valid:
-                        # Clean dan transform
-                        df = clean_and_transform(df)
-                        st.session_state.df = df
+                    if handle is not None or store is not None:
+                        st.session_state.dataset = handle
+                        st.session_state.store = store
                         st.session_state.data_loaded = True
-                        st.success(f"✅ Data berhasil dimuat! ({len(df):,} baris)")
+                        num_rows = store.num_rows if store is not None else len(handle.df)
+                        st.success(f"✅ Data berhasil dimuat! ({num_rows:,} baris)")
                     else:
-                        st.error(f"❌ {message}")
+                        st.session_state.pipeline_error = message
+            
+            if st.session_state.get('pipeline_error'):
+                st.error(f"❌ {st.session_state.pipeline_error}")
     
     # Informasi data jika sudah dimuat
-    if st.session_state.data_loaded and st.session_state.df is not None:
+    if st.session_state.data_loaded and st.session_state.dataset is not None:
         st.divider()
         st.subheader("ℹ️ Informasi Data")
         
-        df = st.session_state.df
+        df = st.session_state.dataset.df
         
         st.metric("📊 Total Baris", f"{len(df):,}")
         st.metric("📋 Total Kolom", f"{len(df.columns):,}")
         
+        if 'memory_bytes' in df.attrs:
+            st.metric("💾 Memori", format_bytes(df.attrs['memory_bytes']))
+        
+        # Encoding hasil deteksi saat file dibaca
+        if 'encoding' in df.attrs:
+            st.write(f"🔤 **Encoding:** {df.attrs['encoding']} (keyakinan {df.attrs['encoding_confidence']:.0%})")
+        
+        # Dataset dipakai bersama antar sesi; tampilkan jumlah salinan di memori
+        num_datasets, num_handles = get_dataset_registry().stats()
+        st.caption(f"🧠 {num_datasets} dataset di memori server, dipakai {num_handles} sesi")
+        
+        num_figures, figure_hits, figure_misses = get_figure_cache().stats()
+        st.caption(f"🖼️ {num_figures} grafik di cache (hit {figure_hits:,}, miss {figure_misses:,})")
+        
         # Rentang tanggal
         start_date, end_date = get_date_range(df)
         st.write(f"📅 **Periode Data:**")
@@ -151,90 +280,93 @@ with st.sidebar:
         
         # Tombol untuk reset data
         if st.button("🔄 Reset Data", use_container_width=True):
-            st.session_state.df = None
+            st.session_state.dataset.release()
+            st.session_state.dataset = None
             st.session_state.data_loaded = False
+            st.session_state.pipeline_key = None
             st.rerun()
-
-# Main content
-if st.session_state.data_loaded and st.session_state.df is not None:
-    df = st.session_state.df
-    
-    # Tabs untuk navigasi
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-        "📊 Overview",
-        "📈 Analisis Penjualan",
-        "🚚 Analisis Pengiriman",
-        "💳 Analisis Pembayaran",
-        "🗺️ Analisis Geografis",
-        "📋 Data Mentah"
-    ])
-    
-    with tab1:
-        render_overview(df)
-    
-    with tab2:
-        render_sales_analysis(df)
-    
-    with tab3:
-        render_shipping_analysis(df)
-    
-    with tab4:
-        render_payment_analysis(df)
+        
+        # Filter global berlaku untuk semua bagian dashboard
+        st.divider()
+        filtered_df = render_filter_panel(df)
     
-    with tab5:
-        render_geographic_analysis(df)
+    # Dataset terpartisi bisa dihapus dari disk (eviction LRU atau kosongkan cache)
+    if st.session_state.store is not None and not st.session_state.store.exists:
+        st.session_state.store = None
+        st.session_state.data_loaded = False
+        st.session_state.pipeline_key = None
+        st.warning("⚠️ Dataset terpartisi sudah dihapus dari disk, silakan muat ulang data")
     
-    with tab6:
-        st.header("📋 Data Mentah")
+    # Mode out-of-core: informasi dari metadata dataset terpartisi, tanpa membaca baris
+    if st.session_state.data_loaded and st.session_state.store is not None:
+        st.divider()
+        st.subheader("ℹ️ Informasi Data")
         
-        st.info(f"📊 Menampilkan {len(df):,} baris data")
+        store = st.session_state.store
         
-        # Filter kolom
-        all_columns = df.columns.tolist()
-        selected_columns = st.multiselect(
-            "Pilih kolom yang ingin ditampilkan:",
-            all_columns,
-            default=all_columns[:10] if len(all_columns) > 10 else all_columns
-        )
+        st.metric("📊 Total Baris", f"{store.num_rows:,}")
+        st.metric("📋 Total Kolom", f"{len(store.columns):,}")
+        st.metric("💽 Parquet di Disk", format_bytes(store.disk_bytes))
+        st.write(f"🔤 **Encoding:** {store.encoding} (keyakinan {store.encoding_confidence:.0%})")
+        st.caption(f"🗂️ {store.num_partitions} partisi Tahun/Bulan; tiap bagian hanya membaca kolom dan partisi yang dibutuhkan")
         
-        if selected_columns:
-            # Pagination
-            rows_per_page = st.selectbox("Baris per halaman:", [10, 25, 50, 100, 500], index=2)
-            total_pages = (len(df) - 1) // rows_per_page + 1
-            page = st.number_input("Halaman:", min_value=1, max_value=total_pages, value=1)
-            
-            start_idx = (page - 1) * rows_per_page
-            end_idx = min(start_idx + rows_per_page, len(df))
-            
-            st.dataframe(
-                df[selected_columns].iloc[start_idx:end_idx],
-                use_container_width=True,
-                height=600
-            )
-            
-            st.caption(f"Menampilkan baris {start_idx + 1} - {end_idx} dari {len(df):,} total baris")
-            
-            # Download data
-            st.divider()
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                csv = df[selected_columns].to_csv(index=False).encode('utf-8')
-                st.download_button(
-                    label="📥 Download Data (CSV)",
-                    data=csv,
-                    file_name="ecommerce_data.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
-            
-            with col2:
-                # Statistik deskriptif
-                if st.button("📊 Lihat Statistik Deskriptif", use_container_width=True):
-                    st.subheader("📊 Statistik Deskriptif")
-                    st.dataframe(df[selected_columns].describe(), use_container_width=True)
-        else:
-            st.warning("⚠️ Pilih minimal satu kolom untuk ditampilkan")
+        if store.date_bounds is not None:
+            start_date, end_date = store.date_bounds
+            st.write("📅 **Periode Data:**")
+            st.write(f"{start_date:%d %B %Y} - {end_date:%d %B %Y}")
+        
+        if st.button("🔄 Reset Data", use_container_width=True, key='reset_store'):
+            st.session_state.store = None
+            st.session_state.data_loaded = False
+            st.session_state.pipeline_key = None
+            st.rerun()
+        
+        # Filter didorong ke scan Parquet; jumlah baris dihitung tanpa memuat kolom lain
+        st.divider()
+        global_filters = render_filter_widgets(store.options, store.date_bounds)
+        num_filtered = partitioned_store.count_rows(store, global_filters)
+        if global_filters.active:
+            st.caption(f"🔎 {num_filtered:,} dari {store.num_rows:,} baris ({num_filtered / store.num_rows:.1%})")
+
+# Bagian dashboard dan kolom yang dibaca masing-masing dalam mode out-of-core
+# (Data Mentah membaca per halaman sendiri, lihat render_raw_data_pages)
+SECTIONS = {
+    "📊 Overview": render_overview,
+    "📈 Analisis Penjualan": render_sales_analysis,
+    "🚚 Analisis Pengiriman": render_shipping_analysis,
+    "💳 Analisis Pembayaran": render_payment_analysis,
+    "🗺️ Analisis Geografis": render_geographic_analysis,
+    "📋 Data Mentah": render_raw_data
+}
+SECTION_COLUMNS = {
+    "📊 Overview": OVERVIEW_COLUMNS,
+    "📈 Analisis Penjualan": SALES_COLUMNS,
+    "🚚 Analisis Pengiriman": SHIPPING_COLUMNS,
+    "💳 Analisis Pembayaran": PAYMENT_COLUMNS,
+    "🗺️ Analisis Geografis": GEOGRAPHIC_COLUMNS
+}
+
+# Main content
+if st.session_state.data_loaded and st.session_state.store is not None:
+    if num_filtered == 0:
+        st.warning("⚠️ Tidak ada data yang cocok dengan filter global. Ubah atau kosongkan filter di sidebar.")
+    else:
+        # Setiap bagian membaca hasil query-nya sendiri dari Parquet (di-cache per kolom dan filter)
+        store_sections = dict(SECTIONS)
+        store_sections["📋 Data Mentah"] = lambda _: render_raw_data_pages(store, global_filters)
+        render_sections(
+            store_sections,
+            lambda section: partitioned_store.read_view(store, SECTION_COLUMNS[section], global_filters) if section in SECTION_COLUMNS else None,
+            key='main_section',
+            show_timing=True
+        )
+
+elif st.session_state.data_loaded and st.session_state.dataset is not None:
+    if len(filtered_df) == 0:
+        st.warning("⚠️ Tidak ada data yang cocok dengan filter global. Ubah atau kosongkan filter di sidebar.")
+    else:
+        # Navigasi: hanya bagian yang dipilih yang dirender di setiap rerun
+        render_sections(SECTIONS, filtered_df, key='main_section', show_timing=True)
 
 else:
     # Tampilan awal sebelum data dimuat
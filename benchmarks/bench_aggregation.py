@@ -0,0 +1,112 @@
+"""
+Benchmark agregasi per grup: pandas groupby().agg() vs group_aggregate (np.bincount)
+
+Jalankan dari root repository:
+    python -m benchmarks.bench_aggregation 20000 1000000 10000000
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import CATEGORIES, PAYMENT, PROVINCES
+from utils.aggregation import group_aggregate
+
+
+# Agg dict seperti yang dipakai komponen dashboard
+SPECS = {
+    'Provinsi': {
+        'order_id': 'count',
+        'Total Pembayaran': ['sum', 'mean'],
+        'total_qty': 'sum',
+        'Kota/Kabupaten': 'nunique',
+    },
+    'Metode Pembayaran': {
+        'Total Pembayaran': ['sum', 'mean'],
+        'order_id': 'count',
+    },
+    'product_categories': {
+        'order_id': 'count',
+        'Total Pembayaran': ['sum', 'mean'],
+        'total_qty': 'sum',
+        'Total Diskon': 'sum',
+    },
+}
+
+
+def make_frame(n: int, categorical: bool, seed: int = 42) -> pd.DataFrame:
+    """
+    Frame bersih sintetis hanya dengan kolom yang diagregasi
+
+    Args:
+        n: Jumlah baris
+        categorical: Kolom teks sebagai category (mode hemat memori) atau string
+        seed: Seed random generator
+    """
+    rng = np.random.default_rng(seed)
+    cities = np.array([f'Kota {i}' for i in range(500)])
+
+    def text(values, size):
+        codes = rng.integers(0, len(values), size)
+        if categorical:
+            return pd.Categorical.from_codes(codes, categories=list(values))
+        return pd.array(np.asarray(values)[codes], dtype='str')
+
+    return pd.DataFrame({
+        'order_id': np.arange(n, dtype='int32'),
+        'Provinsi': text(PROVINCES, n),
+        'Kota/Kabupaten': text(cities, n),
+        'Metode Pembayaran': text(PAYMENT, n),
+        'product_categories': text(CATEGORIES, n),
+        'Total Pembayaran': rng.integers(10, 5000, n) * 1000.0,
+        'total_qty': rng.integers(1, 10, n).astype('int32'),
+        'Total Diskon': rng.integers(0, 50, n) * 1000.0,
+    })
+
+
+def _timeit(func, repeat: int = 3) -> float:
+    """Waktu terbaik (detik) dari beberapa kali eksekusi"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _same(expected: pd.DataFrame, actual: pd.DataFrame) -> bool:
+    """Cek hasil kernel sama dengan pandas (urutan kolom posisional)"""
+    if expected.shape != actual.shape:
+        return False
+    for i in range(expected.shape[1]):
+        left, right = expected.iloc[:, i], actual.iloc[:, i]
+        if left.dtype.kind in 'iuf':
+            if not np.allclose(left.to_numpy(dtype='float64'), right.to_numpy(dtype='float64')):
+                return False
+        elif not (left.astype(str).to_numpy() == right.astype(str).to_numpy()).all():
+            return False
+    return True
+
+
+def run(sizes):
+    for n in sizes:
+        for categorical in (True, False):
+            df = make_frame(n, categorical)
+            mode = 'category' if categorical else 'string'
+            repeat = 1 if n >= 5_000_000 else 3
+
+            for key, spec in SPECS.items():
+                expected = df.groupby(key, observed=True).agg(spec).reset_index()
+                actual = group_aggregate(df, key, spec)
+
+                pandas_time = _timeit(lambda: df.groupby(key, observed=True).agg(spec).reset_index(), repeat)
+                kernel_time = _timeit(lambda: group_aggregate(df, key, spec), repeat)
+
+                print(f"{n:>11,} baris | {mode:8} | {key:18} | pandas: {pandas_time * 1000:9.1f} ms "
+                      f"| bincount: {kernel_time * 1000:9.1f} ms | {pandas_time / kernel_time:5.1f}x "
+                      f"| {'sama' if _same(expected, actual) else 'BERBEDA'}")
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or [20_000, 1_000_000, 10_000_000])
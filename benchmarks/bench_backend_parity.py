@@ -0,0 +1,98 @@
+"""
+Uji kesamaan dan benchmark backend agregasi: pandas/NumPy vs DuckDB
+
+Untuk setiap ukuran data dan mode (kategori/string) script ini membandingkan
+seluruh cuboid cube, group_aggregate dengan agregasi campuran (sum, mean,
+count, nunique), dan bin_totals untuk bucket diskon dan berat. Keluar dengan
+kode 1 jika ada hasil yang berbeda.
+
+Jalankan dari root repository (membutuhkan duckdb):
+    python -m benchmarks.bench_backend_parity 20000 1000000
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_aggregation import SPECS, make_frame
+from benchmarks.synthetic import make_orders
+from components.sales_analysis import DISCOUNT_EDGES
+from components.shipping_analysis import WEIGHT_CATEGORY_EDGES_GR
+from utils import sql_backend
+from utils.aggregation import build_cube, group_aggregate
+from utils.data_processor import clean_and_transform
+from utils.distributions import _cached_bin_totals
+
+
+# (kolom yang di-bin, tepi, kolom yang dijumlahkan) seperti di komponen
+BIN_SPECS = [
+    ('Total Diskon', DISCOUNT_EDGES, 'Total Pembayaran'),
+    ('Total Diskon', DISCOUNT_EDGES, 'total_qty'),
+    ('total_weight_gr', WEIGHT_CATEGORY_EDGES_GR, 'Total Pembayaran'),
+]
+
+
+def _timed(func):
+    """Hasil dan waktu (detik) satu kali eksekusi"""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _same_frame(expected: pd.DataFrame, actual: pd.DataFrame) -> bool:
+    """Kolom, dtype, dan nilai sama (nilai float dengan toleransi relatif)"""
+    try:
+        pd.testing.assert_frame_equal(expected, actual, check_exact=False, rtol=1e-9)
+    except AssertionError as e:
+        print(f"    {e}")
+        return False
+    return True
+
+
+def _report(label: str, pandas_time: float, duckdb_time: float, same: bool):
+    print(f"    {label:42} | pandas: {pandas_time * 1000:9.1f} ms | duckdb: {duckdb_time * 1000:9.1f} ms "
+          f"| {pandas_time / duckdb_time:5.1f}x | {'sama' if same else 'BERBEDA'}")
+
+
+def run(sizes) -> bool:
+    all_same = True
+    for n in sizes:
+        for compact in (True, False):
+            mode = 'category' if compact else 'string'
+            print(f"{n:,} baris | {mode}")
+
+            df = clean_and_transform(make_orders(n), compact=compact)
+
+            expected, pandas_time = _timed(lambda: build_cube(df, sql_backend.PANDAS))
+            actual, duckdb_time = _timed(lambda: build_cube(df, sql_backend.DUCKDB))
+            same = expected.dimensions == actual.dimensions and all(
+                _same_frame(expected.query(*dims), actual.query(*dims)) for dims in expected.dimensions
+            )
+            _report(f"cube ({len(expected.dimensions)} cuboid)", pandas_time, duckdb_time, same)
+            all_same &= same
+
+            frame = make_frame(n, compact)
+            for key, spec in SPECS.items():
+                expected, pandas_time = _timed(lambda: group_aggregate(frame, key, spec))
+                actual, duckdb_time = _timed(lambda: sql_backend.group_aggregate(frame, key, spec))
+                same = _same_frame(expected, actual)
+                _report(f"group_aggregate {key}", pandas_time, duckdb_time, same)
+                all_same &= same
+
+            for column, edges, sum_column in BIN_SPECS:
+                (expected_counts, expected_sums), pandas_time = _timed(
+                    lambda: _cached_bin_totals(f'parity-{n}-{mode}', column, tuple(edges), sum_column, sql_backend.PANDAS, df)
+                )
+                (counts, sums), duckdb_time = _timed(lambda: sql_backend.bin_totals(df, column, edges, sum_column))
+                same = np.array_equal(expected_counts, counts) and np.allclose(expected_sums, sums, rtol=1e-9)
+                _report(f"bin_totals {column} → {sum_column}", pandas_time, duckdb_time, same)
+                all_same &= same
+    return all_same
+
+
+if __name__ == '__main__':
+    if not sql_backend.is_available():
+        sys.exit("duckdb belum terpasang: pip install duckdb")
+    ok = run([int(arg) for arg in sys.argv[1:]] or [20_000, 1_000_000])
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,119 @@
+"""
+Benchmark mode out-of-core: ingest Parquet terpartisi dan query per tampilan
+
+Untuk setiap ukuran data script ini mengukur (masing-masing di proses baru,
+waktu dan peak RSS): pemuatan in-memory biasa, ingest ke Parquet terpartisi
+Tahun/Bulan, dan beberapa query tampilan dengan filter tanggal/kategori.
+Pembacaan penuh dataset terpartisi dibandingkan dengan hasil in-memory;
+keluar dengan kode 1 jika berbeda.
+
+Jalankan dari root repository:
+    python -m benchmarks.bench_out_of_core 200000 1000000
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+import pandas as pd
+
+from benchmarks.bench_pipeline import _peak_rss_kb
+from benchmarks.synthetic import write_csv
+from components.overview import COLUMNS as OVERVIEW_COLUMNS
+from components.payment_analysis import COLUMNS as PAYMENT_COLUMNS
+from utils import partitioned_store
+from utils.cross_filter import GlobalFilters
+from utils.data_processor import clean_and_transform, compute_fingerprint, load_from_csv
+
+
+# Query tampilan: (kolom, filter global, halaman (offset, limit) atau None untuk semua baris)
+QUERIES = {
+    'overview, semua tanggal': (OVERVIEW_COLUMNS, GlobalFilters(), None),
+    'pembayaran, 1 bulan': (PAYMENT_COLUMNS, GlobalFilters(date(2024, 6, 1), date(2024, 6, 30)), None),
+    'semua kolom, 1 provinsi, 1 kuartal': (
+        None, GlobalFilters(date(2024, 1, 1), date(2024, 3, 31), (('Provinsi', ('Bali',)),)), None
+    ),
+    'data mentah, halaman tengah': (None, GlobalFilters(), (100_000, 50)),
+}
+
+
+def _run_child(*args) -> dict:
+    """Jalankan satu langkah di proses baru, kembalikan hasil JSON-nya"""
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_out_of_core', '--child', *args],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _child(step: str, path: str, compact: bool, query: str = ''):
+    baseline = _peak_rss_kb()
+    start = time.perf_counter()
+    result = {}
+    if step == 'memory':
+        df = clean_and_transform(load_from_csv(path, ()), compact=compact)
+        result['rows'] = len(df)
+    elif step == 'ingest':
+        partitioned_store.STORE_DIR = os.path.join(os.path.dirname(path), 'partitioned')
+        store, message = partitioned_store.ingest(path, compute_fingerprint(path), (), compact)
+        if store is None:
+            raise RuntimeError(message)
+        result.update(store=store.path, rows=store.num_rows, partitions=store.num_partitions, disk_mb=store.disk_bytes / 1e6)
+    else:
+        columns, filters, page = QUERIES[query]
+        store = partitioned_store.PartitionedDataset(path)
+        df = store.read(columns, filters) if page is None else store.read_page(columns, filters, *page)
+        result['rows'] = len(df)
+    result.update(
+        seconds=time.perf_counter() - start,
+        peak_mb=_peak_rss_kb() / 1024,
+        delta_mb=(_peak_rss_kb() - baseline) / 1024,
+    )
+    print(json.dumps(result))
+
+
+def _report(label: str, result: dict):
+    print(f"    {label:40} | {result['seconds']:6.2f} s | peak RSS {result['peak_mb']:7.0f} MB "
+          f"(+{result['delta_mb']:5.0f} MB) | {result['rows']:>10,} baris")
+
+
+def run(sizes) -> bool:
+    all_same = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            workdir = os.path.join(tmp, str(n))
+            os.makedirs(workdir)
+            path = write_csv(os.path.join(workdir, 'orders.csv'), n)
+            print(f"{n:,} baris ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+            # Mode hemat memori seperti default dashboard
+            compact = True
+            flag = '1' if compact else '0'
+            _report('in-memory (load → clean)', _run_child('memory', path, flag))
+            ingested = _run_child('ingest', path, flag)
+            _report(f"ingest ({ingested['partitions']} partisi, {ingested['disk_mb']:.0f} MB)", ingested)
+            for name in QUERIES:
+                _report(f"query: {name}", _run_child('query', ingested['store'], flag, name))
+
+            expected = clean_and_transform(load_from_csv(path, ()), compact=compact)
+            actual = partitioned_store.PartitionedDataset(ingested['store']).read(None, GlobalFilters())
+            try:
+                pd.testing.assert_frame_equal(expected, actual)
+                print("    baca penuh vs in-memory: sama")
+            except AssertionError as e:
+                print(f"    baca penuh vs in-memory: BERBEDA\n    {e}")
+                all_same = False
+    return all_same
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        _child(sys.argv[2], sys.argv[3], sys.argv[4] == '1', *sys.argv[5:])
+        sys.exit(0)
+    if not partitioned_store.is_available():
+        sys.exit("pyarrow belum terpasang: pip install pyarrow")
+    ok = run([int(arg) for arg in sys.argv[1:]] or [200_000, 1_000_000])
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,147 @@
+"""
+Benchmark pipeline load → validasi → clean: pandas vs Polars lazy
+
+Setiap pipeline dijalankan di proses terpisah agar peak RSS (ru_maxrss)
+tidak tercampur antar percobaan; waktu diukur end-to-end dari file CSV
+sampai DataFrame pandas bersih. Sebelum diukur, hasil kedua pipeline
+dibandingkan persis (kolom, dtype, urutan baris, nilai), baik dengan kolom
+skema saja maupun dengan semua kolom (extra_columns=None, termasuk kolom
+tambahan di luar skema), juga pada file kotor (teks di kolom numerik, waktu
+yang tidak bisa di-parse). Keluar dengan kode 1 jika berbeda.
+
+Jalankan dari root repository (membutuhkan polars):
+    python -m benchmarks.bench_pipeline 200000 1000000
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_orders, write_csv
+from utils import polars_pipeline
+from utils.data_processor import clean_and_transform, load_from_csv
+
+
+def load(pipeline: str, path: str, compact: bool, extra_columns=()) -> pd.DataFrame:
+    """Satu kali load → validasi → clean tanpa cache disk"""
+    if pipeline == polars_pipeline.POLARS:
+        df, message = polars_pipeline.load_clean_csv(path, extra_columns, compact)
+        if df is None:
+            raise RuntimeError(message)
+        return df
+    return clean_and_transform(load_from_csv(path, extra_columns), compact=compact)
+
+
+def _same_frame(expected: pd.DataFrame, actual: pd.DataFrame) -> bool:
+    """Kolom, dtype (termasuk resolusi datetime), dan nilai sama persis"""
+    try:
+        pd.testing.assert_frame_equal(expected, actual)
+    except AssertionError as e:
+        print(f"    {e}")
+        return False
+    return True
+
+
+def _same_pipelines(path: str) -> bool:
+    """Kedua pipeline sama persis untuk semua mode compact dan pilihan kolom"""
+    return all(
+        _same_frame(load(polars_pipeline.PANDAS, path, compact, extra), load(polars_pipeline.POLARS, path, compact, extra))
+        for compact in (True, False)
+        for extra in ((), None)
+    )
+
+
+def write_dirty_csv(path: str, n: int) -> str:
+    """CSV sintetis dengan nilai kotor yang harus di-coerce sama oleh kedua pipeline"""
+    df = make_orders(n, extra_columns=1).astype({
+        'Total Diskon': object, 'Waktu Pesanan Dibuat': object, 'num_product_categories': object
+    })
+    df.loc[::97, 'Total Diskon'] = 'abc'
+    df.loc[::101, 'Waktu Pesanan Dibuat'] = 'bukan tanggal'
+    df.loc[::89, 'num_product_categories'] = 'x'
+    # Kolom tambahan bertipe tanggal dengan nilai yang tidak bisa di-parse
+    df['Tanggal Kirim'] = df['Waktu Pesanan Dibuat']
+    df.to_csv(path, index=False)
+    return path
+
+
+def _measure(pipeline: str, path: str, compact: bool) -> dict:
+    """Waktu dan peak RSS satu pipeline di proses baru"""
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_pipeline', '--child', pipeline, path, str(int(compact))],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _peak_rss_kb() -> int:
+    """
+    Peak RSS proses ini dalam KiB
+
+    VmHWM di Linux (direset saat exec); ru_maxrss ikut mewarisi puncak proses
+    induk sehingga hanya dipakai sebagai fallback.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _child(pipeline: str, path: str, compact: bool):
+    baseline = _peak_rss_kb()
+    start = time.perf_counter()
+    df = load(pipeline, path, compact)
+    elapsed = time.perf_counter() - start
+    peak = _peak_rss_kb()
+    print(json.dumps({
+        'seconds': elapsed,
+        'peak_mb': peak / 1024,
+        'delta_mb': (peak - baseline) / 1024,
+        'frame_mb': df.attrs['memory_bytes'] / 1e6,
+    }))
+
+
+def run(sizes) -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        all_same = _same_pipelines(write_dirty_csv(os.path.join(tmp, 'dirty.csv'), 50_000))
+        print(f"file kotor: {'sama' if all_same else 'BERBEDA'}")
+
+        for n in sizes:
+            path = write_csv(os.path.join(tmp, f'orders_{n}.csv'), n, extra_columns=2)
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{n:,} baris ({size_mb:.1f} MB)")
+
+            for compact in (True, False):
+                mode = 'category' if compact else 'string'
+                same = all(
+                    _same_frame(load(polars_pipeline.PANDAS, path, compact, extra), load(polars_pipeline.POLARS, path, compact, extra))
+                    for extra in ((), None)
+                )
+                all_same &= same
+
+                results = {name: _measure(name, path, compact) for name in polars_pipeline.available_pipelines()}
+                for name, result in results.items():
+                    print(f"    {mode:8} | {name:6} | {result['seconds']:6.2f} s | peak RSS {result['peak_mb']:7.0f} MB "
+                          f"(+{result['delta_mb']:5.0f} MB) | frame {result['frame_mb']:6.0f} MB")
+                speedup = results[polars_pipeline.PANDAS]['seconds'] / results[polars_pipeline.POLARS]['seconds']
+                print(f"    {mode:8} | {speedup:.1f}x | {'sama' if same else 'BERBEDA'}")
+    return all_same
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        _child(sys.argv[2], sys.argv[3], sys.argv[4] == '1')
+        sys.exit(0)
+    if not polars_pipeline.is_available():
+        sys.exit("polars belum terpasang: pip install polars")
+    ok = run([int(arg) for arg in sys.argv[1:]] or [200_000, 1_000_000])
+    sys.exit(0 if ok else 1)
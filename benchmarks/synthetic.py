@@ -0,0 +1,76 @@
+"""
+Generator data sintetis untuk benchmark, meniru struktur dataset Kaggle
+"""
+import numpy as np
+import pandas as pd
+
+
+STATUS = ['Selesai', 'Dibatalkan', 'Dikirim', 'Pengembalian']
+SHIPPING = ['Reguler', 'Hemat', 'Instant', 'Same Day', 'Kargo', 'Next Day']
+PAYMENT = ['COD', 'Transfer Bank', 'ShopeePay', 'Kartu Kredit', 'SPayLater', 'Indomaret', 'Alfamart']
+PROVINCES = [
+    'DKI Jakarta', 'Jawa Barat', 'Jawa Tengah', 'Jawa Timur', 'Banten', 'DI Yogyakarta',
+    'Sumatera Utara', 'Sumatera Barat', 'Riau', 'Lampung', 'Kalimantan Timur',
+    'Sulawesi Selatan', 'Bali', 'Nusa Tenggara Barat', 'Maluku', 'Papua'
+]
+CATEGORIES = [f'Kategori {i:02d}' for i in range(40)]
+
+
+def make_orders(n: int, seed: int = 42, extra_columns: int = 0) -> pd.DataFrame:
+    """
+    Membuat DataFrame pesanan sintetis
+
+    Args:
+        n: Jumlah baris
+        seed: Seed random generator
+        extra_columns: Jumlah kolom tambahan yang tidak dipakai dashboard
+
+    Returns:
+        DataFrame mentah seperti hasil export marketplace
+    """
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2023-01-01T00:00:00')
+    seconds = rng.integers(0, 3 * 365 * 24 * 3600, n)
+    province_idx = rng.integers(0, len(PROVINCES), n)
+
+    df = pd.DataFrame({
+        'order_id': np.char.add('INV', np.arange(n).astype(str)),
+        'Status Pesanan': rng.choice(STATUS, n, p=[0.8, 0.1, 0.07, 0.03]),
+        'Waktu Pesanan Dibuat': np.char.replace((start + seconds.astype('timedelta64[s]')).astype(str), 'T', ' '),
+        'total_qty': rng.integers(1, 10, n),
+        'total_weight_gr': rng.gamma(2.0, 800.0, n).round(0),
+        'total_returned_qty': np.where(rng.random(n) < 0.05, rng.integers(1, 3, n), 0),
+        'Total Diskon': np.where(rng.random(n) < 0.4, rng.integers(1, 200, n) * 1000, 0),
+        'product_categories': rng.choice(CATEGORIES, n),
+        'num_product_categories': rng.integers(1, 4, n),
+        'Opsi Pengiriman': rng.choice(SHIPPING, n),
+        'Metode Pembayaran': rng.choice(PAYMENT, n),
+        'Kota/Kabupaten': np.char.add('Kota ', (province_idx * 10 + rng.integers(0, 10, n)).astype(str)),
+        'Provinsi': np.asarray(PROVINCES)[province_idx],
+        'Ongkos Kirim Dibayar oleh Pembeli': rng.integers(0, 60, n) * 1000,
+        'Perkiraan Ongkos Kirim': rng.integers(5, 60, n) * 1000,
+        'Estimasi Potongan Biaya Pengiriman': rng.integers(0, 20, n) * 1000,
+        'Total Pembayaran': rng.integers(10, 2000, n) * 1000,
+    })
+
+    for i in range(extra_columns):
+        df[f'Kolom Tambahan {i}'] = rng.integers(0, 1000, n)
+
+    return df
+
+
+def write_csv(path: str, n: int, sep: str = ',', extra_columns: int = 0) -> str:
+    """
+    Menulis data sintetis ke file CSV
+
+    Args:
+        path: Lokasi file tujuan
+        n: Jumlah baris
+        sep: Delimiter
+        extra_columns: Jumlah kolom tambahan
+
+    Returns:
+        Lokasi file yang ditulis
+    """
+    make_orders(n, extra_columns=extra_columns).to_csv(path, index=False, sep=sep)
+    return path
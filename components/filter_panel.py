@@ -0,0 +1,87 @@
+"""
+Komponen panel filter global (rentang tanggal, provinsi, pembayaran, pengiriman)
+"""
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+import streamlit as st
+import pandas as pd
+from utils.cross_filter import FILTER_COLUMNS, GlobalFilters, get_bitmap_index, get_filtered_view
+
+
+# Label widget per kolom filter
+FILTER_LABELS = {
+    'Provinsi': "🗺️ Provinsi",
+    'Metode Pembayaran': "💳 Metode Pembayaran",
+    'Opsi Pengiriman': "🚚 Opsi Pengiriman",
+}
+
+
+def render_filter_panel(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Render panel filter global dan kembalikan DataFrame hasil filter
+    
+    Hasil filter di-cache bersama semua sesi per (dataset, pilihan filter)
+    sehingga rerun dan sesi lain dengan filter sama tidak menyalin baris lagi.
+    
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        
+    Returns:
+        DataFrame hasil filter (DataFrame asli jika tidak ada filter aktif)
+    """
+    index = get_bitmap_index(df)
+    filters = render_filter_widgets(index.options, index.date_bounds)
+    
+    if not filters.active:
+        return df
+    
+    filtered = get_filtered_view(df, filters)
+    
+    st.caption(f"🔎 {len(filtered):,} dari {len(df):,} baris ({len(filtered) / len(df):.1%})")
+    return filtered
+
+
+def render_filter_widgets(options: Dict[str, list], date_bounds: Optional[Tuple[date, date]]) -> GlobalFilters:
+    """
+    Render widget filter global tanpa menerapkannya ke data
+    
+    Dipakai panel in-memory (pilihan dari bitmap index) dan mode out-of-core
+    (pilihan dari metadata dataset terpartisi).
+    
+    Args:
+        options: Kolom filter → daftar nilai yang bisa dipilih
+        date_bounds: Tanggal paling awal dan paling akhir, None jika tidak ada
+        
+    Returns:
+        Pilihan filter global
+    """
+    st.subheader("🔎 Filter Global")
+    
+    start, end = None, None
+    if date_bounds is not None:
+        min_date, max_date = date_bounds
+        date_range = st.date_input(
+            "📅 Rentang Tanggal",
+            value=(min_date, max_date),
+            min_value=min_date,
+            max_value=max_date,
+            key='global_filter_dates'
+        )
+        # Rentang baru terisi satu ujung saat pengguna sedang memilih
+        if isinstance(date_range, (tuple, list)) and len(date_range) == 2:
+            start = date_range[0] if date_range[0] > min_date else None
+            end = date_range[1] if date_range[1] < max_date else None
+    
+    values = []
+    for col in FILTER_COLUMNS:
+        if col in options:
+            selected = st.multiselect(
+                FILTER_LABELS.get(col, col),
+                options[col],
+                placeholder="Semua",
+                key=f'global_filter_{col}'
+            )
+            values.append((col, tuple(selected)))
+    
+    return GlobalFilters(start, end, tuple(values))
@@ -5,7 +5,17 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from components.navigation import render_sections
 from utils.data_processor import format_currency, format_number
+from utils.aggregation import get_cube, group_aggregate, top_k, COUNT
+from utils.figure_cache import cached_figure
+
+
+# Kolom yang dibaca bagian ini dalam mode out-of-core
+COLUMNS = [
+    'Regional', 'Provinsi', 'Kota/Kabupaten', 'Total Pembayaran', 'total_qty',
+    'Ongkos Kirim Dibayar oleh Pembeli',
+]
 
 
 def render_geographic_analysis(df: pd.DataFrame):
@@ -17,20 +27,12 @@ def render_geographic_analysis(df: pd.DataFrame):
     """
     st.header("🗺️ Analisis Geografis")
     
-    tab1, tab2, tab3 = st.tabs([
-        "🏙️ Analisis Kota/Kabupaten",
-        "🗺️ Analisis Provinsi",
-        "📊 Perbandingan Regional"
-    ])
-    
-    with tab1:
-        render_city_analysis(df)
-    
-    with tab2:
-        render_province_analysis(df)
-    
-    with tab3:
-        render_regional_comparison(df)
+    # Hanya sub-bagian yang dipilih yang dirender
+    render_sections({
+        "🏙️ Analisis Kota/Kabupaten": render_city_analysis,
+        "🗺️ Analisis Provinsi": render_province_analysis,
+        "📊 Perbandingan Regional": render_regional_comparison
+    }, df, key='geographic_section')
 
 
 def render_city_analysis(df: pd.DataFrame):
@@ -43,22 +45,13 @@ def render_city_analysis(df: pd.DataFrame):
         st.warning("⚠️ Data kota/kabupaten tidak tersedia")
         return
     
-    # Agregasi per kota
-    city_stats = df.groupby('Kota/Kabupaten').agg({
-        'order_id': 'count',
-        'Total Pembayaran': 'sum',
-        'total_qty': 'sum',
-        'Ongkos Kirim Dibayar oleh Pembeli': 'mean' if 'Ongkos Kirim Dibayar oleh Pembeli' in df.columns else 'count'
-    }).reset_index()
-    
-    city_stats.columns = ['Kota', 'Jumlah Pesanan', 'Total Pendapatan', 'Total Qty', 'Rata-rata Ongkir']
-    city_stats = city_stats.sort_values('Total Pendapatan', ascending=False)
+    city_stats = _city_stats(df)
     
     # Metrik top cities
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        top_city = city_stats.iloc[0]
+        top_city = top_k(city_stats, 'Total Pendapatan', 1).iloc[0]
         st.metric(
             "🏆 Kota Teratas (Pendapatan)",
             top_city['Kota'],
@@ -66,7 +59,7 @@ def render_city_analysis(df: pd.DataFrame):
         )
     
     with col2:
-        top_orders_city = city_stats.sort_values('Jumlah Pesanan', ascending=False).iloc[0]
+        top_orders_city = top_k(city_stats, 'Jumlah Pesanan', 1).iloc[0]
         st.metric(
             "📦 Kota Teratas (Pesanan)",
             top_orders_city['Kota'],
@@ -87,61 +80,87 @@ def render_city_analysis(df: pd.DataFrame):
     
     with col_left:
         st.markdown("#### 🏆 Top 20 Kota - Pendapatan")
-        
-        top_cities_revenue = city_stats.head(20)
-        
-        fig = px.bar(
-            top_cities_revenue,
-            y='Kota',
-            x='Total Pendapatan',
-            orientation='h',
-            color='Jumlah Pesanan',
-            color_continuous_scale='Blues',
-            labels={'Total Pendapatan': 'Total Pendapatan (Rp)'}
-        )
-        
-        fig.update_traces(
-            hovertemplate='<b>%{y}</b><br>Pendapatan: Rp %{x:,.0f}<br>Pesanan: %{marker.color}<extra></extra>'
-        )
-        
-        fig.update_layout(
-            height=600,
-            yaxis={'categoryorder': 'total ascending'}
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_top_cities_revenue, df, top_n=20), use_container_width=True)
     
     with col_right:
         st.markdown("#### 📦 Top 20 Kota - Jumlah Pesanan")
-        
-        top_cities_orders = city_stats.sort_values('Jumlah Pesanan', ascending=False).head(20)
-        
-        fig = px.bar(
-            top_cities_orders,
-            y='Kota',
-            x='Jumlah Pesanan',
-            orientation='h',
-            color='Total Pendapatan',
-            color_continuous_scale='Greens',
-            labels={'Jumlah Pesanan': 'Jumlah Pesanan'}
-        )
-        
-        fig.update_traces(
-            hovertemplate='<b>%{y}</b><br>Pesanan: %{x:,}<br>Pendapatan: Rp %{marker.color:,.0f}<extra></extra>'
-        )
-        
-        fig.update_layout(
-            height=600,
-            yaxis={'categoryorder': 'total ascending'}
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_top_cities_orders, df, top_n=20), use_container_width=True)
     
     # Scatter plot
     st.markdown("#### 📊 Hubungan Pesanan vs Pendapatan per Kota")
+    st.plotly_chart(cached_figure(_build_city_scatter, df, top_n=50), use_container_width=True)
+
+
+def _city_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Statistik per kota dari cube
+    """
+    city_stats = get_cube(df).query('Kota/Kabupaten')
+    city_stats['Rata-rata Ongkir'] = city_stats['Ongkos Kirim Dibayar oleh Pembeli'] / city_stats[COUNT]
+    city_stats = city_stats[['Kota/Kabupaten', COUNT, 'Total Pembayaran', 'total_qty', 'Rata-rata Ongkir']]
+    
+    city_stats.columns = ['Kota', 'Jumlah Pesanan', 'Total Pendapatan', 'Total Qty', 'Rata-rata Ongkir']
+    return city_stats
+
+
+def _build_top_cities_revenue(df: pd.DataFrame, top_n: int) -> go.Figure:
+    """
+    Figure top-N kota berdasarkan pendapatan
+    """
+    fig = px.bar(
+        top_k(_city_stats(df), 'Total Pendapatan', top_n),
+        y='Kota',
+        x='Total Pendapatan',
+        orientation='h',
+        color='Jumlah Pesanan',
+        color_continuous_scale='Blues',
+        labels={'Total Pendapatan': 'Total Pendapatan (Rp)'}
+    )
+    
+    fig.update_traces(
+        hovertemplate='<b>%{y}</b><br>Pendapatan: Rp %{x:,.0f}<br>Pesanan: %{marker.color}<extra></extra>'
+    )
+    
+    fig.update_layout(
+        height=600,
+        yaxis={'categoryorder': 'total ascending'}
+    )
+    
+    return fig
+
+
+def _build_top_cities_orders(df: pd.DataFrame, top_n: int) -> go.Figure:
+    """
+    Figure top-N kota berdasarkan jumlah pesanan
+    """
+    fig = px.bar(
+        top_k(_city_stats(df), 'Jumlah Pesanan', top_n),
+        y='Kota',
+        x='Jumlah Pesanan',
+        orientation='h',
+        color='Total Pendapatan',
+        color_continuous_scale='Greens',
+        labels={'Jumlah Pesanan': 'Jumlah Pesanan'}
+    )
     
+    fig.update_traces(
+        hovertemplate='<b>%{y}</b><br>Pesanan: %{x:,}<br>Pendapatan: Rp %{marker.color:,.0f}<extra></extra>'
+    )
+    
+    fig.update_layout(
+        height=600,
+        yaxis={'categoryorder': 'total ascending'}
+    )
+    
+    return fig
+
+
+def _build_city_scatter(df: pd.DataFrame, top_n: int) -> go.Figure:
+    """
+    Figure jumlah pesanan vs pendapatan untuk top-N kota
+    """
     fig = px.scatter(
-        city_stats.head(50),
+        top_k(_city_stats(df), 'Total Pendapatan', top_n),
         x='Jumlah Pesanan',
         y='Total Pendapatan',
         size='Total Qty',
@@ -156,7 +175,7 @@ def render_city_analysis(df: pd.DataFrame):
     )
     
     fig.update_layout(height=500)
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
 def render_province_analysis(df: pd.DataFrame):
@@ -169,22 +188,13 @@ def render_province_analysis(df: pd.DataFrame):
         st.warning("⚠️ Data provinsi tidak tersedia")
         return
     
-    # Agregasi per provinsi
-    province_stats = df.groupby('Provinsi').agg({
-        'order_id': 'count',
-        'Total Pembayaran': ['sum', 'mean'],
-        'total_qty': 'sum',
-        'Kota/Kabupaten': 'nunique' if 'Kota/Kabupaten' in df.columns else 'count'
-    }).reset_index()
-    
-    province_stats.columns = ['Provinsi', 'Jumlah Pesanan', 'Total Pendapatan', 'Rata-rata Nilai', 'Total Qty', 'Jumlah Kota']
-    province_stats = province_stats.sort_values('Total Pendapatan', ascending=False)
+    province_stats = _province_stats(df)
     
     # Metrik
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        top_province = province_stats.iloc[0]
+        top_province = top_k(province_stats, 'Total Pendapatan', 1).iloc[0]
         st.metric(
             "🏆 Provinsi Teratas",
             top_province['Provinsi']
@@ -217,55 +227,93 @@ def render_province_analysis(df: pd.DataFrame):
     
     with col1:
         st.markdown("#### 💰 Top 15 Provinsi - Pendapatan")
-        
-        top_provinces = province_stats.head(15)
-        
-        fig = px.bar(
-            top_provinces,
-            x='Provinsi',
-            y='Total Pendapatan',
-            color='Jumlah Pesanan',
-            color_continuous_scale='Oranges',
-            labels={'Total Pendapatan': 'Total Pendapatan (Rp)'}
-        )
-        
-        fig.update_traces(
-            hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<br>Pesanan: %{marker.color}<extra></extra>'
-        )
-        
-        fig.update_layout(
-            height=500,
-            xaxis_tickangle=-45
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_top_provinces, df, top_n=15), use_container_width=True)
     
     with col2:
         st.markdown("#### 🥧 Distribusi Pendapatan Top 10 Provinsi")
-        
-        top_10_provinces = province_stats.head(10)
-        
-        fig = px.pie(
-            top_10_provinces,
-            values='Total Pendapatan',
-            names='Provinsi',
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        
-        fig.update_traces(
-            textposition='inside',
-            textinfo='percent+label'
-        )
-        
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_province_share, df, top_n=10), use_container_width=True)
     
     # Treemap
     st.markdown("#### 🗺️ Peta Hierarki Pendapatan per Provinsi")
+    st.plotly_chart(cached_figure(_build_province_treemap, df, top_n=20), use_container_width=True)
+
+
+def _province_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Statistik per provinsi dari cube
+    """
+    # Jumlah kota = jumlah baris cuboid provinsi × kota
+    cube = get_cube(df)
+    province_stats = cube.query('Provinsi')
+    province_stats['Rata-rata Nilai'] = province_stats['Total Pembayaran'] / province_stats[COUNT]
+    city_counts = group_aggregate(cube.query('Provinsi', 'Kota/Kabupaten'), 'Provinsi', {'Kota/Kabupaten': 'nunique'})
+    province_stats['Jumlah Kota'] = city_counts['Kota/Kabupaten'].to_numpy()
+    province_stats = province_stats[
+        ['Provinsi', COUNT, 'Total Pembayaran', 'Rata-rata Nilai', 'total_qty', 'Jumlah Kota']
+    ]
+    
+    province_stats.columns = ['Provinsi', 'Jumlah Pesanan', 'Total Pendapatan', 'Rata-rata Nilai', 'Total Qty', 'Jumlah Kota']
+    return province_stats
+
+
+def _build_top_provinces(df: pd.DataFrame, top_n: int) -> go.Figure:
+    """
+    Figure top-N provinsi berdasarkan pendapatan
+    """
+    fig = px.bar(
+        top_k(_province_stats(df), 'Total Pendapatan', top_n),
+        x='Provinsi',
+        y='Total Pendapatan',
+        color='Jumlah Pesanan',
+        color_continuous_scale='Oranges',
+        labels={'Total Pendapatan': 'Total Pendapatan (Rp)'}
+    )
+    
+    fig.update_traces(
+        hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<br>Pesanan: %{marker.color}<extra></extra>'
+    )
+    
+    fig.update_layout(
+        height=500,
+        xaxis_tickangle=-45
+    )
+    
+    return fig
+
+
+def _build_province_share(df: pd.DataFrame, top_n: int) -> go.Figure:
+    """
+    Figure porsi pendapatan top-N provinsi, sisanya digabung 'Lainnya'
+    """
+    # Provinsi di luar top-N digabung agar porsi pie tetap terhadap total
+    top_provinces = top_k(
+        _province_stats(df)[['Provinsi', 'Total Pendapatan']], 'Total Pendapatan', top_n,
+        label='Provinsi', other_label='Lainnya'
+    )
     
+    fig = px.pie(
+        top_provinces,
+        values='Total Pendapatan',
+        names='Provinsi',
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    
+    fig.update_traces(
+        textposition='inside',
+        textinfo='percent+label'
+    )
+    
+    fig.update_layout(height=500)
+    return fig
+
+
+def _build_province_treemap(df: pd.DataFrame, top_n: int) -> go.Figure:
+    """
+    Figure treemap pendapatan top-N provinsi
+    """
     fig = px.treemap(
-        province_stats.head(20),
+        top_k(_province_stats(df), 'Total Pendapatan', top_n),
         path=['Provinsi'],
         values='Total Pendapatan',
         color='Jumlah Pesanan',
@@ -278,7 +326,7 @@ def render_province_analysis(df: pd.DataFrame):
     )
     
     fig.update_layout(height=600)
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
 def render_regional_comparison(df: pd.DataFrame):
@@ -287,92 +335,25 @@ def render_regional_comparison(df: pd.DataFrame):
     """
     st.subheader("📊 Perbandingan Regional")
     
-    if 'Provinsi' not in df.columns:
+    if 'Regional' not in df.columns:
         st.warning("⚠️ Data provinsi tidak tersedia")
         return
     
-    # Kategorisasi regional (simplified - bisa disesuaikan)
-    def categorize_region(province):
-        # Mapping sederhana - bisa diperluas
-        jawa = ['DKI Jakarta', 'Jawa Barat', 'Jawa Tengah', 'Jawa Timur', 'Banten', 'DI Yogyakarta']
-        sumatera = ['Sumatera Utara', 'Sumatera Barat', 'Sumatera Selatan', 'Riau', 'Jambi', 'Bengkulu', 'Lampung', 'Aceh', 'Kepulauan Riau', 'Bangka Belitung']
-        kalimantan = ['Kalimantan Barat', 'Kalimantan Tengah', 'Kalimantan Selatan', 'Kalimantan Timur', 'Kalimantan Utara']
-        sulawesi = ['Sulawesi Utara', 'Sulawesi Tengah', 'Sulawesi Selatan', 'Sulawesi Tenggara', 'Gorontalo', 'Sulawesi Barat']
-        
-        if province in jawa:
-            return 'Jawa'
-        elif province in sumatera:
-            return 'Sumatera'
-        elif province in kalimantan:
-            return 'Kalimantan'
-        elif province in sulawesi:
-            return 'Sulawesi'
-        else:
-            return 'Lainnya'
-    
-    df_regional = df.copy()
-    df_regional['Regional'] = df_regional['Provinsi'].apply(categorize_region)
-    
-    # Agregasi per regional
-    regional_stats = df_regional.groupby('Regional').agg({
-        'order_id': 'count',
-        'Total Pembayaran': ['sum', 'mean'],
-        'total_qty': 'sum',
-        'Provinsi': 'nunique'
-    }).reset_index()
-    
-    regional_stats.columns = ['Regional', 'Jumlah Pesanan', 'Total Pendapatan', 'Rata-rata Nilai', 'Total Qty', 'Jumlah Provinsi']
-    regional_stats = regional_stats.sort_values('Total Pendapatan', ascending=False)
-    
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("#### 🗺️ Distribusi Pesanan per Regional")
-        
-        fig = px.pie(
-            regional_stats,
-            values='Jumlah Pesanan',
-            names='Regional',
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Pastel
-        )
-        
-        fig.update_traces(
-            textposition='inside',
-            textinfo='percent+label',
-            hovertemplate='<b>%{label}</b><br>Pesanan: %{value:,}<br>Persentase: %{percent}<extra></extra>'
-        )
-        
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_regional_share, df), use_container_width=True)
     
     with col2:
         st.markdown("#### 💰 Pendapatan per Regional")
-        
-        fig = px.bar(
-            regional_stats,
-            x='Regional',
-            y='Total Pendapatan',
-            color='Rata-rata Nilai',
-            color_continuous_scale='Teal',
-            text='Total Pendapatan',
-            labels={'Total Pendapatan': 'Total Pendapatan (Rp)'}
-        )
-        
-        fig.update_traces(
-            texttemplate='Rp %{text:,.0f}',
-            textposition='outside',
-            hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<br>Rata-rata: Rp %{marker.color:,.0f}<extra></extra>'
-        )
-        
-        fig.update_layout(height=400, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_regional_revenue, df), use_container_width=True)
     
     # Tabel perbandingan
     st.markdown("#### 📋 Tabel Perbandingan Regional")
     
     # Format tabel
-    display_stats = regional_stats.copy()
+    display_stats = _regional_stats(df)
     display_stats['Total Pendapatan'] = display_stats['Total Pendapatan'].apply(format_currency)
     display_stats['Rata-rata Nilai'] = display_stats['Rata-rata Nilai'].apply(format_currency)
     display_stats['Jumlah Pesanan'] = display_stats['Jumlah Pesanan'].apply(format_number)
@@ -385,33 +366,100 @@ def render_regional_comparison(df: pd.DataFrame):
     )
     
     # Sunburst chart
-    if 'Provinsi' in df_regional.columns:
+    if 'Provinsi' in df.columns:
         st.markdown("#### 🌅 Visualisasi Hierarki Regional-Provinsi")
-        
-        # Ambil top provinces per regional
-        regional_province = df_regional.groupby(['Regional', 'Provinsi']).agg({
-            'Total Pembayaran': 'sum',
-            'order_id': 'count'
-        }).reset_index()
-        
-        regional_province.columns = ['Regional', 'Provinsi', 'Pendapatan', 'Pesanan']
-        
-        # Ambil top 5 per regional
-        top_per_regional = regional_province.groupby('Regional').apply(
-            lambda x: x.nlargest(5, 'Pendapatan')
-        ).reset_index(drop=True)
-        
-        fig = px.sunburst(
-            top_per_regional,
-            path=['Regional', 'Provinsi'],
-            values='Pendapatan',
-            color='Pesanan',
-            color_continuous_scale='RdYlGn'
-        )
-        
-        fig.update_traces(
-            hovertemplate='<b>%{label}</b><br>Pendapatan: Rp %{value:,.0f}<extra></extra>'
-        )
-        
-        fig.update_layout(height=600)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_regional_sunburst, df, top_n=5), use_container_width=True)
+
+
+def _regional_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Statistik per regional dari cube, terurut menurut pendapatan
+    """
+    # Regional sudah dipetakan saat pembersihan data (utils/dimensions.py)
+    # Jumlah provinsi = jumlah baris cuboid regional × provinsi
+    cube = get_cube(df)
+    regional_stats = cube.query('Regional')
+    regional_stats['Rata-rata Nilai'] = regional_stats['Total Pembayaran'] / regional_stats[COUNT]
+    province_counts = group_aggregate(cube.query('Regional', 'Provinsi'), 'Regional', {'Provinsi': 'nunique'})
+    regional_stats['Jumlah Provinsi'] = province_counts['Provinsi'].to_numpy()
+    regional_stats = regional_stats[
+        ['Regional', COUNT, 'Total Pembayaran', 'Rata-rata Nilai', 'total_qty', 'Jumlah Provinsi']
+    ]
+    
+    regional_stats.columns = ['Regional', 'Jumlah Pesanan', 'Total Pendapatan', 'Rata-rata Nilai', 'Total Qty', 'Jumlah Provinsi']
+    return regional_stats.sort_values('Total Pendapatan', ascending=False)
+
+
+def _build_regional_share(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure distribusi pesanan per regional
+    """
+    fig = px.pie(
+        _regional_stats(df),
+        values='Jumlah Pesanan',
+        names='Regional',
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+    
+    fig.update_traces(
+        textposition='inside',
+        textinfo='percent+label',
+        hovertemplate='<b>%{label}</b><br>Pesanan: %{value:,}<br>Persentase: %{percent}<extra></extra>'
+    )
+    
+    fig.update_layout(height=400)
+    return fig
+
+
+def _build_regional_revenue(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure pendapatan per regional
+    """
+    fig = px.bar(
+        _regional_stats(df),
+        x='Regional',
+        y='Total Pendapatan',
+        color='Rata-rata Nilai',
+        color_continuous_scale='Teal',
+        text='Total Pendapatan',
+        labels={'Total Pendapatan': 'Total Pendapatan (Rp)'}
+    )
+    
+    fig.update_traces(
+        texttemplate='Rp %{text:,.0f}',
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<br>Rata-rata: Rp %{marker.color:,.0f}<extra></extra>'
+    )
+    
+    fig.update_layout(height=400, showlegend=False)
+    return fig
+
+
+def _build_regional_sunburst(df: pd.DataFrame, top_n: int) -> go.Figure:
+    """
+    Figure hierarki regional → top-N provinsi per regional
+    """
+    regional_province = get_cube(df).query('Regional', 'Provinsi')[['Regional', 'Provinsi', 'Total Pembayaran', COUNT]]
+    regional_province.columns = ['Regional', 'Provinsi', 'Pendapatan', 'Pesanan']
+    
+    # Ambil top-N per regional, sisanya digabung menjadi 'Lainnya'
+    top_per_regional = top_k(
+        regional_province, 'Pendapatan', top_n,
+        by='Regional', label='Provinsi', other_label='Lainnya'
+    )
+    
+    fig = px.sunburst(
+        top_per_regional,
+        path=['Regional', 'Provinsi'],
+        values='Pendapatan',
+        color='Pesanan',
+        color_continuous_scale='RdYlGn'
+    )
+    
+    fig.update_traces(
+        hovertemplate='<b>%{label}</b><br>Pendapatan: Rp %{value:,.0f}<extra></extra>'
+    )
+    
+    fig.update_layout(height=600)
+    return fig
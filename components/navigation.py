@@ -0,0 +1,44 @@
+"""
+Komponen navigasi antar bagian dashboard
+"""
+import time
+from typing import Callable, Dict, Union
+
+import streamlit as st
+import pandas as pd
+
+
+def render_sections(
+    sections: Dict[str, Callable[[pd.DataFrame], None]],
+    df: Union[pd.DataFrame, Callable[[str], pd.DataFrame]],
+    key: str,
+    show_timing: bool = False
+):
+    """
+    Pilihan bagian horizontal yang hanya merender bagian terpilih
+
+    Berbeda dengan st.tabs yang menjalankan isi semua tab di setiap rerun,
+    hanya fungsi render bagian yang dipilih yang dijalankan sehingga grafik
+    di bagian lain tidak dihitung maupun dikirim ke browser.
+
+    Args:
+        sections: Label bagian → fungsi render yang menerima DataFrame
+        df: DataFrame yang sudah dibersihkan, atau fungsi label bagian → DataFrame
+            (mode out-of-core: hanya data yang dibutuhkan bagian terpilih yang dibaca)
+        key: Key widget Streamlit (pilihan tersimpan di session state)
+        show_timing: Tampilkan waktu render bagian terpilih
+    """
+    selected = st.radio(
+        "Bagian",
+        list(sections),
+        horizontal=True,
+        key=key,
+        label_visibility='collapsed'
+    )
+
+    start = time.perf_counter()
+    sections[selected](df(selected) if callable(df) else df)
+
+    if show_timing:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        st.caption(f"⏱️ {selected} dirender dalam {elapsed_ms:,.0f} ms")
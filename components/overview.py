@@ -5,7 +5,16 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_processor import calculate_metrics, format_currency, format_number
+from utils.data_processor import format_currency, format_number
+from utils.aggregation import get_cube, summary_metrics, top_k, COUNT
+from utils.figure_cache import cached_figure
+
+
+# Kolom yang dibaca bagian ini dalam mode out-of-core (termasuk ukuran summary_metrics)
+COLUMNS = [
+    'Bulan', 'Status Pesanan', 'product_categories', 'Total Pembayaran', 'total_qty',
+    'total_returned_qty', 'Total Diskon', 'Ongkos Kirim Dibayar oleh Pembeli',
+]
 
 
 def render_overview(df: pd.DataFrame):
@@ -17,8 +26,8 @@ def render_overview(df: pd.DataFrame):
     """
     st.header("📊 Ringkasan Dashboard")
     
-    # Hitung metrik
-    metrics = calculate_metrics(df)
+    # Hitung metrik dari total cube agregat
+    metrics = summary_metrics(get_cube(df))
     
     # Tampilkan metrik utama dalam 4 kolom
     col1, col2, col3, col4 = st.columns(4)
@@ -104,13 +113,19 @@ def render_monthly_trend(df: pd.DataFrame):
         st.warning("⚠️ Data tanggal tidak tersedia")
         return
     
-    # Agregasi per bulan
-    monthly_sales = df.groupby('Bulan').agg({
-        'Total Pembayaran': 'sum',
-        'order_id': 'count'
-    }).reset_index()
+    st.plotly_chart(cached_figure(_build_monthly_trend, df), use_container_width=True)
+
+
+def _build_monthly_trend(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure tren penjualan bulanan
+    """
+    # Agregasi per bulan dari cube
+    # Bulan adalah kategori terurut, cuboid sudah kronologis
+    monthly_sales = get_cube(df).query('Bulan')[['Bulan', 'Total Pembayaran', COUNT]]
     
     monthly_sales.columns = ['Bulan', 'Pendapatan', 'Jumlah Pesanan']
+    monthly_sales['Bulan'] = monthly_sales['Bulan'].astype(str)
     
     # Buat grafik dengan dual axis
     fig = go.Figure()
@@ -143,7 +158,7 @@ def render_monthly_trend(df: pd.DataFrame):
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
 def render_order_status_distribution(df: pd.DataFrame):
@@ -154,7 +169,15 @@ def render_order_status_distribution(df: pd.DataFrame):
         st.warning("⚠️ Data status pesanan tidak tersedia")
         return
     
-    status_counts = df['Status Pesanan'].value_counts().reset_index()
+    st.plotly_chart(cached_figure(_build_order_status_distribution, df), use_container_width=True)
+
+
+def _build_order_status_distribution(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure distribusi status pesanan
+    """
+    status_counts = get_cube(df).query('Status Pesanan')[['Status Pesanan', COUNT]]
+    status_counts = status_counts.sort_values(COUNT, ascending=False)
     status_counts.columns = ['Status', 'Jumlah']
     
     fig = px.pie(
@@ -177,7 +200,7 @@ def render_order_status_distribution(df: pd.DataFrame):
         legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.05)
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
 def render_top_categories(df: pd.DataFrame):
@@ -188,15 +211,20 @@ def render_top_categories(df: pd.DataFrame):
         st.warning("⚠️ Data kategori produk tidak tersedia")
         return
     
-    # Agregasi per kategori
-    category_stats = df.groupby('product_categories').agg({
-        'order_id': 'count',
-        'Total Pembayaran': 'sum',
-        'total_qty': 'sum'
-    }).reset_index()
+    st.plotly_chart(cached_figure(_build_top_categories, df), use_container_width=True)
+
+
+def _build_top_categories(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure top 10 kategori produk
+    """
+    # Agregasi per kategori dari cube
+    category_stats = get_cube(df).query('product_categories')[
+        ['product_categories', COUNT, 'Total Pembayaran', 'total_qty']
+    ]
     
     category_stats.columns = ['Kategori', 'Jumlah Pesanan', 'Total Pendapatan', 'Total Qty']
-    category_stats = category_stats.sort_values('Total Pendapatan', ascending=False).head(10)
+    category_stats = top_k(category_stats, 'Total Pendapatan', 10)
     
     # Grafik bar horizontal
     fig = px.bar(
@@ -221,4 +249,4 @@ def render_top_categories(df: pd.DataFrame):
         hovertemplate='<b>%{y}</b><br>Pendapatan: Rp %{x:,.0f}<br>Pesanan: %{marker.color}<extra></extra>'
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
\ No newline at end of file
@@ -6,6 +6,13 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from utils.data_processor import format_currency, format_number
+from utils.aggregation import get_cube, top_k, COUNT
+from utils.distributions import box_stats
+from utils.figure_cache import cached_figure
+
+
+# Kolom yang dibaca bagian ini dalam mode out-of-core
+COLUMNS = ['Bulan', 'Metode Pembayaran', 'Total Pembayaran']
 
 
 def render_payment_analysis(df: pd.DataFrame):
@@ -21,23 +28,25 @@ def render_payment_analysis(df: pd.DataFrame):
         st.warning("⚠️ Data metode pembayaran tidak tersedia")
         return
     
+    cube = get_cube(df)
+    
     # Metrik ringkasan
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_transactions = len(df)
+        total_transactions = cube.total(COUNT)
         st.metric("💳 Total Transaksi", format_number(total_transactions))
     
     with col2:
-        total_payment = df['Total Pembayaran'].sum()
+        total_payment = cube.total('Total Pembayaran')
         st.metric("💰 Total Pembayaran", format_currency(total_payment))
     
     with col3:
-        avg_payment = df['Total Pembayaran'].mean()
+        avg_payment = cube.mean('Total Pembayaran')
         st.metric("📊 Rata-rata Pembayaran", format_currency(avg_payment))
     
     with col4:
-        num_methods = df['Metode Pembayaran'].nunique()
+        num_methods = len(cube.query('Metode Pembayaran'))
         st.metric("🔢 Jumlah Metode", format_number(num_methods))
     
     st.divider()
@@ -71,7 +80,15 @@ def render_payment_distribution(df: pd.DataFrame):
     """
     Render distribusi metode pembayaran
     """
-    payment_counts = df['Metode Pembayaran'].value_counts().reset_index()
+    st.plotly_chart(cached_figure(_build_payment_distribution, df), use_container_width=True)
+
+
+def _build_payment_distribution(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure distribusi metode pembayaran
+    """
+    payment_counts = get_cube(df).query('Metode Pembayaran')[['Metode Pembayaran', COUNT]]
+    payment_counts = payment_counts.sort_values(COUNT, ascending=False)
     payment_counts.columns = ['Metode', 'Jumlah']
     
     fig = px.pie(
@@ -94,17 +111,21 @@ def render_payment_distribution(df: pd.DataFrame):
         legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.05)
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
 def render_payment_revenue(df: pd.DataFrame):
     """
     Render pendapatan per metode pembayaran
     """
-    payment_revenue = df.groupby('Metode Pembayaran').agg({
-        'Total Pembayaran': 'sum',
-        'order_id': 'count'
-    }).reset_index()
+    st.plotly_chart(cached_figure(_build_payment_revenue, df), use_container_width=True)
+
+
+def _build_payment_revenue(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure pendapatan per metode pembayaran
+    """
+    payment_revenue = get_cube(df).query('Metode Pembayaran')[['Metode Pembayaran', 'Total Pembayaran', COUNT]]
     
     payment_revenue.columns = ['Metode', 'Total Pendapatan', 'Jumlah Transaksi']
     payment_revenue = payment_revenue.sort_values('Total Pendapatan', ascending=True)
@@ -131,7 +152,7 @@ def render_payment_revenue(df: pd.DataFrame):
         yaxis={'categoryorder': 'total ascending'}
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
 def render_payment_trend(df: pd.DataFrame):
@@ -142,11 +163,23 @@ def render_payment_trend(df: pd.DataFrame):
         st.warning("⚠️ Data tanggal tidak tersedia")
         return
     
-    # Agregasi per bulan dan metode
-    payment_trend = df.groupby(['Bulan', 'Metode Pembayaran']).size().reset_index(name='Jumlah')
+    st.plotly_chart(cached_figure(_build_payment_trend, df), use_container_width=True)
+
+
+def _build_payment_trend(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure tren bulanan top 5 metode pembayaran
+    """
+    cube = get_cube(df)
+    
+    # Agregasi per bulan dan metode dari cube
+    # Bulan adalah kategori terurut, cuboid sudah kronologis
+    payment_trend = cube.query('Bulan', 'Metode Pembayaran')[['Bulan', 'Metode Pembayaran', COUNT]]
+    payment_trend.columns = ['Bulan', 'Metode Pembayaran', 'Jumlah']
+    payment_trend['Bulan'] = payment_trend['Bulan'].astype(str)
     
     # Ambil top 5 metode pembayaran
-    top_methods = df['Metode Pembayaran'].value_counts().head(5).index.tolist()
+    top_methods = top_k(cube.query('Metode Pembayaran'), COUNT, 5)['Metode Pembayaran'].tolist()
     payment_trend_filtered = payment_trend[payment_trend['Metode Pembayaran'].isin(top_methods)]
     
     fig = px.line(
@@ -168,45 +201,22 @@ def render_payment_trend(df: pd.DataFrame):
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
 def render_payment_value_analysis(df: pd.DataFrame):
     """
     Analisis nilai transaksi per metode pembayaran
     """
-    payment_stats = df.groupby('Metode Pembayaran').agg({
-        'Total Pembayaran': ['mean', 'median', 'min', 'max'],
-        'order_id': 'count'
-    }).reset_index()
+    # Box plot dan tabel statistik memakai hasil box_stats yang sama (di-cache per dataset)
+    box, _ = box_stats(df, 'Metode Pembayaran', 'Total Pembayaran')
     
+    st.plotly_chart(cached_figure(_build_payment_value_box, df), use_container_width=True)
+    
+    payment_stats = box[['Metode Pembayaran', 'mean', 'median', 'min', 'max', 'count']].copy()
     payment_stats.columns = ['Metode', 'Rata-rata', 'Median', 'Minimum', 'Maksimum', 'Jumlah']
     payment_stats = payment_stats.sort_values('Rata-rata', ascending=False)
     
-    # Box plot
-    fig = px.box(
-        df,
-        x='Metode Pembayaran',
-        y='Total Pembayaran',
-        color='Metode Pembayaran',
-        labels={
-            'Metode Pembayaran': 'Metode Pembayaran',
-            'Total Pembayaran': 'Nilai Transaksi (Rp)'
-        }
-    )
-    
-    fig.update_traces(
-        hovertemplate='<b>%{x}</b><br>Nilai: Rp %{y:,.0f}<extra></extra>'
-    )
-    
-    fig.update_layout(
-        height=400,
-        showlegend=False,
-        xaxis_tickangle=-45
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
     # Tabel statistik
     st.markdown("#### 📋 Statistik Detail per Metode Pembayaran")
     
@@ -221,3 +231,52 @@ def render_payment_value_analysis(df: pd.DataFrame):
         hide_index=True,
         use_container_width=True
     )
+
+
+def _build_payment_value_box(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure box plot nilai transaksi per metode dari statistik yang dihitung di server
+    """
+    box, outliers = box_stats(df, 'Metode Pembayaran', 'Total Pembayaran')
+    
+    # Box plot dari statistik yang sudah dihitung
+    fig = go.Figure()
+    colors = px.colors.qualitative.Plotly
+    
+    for i, row in enumerate(box.itertuples(index=False)):
+        method = row[0]
+        color = colors[i % len(colors)]
+        
+        fig.add_trace(go.Box(
+            x=[method],
+            q1=[row.q1],
+            median=[row.median],
+            q3=[row.q3],
+            lowerfence=[row.lowerfence],
+            upperfence=[row.upperfence],
+            mean=[row.mean],
+            name=str(method),
+            marker_color=color,
+            hoverinfo='y'
+        ))
+        
+        method_outliers = outliers.loc[outliers['Metode Pembayaran'] == method, 'Total Pembayaran']
+        if len(method_outliers) > 0:
+            fig.add_trace(go.Scatter(
+                x=[method] * len(method_outliers),
+                y=method_outliers,
+                mode='markers',
+                name=str(method),
+                marker=dict(color=color, size=4, opacity=0.6),
+                hovertemplate='<b>%{x}</b><br>Nilai: Rp %{y:,.0f}<extra></extra>'
+            ))
+    
+    fig.update_layout(
+        height=400,
+        showlegend=False,
+        xaxis_title='Metode Pembayaran',
+        yaxis_title='Nilai Transaksi (Rp)',
+        xaxis_tickangle=-45
+    )
+    
+    return fig
@@ -0,0 +1,229 @@
+"""
+Komponen untuk menampilkan data mentah
+"""
+from typing import Callable, Hashable
+
+import streamlit as st
+import pandas as pd
+from utils import partitioned_store
+from utils.cross_filter import GlobalFilters
+from utils.data_processor import dataset_key, format_bytes
+from utils.export import available_formats, export_to_tempfile
+from utils.table_engine import filter_columns, column_codes, table_view, table_page
+
+
+# st.download_button menerima data tertunda (callable) sejak Streamlit 1.52
+DEFERRED_DOWNLOAD = tuple(int(part) for part in st.__version__.split('.')[:2]) >= (1, 52)
+
+
+def render_raw_data(df: pd.DataFrame):
+    """
+    Render halaman data mentah dengan pagination dan download
+    
+    Args:
+        df: DataFrame yang sudah dibersihkan
+    """
+    st.header("📋 Data Mentah")
+    
+    st.info(f"📊 Menampilkan {len(df):,} baris data")
+    
+    # Filter kolom
+    all_columns = df.columns.tolist()
+    selected_columns = st.multiselect(
+        "Pilih kolom yang ingin ditampilkan:",
+        all_columns,
+        default=all_columns[:10] if len(all_columns) > 10 else all_columns
+    )
+    
+    if selected_columns:
+        # Urut dan filter dihitung di server atas seluruh baris, bukan hanya halaman aktif
+        sort_by, ascending, filters = render_table_controls(df)
+        
+        # Pagination
+        rows_per_page = st.selectbox("Baris per halaman:", [10, 25, 50, 100, 500], index=2)
+        view = table_view(df, sort_by, ascending, filters)
+        num_rows = len(df) if view is None else len(view)
+        total_pages = max((num_rows - 1) // rows_per_page + 1, 1)
+        page = st.number_input("Halaman:", min_value=1, max_value=total_pages, value=1)
+        
+        page_df, num_rows = table_page(df, selected_columns, page, rows_per_page, sort_by, ascending, filters)
+        start_idx = (page - 1) * rows_per_page
+        end_idx = start_idx + len(page_df)
+        
+        st.dataframe(
+            page_df,
+            use_container_width=True,
+            height=600
+        )
+        
+        if num_rows == 0:
+            st.caption("Tidak ada baris yang cocok dengan filter")
+        elif filters:
+            st.caption(f"Menampilkan baris {start_idx + 1} - {end_idx} dari {num_rows:,} baris hasil filter ({len(df):,} total baris)")
+        else:
+            st.caption(f"Menampilkan baris {start_idx + 1} - {end_idx} dari {len(df):,} total baris")
+        
+        # Download data
+        st.divider()
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            render_export(df, selected_columns)
+        
+        with col2:
+            # Statistik deskriptif
+            if st.button("📊 Lihat Statistik Deskriptif", use_container_width=True):
+                st.subheader("📊 Statistik Deskriptif")
+                st.dataframe(df[selected_columns].describe(), use_container_width=True)
+    else:
+        st.warning("⚠️ Pilih minimal satu kolom untuk ditampilkan")
+
+
+def render_raw_data_pages(store: 'partitioned_store.PartitionedDataset', filters: GlobalFilters):
+    """
+    Render data mentah mode out-of-core: hanya halaman dan kolom yang tampil yang dibaca
+    
+    Baris berurutan waktu pesanan dan disaring lewat panel filter global.
+    Seluruh baris hanya dibaca saat ekspor diminta.
+    
+    Args:
+        store: Dataset Parquet terpartisi
+        filters: Pilihan filter global
+    """
+    st.header("📋 Data Mentah")
+    
+    num_rows = partitioned_store.count_rows(store, filters)
+    st.info(f"📊 Menampilkan {num_rows:,} baris data")
+    
+    # Filter kolom
+    all_columns = store.columns
+    selected_columns = st.multiselect(
+        "Pilih kolom yang ingin ditampilkan:",
+        all_columns,
+        default=all_columns[:10] if len(all_columns) > 10 else all_columns
+    )
+    
+    if selected_columns:
+        st.caption("💡 Mode out-of-core: baris diurutkan menurut waktu pesanan, gunakan panel filter di sidebar untuk menyaring data")
+        
+        # Pagination: setiap halaman dibaca langsung dari Parquet
+        rows_per_page = st.selectbox("Baris per halaman:", [10, 25, 50, 100, 500], index=2)
+        total_pages = max((num_rows - 1) // rows_per_page + 1, 1)
+        page = st.number_input("Halaman:", min_value=1, max_value=total_pages, value=1)
+        
+        start_idx = (page - 1) * rows_per_page
+        page_df = partitioned_store.read_page(store, selected_columns, filters, start_idx, rows_per_page)[selected_columns]
+        end_idx = start_idx + len(page_df)
+        
+        st.dataframe(
+            page_df,
+            use_container_width=True,
+            height=600
+        )
+        
+        if num_rows == 0:
+            st.caption("Tidak ada baris yang cocok dengan filter")
+        else:
+            st.caption(f"Menampilkan baris {start_idx + 1} - {end_idx} dari {num_rows:,} baris")
+        
+        # Download data: seluruh baris kolom terpilih dibaca hanya saat ekspor diminta
+        st.divider()
+        _render_export(
+            (store.key, filters),
+            num_rows,
+            selected_columns,
+            lambda: store.read(selected_columns, filters)
+        )
+    else:
+        st.warning("⚠️ Pilih minimal satu kolom untuk ditampilkan")
+
+
+def render_table_controls(df: pd.DataFrame):
+    """
+    Kontrol urut dan filter tabel data mentah
+    
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        
+    Returns:
+        Tuple (kolom pengurut atau None, urutan naik, filter)
+    """
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        sort_choice = st.selectbox("Urutkan berdasarkan:", ["(Urutan asli)"] + df.columns.tolist(), key='raw_sort_by')
+    with col2:
+        direction = st.radio("Arah:", ["⬆️ Naik", "⬇️ Turun"], horizontal=True, key='raw_sort_direction')
+    
+    sort_by = None if sort_choice == "(Urutan asli)" else sort_choice
+    ascending = direction == "⬆️ Naik"
+    
+    # Filter nilai pada kolom kategorikal (dievaluasi lewat kode kategori)
+    filters = []
+    with st.expander("🔍 Filter Data"):
+        filtered_columns = st.multiselect("Filter kolom:", filter_columns(df), key='raw_filter_columns')
+        for col in filtered_columns:
+            values = st.multiselect(f"{col}:", column_codes(df, col)[1].tolist(), key=f'raw_filter_{col}')
+            if values:
+                filters.append((col, tuple(values)))
+    
+    return sort_by, ascending, tuple(filters)
+
+
+def render_export(df: pd.DataFrame, columns: list):
+    """
+    Ekspor data sesuai permintaan
+    
+    File hanya ditulis saat tombol ditekan, per potongan baris ke file
+    sementara, lalu dipakai ulang selama dataset, kolom, dan format sama.
+    Isi file baru dibaca saat tombol download diklik.
+    
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        columns: Kolom yang diekspor
+    """
+    _render_export((dataset_key(df),), len(df), columns, lambda: df)
+
+
+def _render_export(source_key: Hashable, num_rows: int, columns: list, load: Callable[[], pd.DataFrame]):
+    """
+    Tombol ekspor dan download untuk sumber data apa pun
+    
+    Args:
+        source_key: Penanda isi sumber data (dataset, filter)
+        num_rows: Jumlah baris yang diekspor
+        columns: Kolom yang diekspor
+        load: Fungsi yang menghasilkan DataFrame sumber, hanya dipanggil saat ekspor
+    """
+    format_name = st.selectbox("Format ekspor:", available_formats(num_rows), key='export_format')
+    export_key = (source_key, tuple(columns), format_name)
+    
+    # File ekspor lama dihapus jika pilihan berubah
+    export = st.session_state.get('export')
+    if export is not None and export.key != export_key:
+        export.remove()
+        export = st.session_state.export = None
+    
+    if export is None:
+        if st.button("📦 Siapkan File Ekspor", use_container_width=True):
+            with st.spinner(f"⏳ Menulis {num_rows:,} baris ke {format_name}..."):
+                try:
+                    export = export_to_tempfile(load(), columns, format_name, key=export_key)
+                except (ImportError, ValueError) as e:
+                    st.error(f"❌ {e}")
+                    return
+            st.session_state.export = export
+    
+    if export is not None:
+        label = f"📥 Download {format_name} ({format_bytes(export.size)})"
+        file_name = f"ecommerce_data{export.format.extension}"
+        if DEFERRED_DOWNLOAD:
+            # Data tertunda: file hanya dibaca saat tombol diklik, tidak di setiap rerun
+            st.download_button(label, export.read, file_name=file_name, mime=export.format.mime, use_container_width=True)
+        else:
+            # Streamlit lama membaca seluruh file ke memori setiap kali tombol dirender:
+            # tombol hanya muncul di run yang membuat file, lalu file sementara dihapus
+            with open(export.path, 'rb') as f:
+                st.download_button(label, f, file_name=file_name, mime=export.format.mime, use_container_width=True)
+            export.remove()
+            st.session_state.export = None
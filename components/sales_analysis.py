@@ -3,9 +3,28 @@ Komponen untuk analisis penjualan
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_processor import format_currency, format_number
+from components.navigation import render_sections
+from utils.data_processor import format_currency, format_number, DAY_NAMES
+from utils.aggregation import get_cube, top_k, COUNT, RETURNED_ORDERS
+from utils.distributions import bin_totals
+from utils.figure_cache import cached_figure
+from utils.timeseries import get_timeseries, AUTO_RESOLUTION
+
+
+# Kolom yang dibaca bagian ini dalam mode out-of-core
+COLUMNS = [
+    'Tanggal', 'Tahun', 'Hari', 'product_categories', 'Total Pembayaran', 'total_qty',
+    'total_returned_qty', 'Total Diskon',
+]
+
+
+DISCOUNT_EDGES = [-1, 0, 10000, 50000, 100000, float('inf')]
+DISCOUNT_LABELS = [
+    'Tanpa Diskon', 'Diskon Kecil (< 10rb)', 'Diskon Sedang (10-50rb)', 'Diskon Besar (50-100rb)', 'Diskon Sangat Besar (> 100rb)'
+]
 
 
 def render_sales_analysis(df: pd.DataFrame):
@@ -17,25 +36,13 @@ def render_sales_analysis(df: pd.DataFrame):
     """
     st.header("📈 Analisis Penjualan")
     
-    # Tab untuk berbagai analisis
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "💰 Analisis Revenue",
-        "📦 Analisis Kategori",
-        "🏷️ Analisis Diskon",
-        "↩️ Analisis Pengembalian"
-    ])
-    
-    with tab1:
-        render_revenue_analysis(df)
-    
-    with tab2:
-        render_category_analysis(df)
-    
-    with tab3:
-        render_discount_analysis(df)
-    
-    with tab4:
-        render_return_analysis(df)
+    # Hanya sub-bagian yang dipilih yang dirender
+    render_sections({
+        "💰 Analisis Revenue": render_revenue_analysis,
+        "📦 Analisis Kategori": render_category_analysis,
+        "🏷️ Analisis Diskon": render_discount_analysis,
+        "↩️ Analisis Pengembalian": render_return_analysis
+    }, df, key='sales_section')
 
 
 def render_revenue_analysis(df: pd.DataFrame):
@@ -50,90 +57,139 @@ def render_revenue_analysis(df: pd.DataFrame):
         # Revenue per hari dalam seminggu
         if 'Hari' in df.columns:
             st.markdown("#### 📅 Pendapatan per Hari dalam Seminggu")
-            
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            day_revenue = df.groupby('Hari')['Total Pembayaran'].sum().reindex(day_order).reset_index()
-            day_revenue.columns = ['Hari', 'Pendapatan']
-            
-            # Translate hari ke Bahasa Indonesia
-            day_translation = {
-                'Monday': 'Senin', 'Tuesday': 'Selasa', 'Wednesday': 'Rabu',
-                'Thursday': 'Kamis', 'Friday': 'Jumat', 'Saturday': 'Sabtu', 'Sunday': 'Minggu'
-            }
-            day_revenue['Hari'] = day_revenue['Hari'].map(day_translation)
-            
-            fig = px.bar(
-                day_revenue,
-                x='Hari',
-                y='Pendapatan',
-                color='Pendapatan',
-                color_continuous_scale='Greens'
-            )
-            
-            fig.update_traces(
-                hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<extra></extra>'
-            )
-            
-            fig.update_layout(height=350, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(cached_figure(_build_day_revenue, df), use_container_width=True)
     
     with col2:
         # Revenue per tahun
         if 'Tahun' in df.columns:
             st.markdown("#### 📊 Pendapatan per Tahun")
-            
-            yearly_revenue = df.groupby('Tahun')['Total Pembayaran'].sum().reset_index()
-            yearly_revenue.columns = ['Tahun', 'Pendapatan']
-            
-            fig = px.bar(
-                yearly_revenue,
-                x='Tahun',
-                y='Pendapatan',
-                color='Pendapatan',
-                color_continuous_scale='Blues',
-                text='Pendapatan'
-            )
-            
-            fig.update_traces(
-                texttemplate='Rp %{text:,.0f}',
-                textposition='outside',
-                hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<extra></extra>'
-            )
-            
-            fig.update_layout(height=350, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(cached_figure(_build_yearly_revenue, df), use_container_width=True)
     
-    # Tren harian
+    # Tren pendapatan multi-resolusi
     if 'Tanggal' in df.columns:
-        st.markdown("#### 📈 Tren Pendapatan Harian")
+        st.markdown("#### 📈 Tren Pendapatan")
         
-        daily_revenue = df.groupby('Tanggal').agg({
-            'Total Pembayaran': 'sum',
-            'order_id': 'count'
-        }).reset_index()
+        timeseries = get_timeseries(df)
+        first_date, last_date = timeseries.date_range()
         
-        daily_revenue.columns = ['Tanggal', 'Pendapatan', 'Jumlah Pesanan']
+        if first_date is None:
+            st.info("ℹ️ Tidak ada data tanggal")
+            return
         
-        fig = go.Figure()
+        col1, col2 = st.columns([3, 1])
         
-        fig.add_trace(go.Scatter(
-            x=daily_revenue['Tanggal'],
-            y=daily_revenue['Pendapatan'],
-            mode='lines',
-            name='Pendapatan',
-            fill='tozeroy',
-            line=dict(color='#1f77b4', width=2),
-            hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<extra></extra>'
-        ))
+        with col1:
+            if first_date < last_date:
+                start, end = st.slider(
+                    "Rentang Tanggal",
+                    min_value=first_date.date(),
+                    max_value=last_date.date(),
+                    value=(first_date.date(), last_date.date()),
+                    format='DD/MM/YYYY',
+                    key='revenue_trend_range'
+                )
+            else:
+                start, end = first_date.date(), last_date.date()
         
-        fig.update_layout(
-            height=400,
-            xaxis_title='Tanggal',
-            yaxis_title='Pendapatan (Rp)',
-            hovermode='x unified'
-        )
+        with col2:
+            resolution = st.selectbox(
+                "Resolusi",
+                [AUTO_RESOLUTION] + timeseries.resolutions,
+                key='revenue_trend_resolution'
+            )
         
+        # Resolusi otomatis makin halus saat rentang dipersempit; titik selalu dibatasi
+        trend, used_resolution = timeseries.series('Total Pembayaran', start, end, resolution)
+        
+        fig = cached_figure(_build_revenue_trend, df, start=start, end=end, resolution=resolution)
         st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"📏 Resolusi: {used_resolution} • {format_number(len(trend))} titik")
+
+
+def _build_day_revenue(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure pendapatan per hari dalam seminggu
+    """
+    # Hari adalah kategori terurut Monday..Sunday, semua hari tetap tampil
+    day_revenue = get_cube(df).query('Hari').set_index('Hari')['Total Pembayaran'].astype('float64')
+    day_revenue = day_revenue.reindex(DAY_NAMES, fill_value=0).rename_axis('Hari').reset_index()
+    day_revenue.columns = ['Hari', 'Pendapatan']
+    
+    # Translate hari ke Bahasa Indonesia
+    day_translation = {
+        'Monday': 'Senin', 'Tuesday': 'Selasa', 'Wednesday': 'Rabu',
+        'Thursday': 'Kamis', 'Friday': 'Jumat', 'Saturday': 'Sabtu', 'Sunday': 'Minggu'
+    }
+    day_revenue['Hari'] = day_revenue['Hari'].astype(str).map(day_translation)
+    
+    fig = px.bar(
+        day_revenue,
+        x='Hari',
+        y='Pendapatan',
+        color='Pendapatan',
+        color_continuous_scale='Greens'
+    )
+    
+    fig.update_traces(
+        hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<extra></extra>'
+    )
+    
+    fig.update_layout(height=350, showlegend=False)
+    return fig
+
+
+def _build_yearly_revenue(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure pendapatan per tahun
+    """
+    yearly_revenue = get_cube(df).query('Tahun')[['Tahun', 'Total Pembayaran']]
+    yearly_revenue.columns = ['Tahun', 'Pendapatan']
+    
+    fig = px.bar(
+        yearly_revenue,
+        x='Tahun',
+        y='Pendapatan',
+        color='Pendapatan',
+        color_continuous_scale='Blues',
+        text='Pendapatan'
+    )
+    
+    fig.update_traces(
+        texttemplate='Rp %{text:,.0f}',
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<extra></extra>'
+    )
+    
+    fig.update_layout(height=350, showlegend=False)
+    return fig
+
+
+def _build_revenue_trend(df: pd.DataFrame, start, end, resolution: str) -> go.Figure:
+    """
+    Figure tren pendapatan untuk rentang tanggal dan resolusi tertentu
+    """
+    trend, used_resolution = get_timeseries(df).series('Total Pembayaran', start, end, resolution)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=trend['Tanggal'],
+        y=trend['Total Pembayaran'],
+        mode='lines',
+        name='Pendapatan',
+        fill='tozeroy',
+        line=dict(color='#1f77b4', width=2),
+        hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        height=400,
+        xaxis_title='Tanggal',
+        yaxis_title=f'Pendapatan {used_resolution} (Rp)',
+        hovermode='x unified'
+    )
+    
+    return fig
 
 
 def render_category_analysis(df: pd.DataFrame):
@@ -146,63 +202,77 @@ def render_category_analysis(df: pd.DataFrame):
         st.warning("⚠️ Data kategori tidak tersedia")
         return
     
-    # Statistik per kategori
-    category_stats = df.groupby('product_categories').agg({
-        'order_id': 'count',
-        'Total Pembayaran': ['sum', 'mean'],
-        'total_qty': 'sum',
-        'Total Diskon': 'sum'
-    }).reset_index()
-    
-    category_stats.columns = ['Kategori', 'Jumlah Pesanan', 'Total Pendapatan', 'Rata-rata Nilai', 'Total Qty', 'Total Diskon']
-    category_stats = category_stats.sort_values('Total Pendapatan', ascending=False)
-    
-    # Tampilkan top 15
-    top_categories = category_stats.head(15)
-    
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("#### 🏆 Top 15 Kategori - Pendapatan")
-        
-        fig = px.treemap(
-            top_categories,
-            path=['Kategori'],
-            values='Total Pendapatan',
-            color='Jumlah Pesanan',
-            color_continuous_scale='RdYlGn',
-            hover_data=['Total Qty', 'Rata-rata Nilai']
-        )
-        
-        fig.update_traces(
-            hovertemplate='<b>%{label}</b><br>Pendapatan: Rp %{value:,.0f}<br>Pesanan: %{color}<extra></extra>'
-        )
-        
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_category_treemap, df, top_n=15), use_container_width=True)
     
     with col2:
         st.markdown("#### 📊 Perbandingan Kategori")
-        
-        fig = px.scatter(
-            top_categories,
-            x='Jumlah Pesanan',
-            y='Rata-rata Nilai',
-            size='Total Pendapatan',
-            color='Kategori',
-            hover_data=['Total Qty'],
-            labels={
-                'Jumlah Pesanan': 'Jumlah Pesanan',
-                'Rata-rata Nilai': 'Rata-rata Nilai Pesanan (Rp)'
-            }
-        )
-        
-        fig.update_traces(
-            hovertemplate='<b>%{customdata[0]}</b><br>Pesanan: %{x}<br>Rata-rata: Rp %{y:,.0f}<extra></extra>'
-        )
-        
-        fig.update_layout(height=500, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_category_scatter, df, top_n=15), use_container_width=True)
+
+
+def _top_categories(df: pd.DataFrame, top_n: int) -> pd.DataFrame:
+    """
+    Statistik top-N kategori berdasarkan pendapatan dari cube
+    """
+    # Rata-rata = total / jumlah pesanan
+    category_stats = get_cube(df).query('product_categories')
+    category_stats['Rata-rata Nilai'] = category_stats['Total Pembayaran'] / category_stats[COUNT]
+    category_stats = category_stats[
+        ['product_categories', COUNT, 'Total Pembayaran', 'Rata-rata Nilai', 'total_qty', 'Total Diskon']
+    ]
+    
+    category_stats.columns = ['Kategori', 'Jumlah Pesanan', 'Total Pendapatan', 'Rata-rata Nilai', 'Total Qty', 'Total Diskon']
+    
+    return top_k(category_stats, 'Total Pendapatan', top_n)
+
+
+def _build_category_treemap(df: pd.DataFrame, top_n: int) -> go.Figure:
+    """
+    Figure treemap pendapatan top-N kategori
+    """
+    fig = px.treemap(
+        _top_categories(df, top_n),
+        path=['Kategori'],
+        values='Total Pendapatan',
+        color='Jumlah Pesanan',
+        color_continuous_scale='RdYlGn',
+        hover_data=['Total Qty', 'Rata-rata Nilai']
+    )
+    
+    fig.update_traces(
+        hovertemplate='<b>%{label}</b><br>Pendapatan: Rp %{value:,.0f}<br>Pesanan: %{color}<extra></extra>'
+    )
+    
+    fig.update_layout(height=500)
+    return fig
+
+
+def _build_category_scatter(df: pd.DataFrame, top_n: int) -> go.Figure:
+    """
+    Figure perbandingan jumlah pesanan vs rata-rata nilai top-N kategori
+    """
+    fig = px.scatter(
+        _top_categories(df, top_n),
+        x='Jumlah Pesanan',
+        y='Rata-rata Nilai',
+        size='Total Pendapatan',
+        color='Kategori',
+        hover_data=['Total Qty'],
+        labels={
+            'Jumlah Pesanan': 'Jumlah Pesanan',
+            'Rata-rata Nilai': 'Rata-rata Nilai Pesanan (Rp)'
+        }
+    )
+    
+    fig.update_traces(
+        hovertemplate='<b>%{customdata[0]}</b><br>Pesanan: %{x}<br>Rata-rata: Rp %{y:,.0f}<extra></extra>'
+    )
+    
+    fig.update_layout(height=500, showlegend=False)
+    return fig
 
 
 def render_discount_analysis(df: pd.DataFrame):
@@ -211,64 +281,76 @@ def render_discount_analysis(df: pd.DataFrame):
     """
     st.subheader("🏷️ Analisis Diskon")
     
-    # Buat kategori diskon
-    df_discount = df.copy()
-    df_discount['Kategori Diskon'] = pd.cut(
-        df_discount['Total Diskon'],
-        bins=[-1, 0, 10000, 50000, 100000, float('inf')],
-        labels=['Tanpa Diskon', 'Diskon Kecil (< 10rb)', 'Diskon Sedang (10-50rb)', 'Diskon Besar (50-100rb)', 'Diskon Sangat Besar (> 100rb)']
-    )
-    
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("#### 💵 Distribusi Kategori Diskon")
-        
-        discount_dist = df_discount['Kategori Diskon'].value_counts().reset_index()
-        discount_dist.columns = ['Kategori', 'Jumlah']
-        
-        fig = px.pie(
-            discount_dist,
-            values='Jumlah',
-            names='Kategori',
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Pastel
-        )
-        
-        fig.update_traces(
-            textposition='inside',
-            textinfo='percent+label'
-        )
-        
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_discount_distribution, df), use_container_width=True)
     
     with col2:
         st.markdown("#### 📊 Pengaruh Diskon terhadap Nilai Pesanan")
-        
-        discount_impact = df_discount.groupby('Kategori Diskon').agg({
-            'Total Pembayaran': 'mean',
-            'total_qty': 'mean',
-            'order_id': 'count'
-        }).reset_index()
-        
-        discount_impact.columns = ['Kategori', 'Rata-rata Pembayaran', 'Rata-rata Qty', 'Jumlah Pesanan']
-        
-        fig = px.bar(
-            discount_impact,
-            x='Kategori',
-            y='Rata-rata Pembayaran',
-            color='Jumlah Pesanan',
-            color_continuous_scale='Oranges',
-            labels={'Rata-rata Pembayaran': 'Rata-rata Nilai Pesanan (Rp)'}
-        )
-        
-        fig.update_traces(
-            hovertemplate='<b>%{x}</b><br>Rata-rata: Rp %{y:,.0f}<br>Pesanan: %{marker.color}<extra></extra>'
-        )
-        
-        fig.update_layout(height=400, xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_discount_impact, df), use_container_width=True)
+
+
+def _discount_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Jumlah pesanan dan rata-rata nilai/qty per kategori diskon (padanan pd.cut + groupby)
+    """
+    counts, payment = bin_totals(df, 'Total Diskon', DISCOUNT_EDGES, sum_column='Total Pembayaran')
+    _, qty = bin_totals(df, 'Total Diskon', DISCOUNT_EDGES, sum_column='total_qty')
+    
+    stats = pd.DataFrame({
+        'Kategori': DISCOUNT_LABELS,
+        'Jumlah Pesanan': counts,
+        'Rata-rata Pembayaran': payment / np.maximum(counts, 1),
+        'Rata-rata Qty': qty / np.maximum(counts, 1)
+    })
+    return stats[stats['Jumlah Pesanan'] > 0]
+
+
+def _build_discount_distribution(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure distribusi kategori diskon
+    """
+    discount_dist = _discount_stats(df)[['Kategori', 'Jumlah Pesanan']]
+    discount_dist.columns = ['Kategori', 'Jumlah']
+    
+    fig = px.pie(
+        discount_dist,
+        values='Jumlah',
+        names='Kategori',
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+    
+    fig.update_traces(
+        textposition='inside',
+        textinfo='percent+label'
+    )
+    
+    fig.update_layout(height=400)
+    return fig
+
+
+def _build_discount_impact(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure rata-rata nilai pesanan per kategori diskon
+    """
+    fig = px.bar(
+        _discount_stats(df),
+        x='Kategori',
+        y='Rata-rata Pembayaran',
+        color='Jumlah Pesanan',
+        color_continuous_scale='Oranges',
+        labels={'Rata-rata Pembayaran': 'Rata-rata Nilai Pesanan (Rp)'}
+    )
+    
+    fig.update_traces(
+        hovertemplate='<b>%{x}</b><br>Rata-rata: Rp %{y:,.0f}<br>Pesanan: %{marker.color}<extra></extra>'
+    )
+    
+    fig.update_layout(height=400, xaxis_tickangle=-45)
+    return fig
 
 
 def render_return_analysis(df: pd.DataFrame):
@@ -277,10 +359,10 @@ def render_return_analysis(df: pd.DataFrame):
     """
     st.subheader("↩️ Analisis Pengembalian Produk")
     
-    # Filter hanya yang ada pengembalian
-    df_returns = df[df['total_returned_qty'] > 0].copy()
+    cube = get_cube(df)
+    returned_orders = cube.total(RETURNED_ORDERS)
     
-    if len(df_returns) == 0:
+    if returned_orders == 0:
         st.info("ℹ️ Tidak ada data pengembalian produk")
         return
     
@@ -289,17 +371,17 @@ def render_return_analysis(df: pd.DataFrame):
     with col1:
         st.metric(
             "📦 Total Pesanan dengan Pengembalian",
-            format_number(len(df_returns))
+            format_number(returned_orders)
         )
     
     with col2:
         st.metric(
             "↩️ Total Produk Dikembalikan",
-            format_number(df_returns['total_returned_qty'].sum())
+            format_number(cube.total('total_returned_qty'))
         )
     
     with col3:
-        return_rate = (len(df_returns) / len(df)) * 100
+        return_rate = (returned_orders / cube.total(COUNT)) * 100
         st.metric(
             "📊 Persentase Pesanan dengan Pengembalian",
             f"{return_rate:.2f}%"
@@ -311,44 +393,61 @@ def render_return_analysis(df: pd.DataFrame):
     
     with col_left:
         # Kategori dengan pengembalian tertinggi
-        if 'product_categories' in df_returns.columns:
+        if 'product_categories' in df.columns:
             st.markdown("#### 🏷️ Top 10 Kategori dengan Pengembalian Tertinggi")
-            
-            category_returns = df_returns.groupby('product_categories')['total_returned_qty'].sum().sort_values(ascending=False).head(10).reset_index()
-            category_returns.columns = ['Kategori', 'Total Dikembalikan']
-            
-            fig = px.bar(
-                category_returns,
-                y='Kategori',
-                x='Total Dikembalikan',
-                orientation='h',
-                color='Total Dikembalikan',
-                color_continuous_scale='Reds'
-            )
-            
-            fig.update_layout(
-                height=400,
-                yaxis={'categoryorder': 'total ascending'}
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(cached_figure(_build_category_returns, df, top_n=10), use_container_width=True)
     
     with col_right:
         # Hubungan antara qty dan return
         st.markdown("#### 📊 Hubungan Qty Pesanan vs Qty Dikembalikan")
-        
-        fig = px.scatter(
-            df_returns,
-            x='total_qty',
-            y='total_returned_qty',
-            color='Total Pembayaran',
-            color_continuous_scale='Viridis',
-            labels={
-                'total_qty': 'Total Qty Pesanan',
-                'total_returned_qty': 'Qty Dikembalikan',
-                'Total Pembayaran': 'Nilai Pesanan (Rp)'
-            }
-        )
-        
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_return_scatter, df), use_container_width=True)
+
+
+def _build_category_returns(df: pd.DataFrame, top_n: int) -> go.Figure:
+    """
+    Figure top-N kategori dengan qty pengembalian tertinggi
+    """
+    # Pesanan tanpa pengembalian menyumbang 0, jadi jumlah cube sama dengan jumlah pada pesanan yang dikembalikan
+    category_returns = get_cube(df).query('product_categories')[['product_categories', 'total_returned_qty']]
+    category_returns = top_k(category_returns, 'total_returned_qty', top_n)
+    category_returns.columns = ['Kategori', 'Total Dikembalikan']
+    
+    fig = px.bar(
+        category_returns,
+        y='Kategori',
+        x='Total Dikembalikan',
+        orientation='h',
+        color='Total Dikembalikan',
+        color_continuous_scale='Reds'
+    )
+    
+    fig.update_layout(
+        height=400,
+        yaxis={'categoryorder': 'total ascending'}
+    )
+    
+    return fig
+
+
+def _build_return_scatter(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure qty pesanan vs qty dikembalikan
+    """
+    # Scatter tetap memerlukan baris individual
+    df_returns = df[df['total_returned_qty'] > 0]
+    
+    fig = px.scatter(
+        df_returns,
+        x='total_qty',
+        y='total_returned_qty',
+        color='Total Pembayaran',
+        color_continuous_scale='Viridis',
+        labels={
+            'total_qty': 'Total Qty Pesanan',
+            'total_returned_qty': 'Qty Dikembalikan',
+            'Total Pembayaran': 'Nilai Pesanan (Rp)'
+        }
+    )
+    
+    fig.update_layout(height=400)
+    return fig
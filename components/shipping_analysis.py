@@ -3,9 +3,27 @@ Komponen untuk analisis pengiriman
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+from components.navigation import render_sections
 from utils.data_processor import format_currency, format_number
+from utils.aggregation import get_cube, COUNT
+from utils.distributions import histogram, bin_totals, density_grid, stratified_sample, ALL_LAYER
+from utils.figure_cache import cached_figure
+
+
+# Kolom yang dibaca bagian ini dalam mode out-of-core
+COLUMNS = [
+    'Opsi Pengiriman', 'Total Pembayaran', 'total_weight_gr', 'Ongkos Kirim Dibayar oleh Pembeli',
+    'Perkiraan Ongkos Kirim', 'Estimasi Potongan Biaya Pengiriman',
+]
+
+
+WEIGHT_CATEGORY_EDGES_GR = [0, 1000, 5000, 10000, 20000, float('inf')]
+WEIGHT_CATEGORY_LABELS = [
+    'Sangat Ringan (< 1kg)', 'Ringan (1-5kg)', 'Sedang (5-10kg)', 'Berat (10-20kg)', 'Sangat Berat (> 20kg)'
+]
 
 
 def render_shipping_analysis(df: pd.DataFrame):
@@ -17,20 +35,12 @@ def render_shipping_analysis(df: pd.DataFrame):
     """
     st.header("🚚 Analisis Pengiriman")
     
-    tab1, tab2, tab3 = st.tabs([
-        "📦 Opsi Pengiriman",
-        "💵 Biaya Pengiriman",
-        "⚖️ Berat Pengiriman"
-    ])
-    
-    with tab1:
-        render_shipping_options(df)
-    
-    with tab2:
-        render_shipping_costs(df)
-    
-    with tab3:
-        render_shipping_weight(df)
+    # Hanya sub-bagian yang dipilih yang dirender
+    render_sections({
+        "📦 Opsi Pengiriman": render_shipping_options,
+        "💵 Biaya Pengiriman": render_shipping_costs,
+        "⚖️ Berat Pengiriman": render_shipping_weight
+    }, df, key='shipping_section')
 
 
 def render_shipping_options(df: pd.DataFrame):
@@ -47,54 +57,80 @@ def render_shipping_options(df: pd.DataFrame):
     
     with col1:
         st.markdown("#### 📊 Jumlah Pesanan per Opsi Pengiriman")
-        
-        shipping_counts = df['Opsi Pengiriman'].value_counts().reset_index()
-        shipping_counts.columns = ['Opsi', 'Jumlah']
-        
-        fig = px.bar(
-            shipping_counts,
-            x='Opsi',
-            y='Jumlah',
-            color='Jumlah',
-            color_continuous_scale='Blues',
-            text='Jumlah'
-        )
-        
-        fig.update_traces(
-            texttemplate='%{text:,}',
-            textposition='outside',
-            hovertemplate='<b>%{x}</b><br>Jumlah: %{y:,}<extra></extra>'
-        )
-        
-        fig.update_layout(height=400, xaxis_tickangle=-45, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_shipping_counts, df), use_container_width=True)
     
     with col2:
         st.markdown("#### 🥧 Persentase Opsi Pengiriman")
-        
-        fig = px.pie(
-            shipping_counts,
-            values='Jumlah',
-            names='Opsi',
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Set2
-        )
-        
-        fig.update_traces(
-            textposition='inside',
-            textinfo='percent+label'
-        )
-        
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_shipping_share, df), use_container_width=True)
     
     # Analisis revenue per opsi pengiriman
     st.markdown("#### 💰 Pendapatan per Opsi Pengiriman")
+    st.plotly_chart(cached_figure(_build_shipping_revenue, df), use_container_width=True)
+
+
+def _shipping_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Jumlah pesanan per opsi pengiriman dari cube, terurut menurun
+    """
+    shipping_stats = get_cube(df).query('Opsi Pengiriman')
+    shipping_counts = shipping_stats[['Opsi Pengiriman', COUNT]].sort_values(COUNT, ascending=False)
+    shipping_counts.columns = ['Opsi', 'Jumlah']
+    return shipping_counts
+
+
+def _build_shipping_counts(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure jumlah pesanan per opsi pengiriman
+    """
+    fig = px.bar(
+        _shipping_counts(df),
+        x='Opsi',
+        y='Jumlah',
+        color='Jumlah',
+        color_continuous_scale='Blues',
+        text='Jumlah'
+    )
+    
+    fig.update_traces(
+        texttemplate='%{text:,}',
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Jumlah: %{y:,}<extra></extra>'
+    )
+    
+    fig.update_layout(height=400, xaxis_tickangle=-45, showlegend=False)
+    return fig
+
+
+def _build_shipping_share(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure persentase opsi pengiriman
+    """
+    fig = px.pie(
+        _shipping_counts(df),
+        values='Jumlah',
+        names='Opsi',
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+    
+    fig.update_traces(
+        textposition='inside',
+        textinfo='percent+label'
+    )
+    
+    fig.update_layout(height=400)
+    return fig
+
+
+def _build_shipping_revenue(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure total pendapatan dan rata-rata nilai pesanan per opsi pengiriman
+    """
+    shipping_stats = get_cube(df).query('Opsi Pengiriman')
     
-    shipping_revenue = df.groupby('Opsi Pengiriman').agg({
-        'Total Pembayaran': ['sum', 'mean'],
-        'order_id': 'count'
-    }).reset_index()
+    shipping_revenue = shipping_stats[['Opsi Pengiriman', 'Total Pembayaran']].copy()
+    shipping_revenue['Rata-rata Nilai'] = shipping_stats['Total Pembayaran'] / shipping_stats[COUNT]
+    shipping_revenue[COUNT] = shipping_stats[COUNT]
     
     shipping_revenue.columns = ['Opsi', 'Total Pendapatan', 'Rata-rata Nilai', 'Jumlah Pesanan']
     shipping_revenue = shipping_revenue.sort_values('Total Pendapatan', ascending=False)
@@ -128,36 +164,201 @@ def render_shipping_options(df: pd.DataFrame):
         xaxis_tickangle=-45
     )
     
+    return fig
+
+
+def _build_histogram(
+    df: pd.DataFrame,
+    column: str,
+    bins: int,
+    scale: float,
+    color: str,
+    x_title: str,
+    hover_range: str
+) -> go.Figure:
+    """
+    Bar chart dari bin histogram yang dihitung di server
+    
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        column: Kolom numerik
+        bins: Jumlah bin
+        scale: Pengali tepi bin untuk satuan tampilan
+        color: Warna bar
+        x_title: Judul sumbu x
+        hover_range: Template rentang bin untuk hover, memakai customdata[0] dan [1]
+    """
+    # Hanya tepi bin dan jumlahnya yang dikirim ke browser
+    counts, edges = histogram(df, column, bins=bins)
+    edges = edges * scale
+    
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=edges[1:] - edges[:-1],
+        customdata=list(zip(edges[:-1], edges[1:])),
+        marker_color=color,
+        hovertemplate=hover_range + '<br>Jumlah: %{y:,}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        height=400,
+        bargap=0,
+        xaxis_title=x_title,
+        yaxis_title='Jumlah Pesanan'
+    )
+    
+    return fig
+
+
+def _render_density(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    x_title: str,
+    y_title: str,
+    key: str,
+    x_scale: float = 1,
+    diagonal: bool = False,
+    height: int = 400
+):
+    """
+    Heatmap kepadatan 2D dari seluruh baris dengan pilihan layer opsi pengiriman
+    
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        x: Kolom sumbu x
+        y: Kolom sumbu y
+        x_title: Judul sumbu x
+        y_title: Judul sumbu y
+        key: Prefix key widget Streamlit
+        x_scale: Pengali nilai x untuk satuan tampilan
+        diagonal: Tambahkan garis y = x
+        height: Tinggi grafik (px)
+    """
+    by = 'Opsi Pengiriman' if 'Opsi Pengiriman' in df.columns else None
+    _, _, _, layers = density_grid(df, x, y, by=by)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        layer = st.selectbox(
+            "Opsi Pengiriman",
+            [ALL_LAYER] + [str(name) for name in layers if name != ALL_LAYER],
+            key=f'{key}_layer'
+        )
+    
+    with col2:
+        show_points = st.checkbox("Tampilkan titik sampel", key=f'{key}_points')
+    
+    fig = cached_figure(
+        _build_density, df,
+        x=x, y=y, by=by, x_title=x_title, y_title=y_title, x_scale=x_scale,
+        diagonal=diagonal, height=height, layer=layer, show_points=show_points
+    )
     st.plotly_chart(fig, use_container_width=True)
 
 
+def _build_density(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    by: str,
+    x_title: str,
+    y_title: str,
+    x_scale: float,
+    diagonal: bool,
+    height: int,
+    layer: str,
+    show_points: bool
+) -> go.Figure:
+    """
+    Figure heatmap kepadatan 2D untuk satu layer (atau semua) dengan titik sampel opsional
+    """
+    x_edges, y_edges, counts, layers = density_grid(df, x, y, by=by)
+    x_edges = x_edges * x_scale
+    
+    if layer == ALL_LAYER:
+        grid = counts.sum(axis=0)
+    else:
+        grid = counts[[str(name) for name in layers].index(layer)]
+    
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=np.where(grid > 0, grid, np.nan),
+        colorscale='Blues',
+        colorbar=dict(title='Pesanan'),
+        hovertemplate=f'{x_title}: %{{x:,.2f}}<br>{y_title}: %{{y:,.0f}}<br>Jumlah: %{{z:,}}<extra></extra>'
+    ))
+    
+    if show_points:
+        # Sampel deterministik per opsi pengiriman, sama di setiap rerun
+        sample = stratified_sample(df, [x, y], by=by)
+        if layer != ALL_LAYER:
+            sample = sample[sample[by].astype(str) == layer]
+        
+        groups = sample.groupby(by, observed=True) if by else [(ALL_LAYER, sample)]
+        for name, points in groups:
+            fig.add_trace(go.Scatter(
+                x=points[x] * x_scale,
+                y=points[y],
+                mode='markers',
+                name=str(name),
+                marker=dict(size=4, opacity=0.6),
+                hovertemplate=f'<b>{name}</b><br>{x_title}: %{{x:,.2f}}<br>{y_title}: %{{y:,.0f}}<extra></extra>'
+            ))
+    
+    if diagonal and len(grid) > 0:
+        max_val = max(x_edges[-1], y_edges[-1])
+        fig.add_trace(go.Scatter(
+            x=[0, max_val],
+            y=[0, max_val],
+            mode='lines',
+            name='Estimasi Sempurna',
+            line=dict(color='red', dash='dash'),
+            hovertemplate='Garis Estimasi Sempurna<extra></extra>'
+        ))
+    
+    fig.update_layout(
+        height=height,
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        legend=dict(orientation='h', yanchor='bottom', y=1.02)
+    )
+    
+    return fig
+
+
 def render_shipping_costs(df: pd.DataFrame):
     """
     Analisis biaya pengiriman
     """
     st.subheader("💵 Analisis Biaya Pengiriman")
     
+    cube = get_cube(df)
+    
     # Metrik ringkasan
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         if 'Ongkos Kirim Dibayar oleh Pembeli' in df.columns:
-            avg_cost = df['Ongkos Kirim Dibayar oleh Pembeli'].mean()
+            avg_cost = cube.mean('Ongkos Kirim Dibayar oleh Pembeli')
             st.metric("📊 Rata-rata Ongkir", format_currency(avg_cost))
     
     with col2:
         if 'Ongkos Kirim Dibayar oleh Pembeli' in df.columns:
-            total_cost = df['Ongkos Kirim Dibayar oleh Pembeli'].sum()
+            total_cost = cube.total('Ongkos Kirim Dibayar oleh Pembeli')
             st.metric("💰 Total Ongkir", format_currency(total_cost))
     
     with col3:
         if 'Perkiraan Ongkos Kirim' in df.columns:
-            avg_estimate = df['Perkiraan Ongkos Kirim'].mean()
+            avg_estimate = cube.mean('Perkiraan Ongkos Kirim')
             st.metric("📈 Rata-rata Estimasi", format_currency(avg_estimate))
     
     with col4:
         if 'Estimasi Potongan Biaya Pengiriman' in df.columns:
-            avg_discount = df['Estimasi Potongan Biaya Pengiriman'].mean()
+            avg_discount = cube.mean('Estimasi Potongan Biaya Pengiriman')
             st.metric("🏷️ Rata-rata Potongan", format_currency(avg_discount))
     
     st.divider()
@@ -169,22 +370,14 @@ def render_shipping_costs(df: pd.DataFrame):
         if 'Ongkos Kirim Dibayar oleh Pembeli' in df.columns:
             st.markdown("#### 📊 Distribusi Biaya Pengiriman")
             
-            fig = px.histogram(
-                df,
-                x='Ongkos Kirim Dibayar oleh Pembeli',
-                nbins=50,
-                color_discrete_sequence=['#3498db'],
-                labels={'Ongkos Kirim Dibayar oleh Pembeli': 'Biaya Pengiriman (Rp)'}
-            )
-            
-            fig.update_traces(
-                hovertemplate='Biaya: Rp %{x:,.0f}<br>Jumlah: %{y}<extra></extra>'
-            )
-            
-            fig.update_layout(
-                height=400,
-                xaxis_title='Biaya Pengiriman (Rp)',
-                yaxis_title='Jumlah Pesanan'
+            fig = cached_figure(
+                _build_histogram, df,
+                column='Ongkos Kirim Dibayar oleh Pembeli',
+                bins=50,
+                scale=1,
+                color='#3498db',
+                x_title='Biaya Pengiriman (Rp)',
+                hover_range='Biaya: Rp %{customdata[0]:,.0f} - %{customdata[1]:,.0f}'
             )
             
             st.plotly_chart(fig, use_container_width=True)
@@ -193,66 +386,58 @@ def render_shipping_costs(df: pd.DataFrame):
         # Biaya pengiriman per opsi
         if 'Opsi Pengiriman' in df.columns and 'Ongkos Kirim Dibayar oleh Pembeli' in df.columns:
             st.markdown("#### 📦 Biaya Rata-rata per Opsi Pengiriman")
-            
-            shipping_avg_cost = df.groupby('Opsi Pengiriman')['Ongkos Kirim Dibayar oleh Pembeli'].mean().sort_values(ascending=True).reset_index()
-            shipping_avg_cost.columns = ['Opsi', 'Rata-rata Biaya']
-            
-            fig = px.bar(
-                shipping_avg_cost,
-                y='Opsi',
-                x='Rata-rata Biaya',
-                orientation='h',
-                color='Rata-rata Biaya',
-                color_continuous_scale='Greens',
-                text='Rata-rata Biaya'
-            )
-            
-            fig.update_traces(
-                texttemplate='Rp %{text:,.0f}',
-                textposition='outside',
-                hovertemplate='<b>%{y}</b><br>Rata-rata: Rp %{x:,.0f}<extra></extra>'
-            )
-            
-            fig.update_layout(
-                height=400,
-                yaxis={'categoryorder': 'total ascending'},
-                showlegend=False
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(cached_figure(_build_shipping_avg_cost, df), use_container_width=True)
     
     # Perbandingan estimasi vs aktual
     if 'Perkiraan Ongkos Kirim' in df.columns and 'Ongkos Kirim Dibayar oleh Pembeli' in df.columns:
         st.markdown("#### 🔍 Perbandingan Estimasi vs Aktual")
         
-        # Ambil sample untuk visualisasi (max 1000 points)
-        df_sample = df.sample(min(1000, len(df)))
-        
-        fig = px.scatter(
-            df_sample,
+        # Seluruh baris dibin ke grid 2D; payload tetap berapa pun jumlah pesanan
+        _render_density(
+            df,
             x='Perkiraan Ongkos Kirim',
             y='Ongkos Kirim Dibayar oleh Pembeli',
-            color='Opsi Pengiriman',
-            labels={
-                'Perkiraan Ongkos Kirim': 'Estimasi Ongkir (Rp)',
-                'Ongkos Kirim Dibayar oleh Pembeli': 'Ongkir Aktual (Rp)'
-            },
-            opacity=0.6
+            x_title='Estimasi Ongkir (Rp)',
+            y_title='Ongkir Aktual (Rp)',
+            key='density_estimate',
+            diagonal=True,
+            height=500
         )
-        
-        # Tambahkan garis diagonal (perfect estimate)
-        max_val = max(df_sample['Perkiraan Ongkos Kirim'].max(), df_sample['Ongkos Kirim Dibayar oleh Pembeli'].max())
-        fig.add_trace(go.Scatter(
-            x=[0, max_val],
-            y=[0, max_val],
-            mode='lines',
-            name='Estimasi Sempurna',
-            line=dict(color='red', dash='dash'),
-            hovertemplate='Garis Estimasi Sempurna<extra></extra>'
-        ))
-        
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+
+
+def _build_shipping_avg_cost(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure biaya pengiriman rata-rata per opsi pengiriman
+    """
+    shipping_stats = get_cube(df).query('Opsi Pengiriman')
+    shipping_avg_cost = pd.DataFrame({
+        'Opsi': shipping_stats['Opsi Pengiriman'],
+        'Rata-rata Biaya': shipping_stats['Ongkos Kirim Dibayar oleh Pembeli'] / shipping_stats[COUNT]
+    }).sort_values('Rata-rata Biaya', ascending=True)
+    
+    fig = px.bar(
+        shipping_avg_cost,
+        y='Opsi',
+        x='Rata-rata Biaya',
+        orientation='h',
+        color='Rata-rata Biaya',
+        color_continuous_scale='Greens',
+        text='Rata-rata Biaya'
+    )
+    
+    fig.update_traces(
+        texttemplate='Rp %{text:,.0f}',
+        textposition='outside',
+        hovertemplate='<b>%{y}</b><br>Rata-rata: Rp %{x:,.0f}<extra></extra>'
+    )
+    
+    fig.update_layout(
+        height=400,
+        yaxis={'categoryorder': 'total ascending'},
+        showlegend=False
+    )
+    
+    return fig
 
 
 def render_shipping_weight(df: pd.DataFrame):
@@ -265,23 +450,23 @@ def render_shipping_weight(df: pd.DataFrame):
         st.warning("⚠️ Data berat pengiriman tidak tersedia")
         return
     
-    # Konversi ke kg
-    df_weight = df.copy()
-    df_weight['total_weight_kg'] = df_weight['total_weight_gr'] / 1000
+    cube = get_cube(df)
+    counts, edges = histogram(df, 'total_weight_gr', bins=50)
     
     # Metrik
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        avg_weight = df_weight['total_weight_kg'].mean()
+        avg_weight = cube.mean('total_weight_gr') / 1000
         st.metric("📊 Rata-rata Berat", f"{avg_weight:.2f} kg")
     
     with col2:
-        total_weight = df_weight['total_weight_kg'].sum()
+        total_weight = cube.total('total_weight_gr') / 1000
         st.metric("⚖️ Total Berat", f"{total_weight:,.0f} kg")
     
     with col3:
-        max_weight = df_weight['total_weight_kg'].max()
+        # Tepi bin terakhir histogram adalah nilai maksimum
+        max_weight = edges[-1] / 1000 if len(counts) else float('nan')
         st.metric("📈 Berat Maksimal", f"{max_weight:,.2f} kg")
     
     st.divider()
@@ -292,92 +477,94 @@ def render_shipping_weight(df: pd.DataFrame):
         # Distribusi berat
         st.markdown("#### 📊 Distribusi Berat Pengiriman")
         
-        fig = px.histogram(
-            df_weight,
-            x='total_weight_kg',
-            nbins=50,
-            color_discrete_sequence=['#9b59b6'],
-            labels={'total_weight_kg': 'Berat (kg)'}
-        )
-        
-        fig.update_traces(
-            hovertemplate='Berat: %{x:.2f} kg<br>Jumlah: %{y}<extra></extra>'
-        )
-        
-        fig.update_layout(
-            height=400,
-            xaxis_title='Berat (kg)',
-            yaxis_title='Jumlah Pesanan'
+        fig = cached_figure(
+            _build_histogram, df,
+            column='total_weight_gr',
+            bins=50,
+            scale=1 / 1000,
+            color='#9b59b6',
+            x_title='Berat (kg)',
+            hover_range='Berat: %{customdata[0]:.2f} - %{customdata[1]:.2f} kg'
         )
         
         st.plotly_chart(fig, use_container_width=True)
     
     with col_right:
         # Hubungan berat dengan biaya pengiriman
-        if 'Ongkos Kirim Dibayar oleh Pembeli' in df_weight.columns:
+        if 'Ongkos Kirim Dibayar oleh Pembeli' in df.columns:
             st.markdown("#### 💰 Hubungan Berat vs Biaya Pengiriman")
             
-            # Sample untuk performa
-            df_sample = df_weight.sample(min(1000, len(df_weight)))
-            
-            fig = px.scatter(
-                df_sample,
-                x='total_weight_kg',
+            _render_density(
+                df,
+                x='total_weight_gr',
                 y='Ongkos Kirim Dibayar oleh Pembeli',
-                color='Opsi Pengiriman' if 'Opsi Pengiriman' in df_sample.columns else None,
-                labels={
-                    'total_weight_kg': 'Berat (kg)',
-                    'Ongkos Kirim Dibayar oleh Pembeli': 'Biaya Pengiriman (Rp)'
-                },
-                opacity=0.6
+                x_title='Berat (kg)',
+                y_title='Biaya Pengiriman (Rp)',
+                key='density_weight',
+                x_scale=1 / 1000
             )
-            
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
     
     # Kategori berat
     st.markdown("#### 📦 Kategori Berat Pengiriman")
     
-    df_weight['Kategori Berat'] = pd.cut(
-        df_weight['total_weight_kg'],
-        bins=[0, 1, 5, 10, 20, float('inf')],
-        labels=['Sangat Ringan (< 1kg)', 'Ringan (1-5kg)', 'Sedang (5-10kg)', 'Berat (10-20kg)', 'Sangat Berat (> 20kg)']
-    )
-    
-    weight_category = df_weight['Kategori Berat'].value_counts().reset_index()
-    weight_category.columns = ['Kategori', 'Jumlah']
-    
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = px.pie(
-            weight_category,
-            values='Jumlah',
-            names='Kategori',
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Pastel
-        )
-        
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_weight_category_share, df), use_container_width=True)
     
     with col2:
         # Pendapatan per kategori berat
-        weight_revenue = df_weight.groupby('Kategori Berat')['Total Pembayaran'].sum().reset_index()
-        weight_revenue.columns = ['Kategori', 'Total Pendapatan']
-        
-        fig = px.bar(
-            weight_revenue,
-            x='Kategori',
-            y='Total Pendapatan',
-            color='Total Pendapatan',
-            color_continuous_scale='Purples'
-        )
-        
-        fig.update_traces(
-            hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<extra></extra>'
-        )
-        
-        fig.update_layout(height=400, xaxis_tickangle=-45, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(_build_weight_category_revenue, df), use_container_width=True)
+
+
+def _weight_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Jumlah pesanan dan pendapatan per kategori berat (padanan pd.cut + groupby tanpa menyalin DataFrame)
+    """
+    category_counts, category_revenue = bin_totals(
+        df, 'total_weight_gr', WEIGHT_CATEGORY_EDGES_GR, sum_column='Total Pembayaran'
+    )
+    
+    weight_category = pd.DataFrame({
+        'Kategori': WEIGHT_CATEGORY_LABELS,
+        'Jumlah': category_counts,
+        'Total Pendapatan': category_revenue
+    })
+    return weight_category[weight_category['Jumlah'] > 0]
+
+
+def _build_weight_category_share(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure persentase pesanan per kategori berat
+    """
+    fig = px.pie(
+        _weight_categories(df),
+        values='Jumlah',
+        names='Kategori',
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+    
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(height=400)
+    return fig
+
+
+def _build_weight_category_revenue(df: pd.DataFrame) -> go.Figure:
+    """
+    Figure pendapatan per kategori berat
+    """
+    fig = px.bar(
+        _weight_categories(df),
+        x='Kategori',
+        y='Total Pendapatan',
+        color='Total Pendapatan',
+        color_continuous_scale='Purples'
+    )
+    
+    fig.update_traces(
+        hovertemplate='<b>%{x}</b><br>Pendapatan: Rp %{y:,.0f}<extra></extra>'
+    )
+    
+    fig.update_layout(height=400, xaxis_tickangle=-45, showlegend=False)
+    return fig
@@ -0,0 +1,418 @@
+"""
+Cube agregat yang dihitung sekali per dataset
+
+Semua komponen dashboard membaca ukuran aditif (jumlah pesanan, total
+pembayaran, qty, diskon, ongkir, pengembalian, berat) per dimensi dari cube
+ini, bukan dari DataFrame mentah. Cube dibangun sekali untuk setiap dataset
+(dikenali dari fingerprint-nya) lalu dipakai bersama oleh semua sesi,
+sehingga biaya render tidak lagi bergantung pada jumlah baris.
+
+Rata-rata diturunkan dari ukuran aditif (jumlah / Jumlah Pesanan).
+"""
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import sql_backend
+from utils.data_processor import dataset_key
+
+
+# Ukuran jumlah baris dan jumlah pesanan yang memiliki pengembalian
+COUNT = 'Jumlah Pesanan'
+RETURNED_ORDERS = 'Pesanan Dikembalikan'
+
+# Kolom yang dijumlahkan; nama ukuran sama dengan nama kolom sumber
+SUM_MEASURES = [
+    'Total Pembayaran',
+    'total_qty',
+    'Total Diskon',
+    'Ongkos Kirim Dibayar oleh Pembeli',
+    'Perkiraan Ongkos Kirim',
+    'Estimasi Potongan Biaya Pengiriman',
+    'total_returned_qty',
+    'total_weight_gr',
+]
+
+# Dimensi tunggal yang masing-masing mendapat cuboid sendiri
+DIMENSIONS = [
+    'Bulan',
+    'Tahun',
+    'Hari',
+    'Tanggal',
+    'Regional',
+    'Provinsi',
+    'Kota/Kabupaten',
+    'Metode Pembayaran',
+    'Opsi Pengiriman',
+    'product_categories',
+    'Status Pesanan',
+]
+
+# Kombinasi dimensi yang dipakai grafik (tren per metode, hierarki regional → provinsi → kota)
+CROSS_DIMENSIONS = [
+    ('Bulan', 'Metode Pembayaran'),
+    ('Regional', 'Provinsi'),
+    ('Provinsi', 'Kota/Kabupaten'),
+]
+
+# Fungsi agregasi yang didukung group_aggregate
+KERNEL_FUNCS = ('sum', 'mean', 'count', 'size', 'nunique')
+
+# Batas jumlah kombinasi kunci untuk indeks gabungan langsung (tanpa sort)
+_DENSE_KEY_LIMIT = 1 << 22
+
+
+def _factorize(series: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Kode integer dan daftar nilai unik sebuah kolom kunci
+
+    Kolom kategorikal memakai kode kategori yang sudah ada (tanpa hashing);
+    kolom lain di-factorize terurut. Nilai kosong mendapat kode -1.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, pd.Index(uniques)
+
+
+def _key_values(series: pd.Series, codes: np.ndarray, uniques: pd.Index) -> pd.Series:
+    """Membentuk kolom kunci hasil dari kode grup, mempertahankan dtype kategorikal"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = pd.Categorical.from_codes(codes, dtype=series.dtype)
+    else:
+        values = uniques.take(codes)
+    return pd.Series(values, name=series.name)
+
+
+def group_aggregate(
+    df: pd.DataFrame,
+    by: Union[str, Sequence[str]],
+    agg: Dict[str, Union[str, List[str]]]
+) -> pd.DataFrame:
+    """
+    Agregasi per grup berbasis np.bincount, pengganti groupby(by).agg(agg).reset_index()
+
+    Kunci diubah menjadi kode integer (kode kategori dipakai langsung), lalu
+    semua sum/count/mean dihitung dengan np.bincount berbobot dalam satu
+    lintasan vektor per kolom. Grup kosong tidak ditampilkan dan baris dengan
+    kunci kosong diabaikan, sama seperti groupby(observed=True, sort=True).
+
+    Args:
+        df: DataFrame sumber
+        by: Nama kolom kunci atau daftar kolom kunci
+        agg: Dictionary kolom → fungsi atau daftar fungsi (lihat KERNEL_FUNCS)
+
+    Returns:
+        DataFrame datar: kolom kunci lalu satu kolom per (kolom, fungsi) sesuai
+        urutan agg. Kolom dengan satu fungsi memakai nama kolom, kolom dengan
+        beberapa fungsi memakai nama "kolom_fungsi".
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+
+    # Kode gabungan (mixed radix) untuk beberapa kunci; baris dengan kunci kosong dibuang
+    factorized = [_factorize(df[key]) for key in keys]
+    sizes = [max(len(uniques), 1) for _, uniques in factorized]
+
+    combined = factorized[0][0].astype('intp')
+    for (codes, _), size in zip(factorized[1:], sizes[1:]):
+        combined = np.where((combined < 0) | (codes < 0), -1, combined * size + codes)
+    valid = combined >= 0
+    all_valid = bool(valid.all())
+    if not all_valid:
+        combined = combined[valid]
+
+    def _rows(values: np.ndarray) -> np.ndarray:
+        return values if all_valid else values[valid]
+
+    if np.prod(sizes, dtype='float64') <= _DENSE_KEY_LIMIT:
+        # Kode gabungan langsung menjadi indeks bincount
+        group_ids, num_groups = combined, int(np.prod(sizes))
+        group_keys = np.arange(num_groups)
+    else:
+        # Terlalu banyak kombinasi: padatkan kode lewat satu kali sort
+        group_keys, group_ids = np.unique(combined, return_inverse=True)
+        num_groups = len(group_keys)
+
+    counts = np.bincount(group_ids, minlength=num_groups)
+    observed = np.flatnonzero(counts)
+
+    # Pecah kembali kode gabungan menjadi nilai per kolom kunci
+    result = {}
+    remainder = group_keys[observed]
+    for key, (_, uniques), size in reversed(list(zip(keys, factorized, sizes))):
+        result[key] = _key_values(df[key], remainder % size, uniques)
+        remainder = remainder // size
+    result = {key: result[key] for key in keys}
+
+    for col, funcs in agg.items():
+        func_list = [funcs] if isinstance(funcs, str) else list(funcs)
+        series = df[col]
+
+        # Jumlah nilai tidak kosong per grup; tanpa nilai kosong sama dengan ukuran grup
+        if any(func in ('sum', 'mean') for func in func_list):
+            numeric = _rows(series.to_numpy(dtype='float64', na_value=np.nan))
+            present = ~np.isnan(numeric)
+            has_missing = not present.all()
+            sums = np.bincount(
+                group_ids,
+                weights=np.where(present, numeric, 0.0) if has_missing else numeric,
+                minlength=num_groups
+            )
+        else:
+            present = _rows(series.notna().to_numpy())
+            has_missing = not present.all()
+        non_null = np.bincount(group_ids[present], minlength=num_groups) if has_missing else counts
+
+        for func in func_list:
+            name = col if isinstance(funcs, str) else f"{col}_{func}"
+
+            if func == 'size':
+                values = counts
+            elif func == 'count':
+                values = non_null
+            elif func == 'sum':
+                values = sums.astype('int64') if series.dtype.kind in 'iub' else sums
+            elif func == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    values = sums / non_null
+            elif func == 'nunique':
+                value_codes, value_uniques = _factorize(series)
+                value_codes = _rows(value_codes)
+                has_value = value_codes >= 0
+                width = max(len(value_uniques), 1)
+                pairs = group_ids[has_value] * width + value_codes[has_value]
+                if num_groups * width <= _DENSE_KEY_LIMIT:
+                    # Bitmap pasangan (grup, nilai) yang muncul, tanpa sort
+                    seen = np.zeros(num_groups * width, dtype=bool)
+                    seen[pairs] = True
+                    values = seen.reshape(num_groups, width).sum(axis=1)
+                else:
+                    values = np.bincount(np.unique(pairs) // width, minlength=num_groups)
+            else:
+                raise ValueError(f"Fungsi agregasi '{func}' tidak didukung ({', '.join(KERNEL_FUNCS)})")
+
+            result[name] = values[observed]
+
+    return pd.DataFrame(result)
+
+
+def top_k(
+    frame: pd.DataFrame,
+    value: str,
+    k: int,
+    by: Optional[str] = None,
+    label: Optional[str] = None,
+    other_label: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Mengambil k baris dengan nilai terbesar (per grup jika `by` diisi)
+
+    Baris diurutkan sekali (np.lexsort: grup, lalu nilai menurun), lalu
+    peringkat dalam grup dihitung dari posisi awal tiap grup, tanpa callback
+    Python per grup.
+
+    Args:
+        frame: DataFrame hasil agregasi (satu baris per item)
+        value: Kolom nilai untuk peringkat
+        k: Jumlah baris teratas yang diambil (per grup)
+        by: Kolom grup, None untuk peringkat global
+        label: Kolom nama item yang diisi other_label pada baris sisa
+        other_label: Jika diisi, sisa baris di luar top-k digabung menjadi satu
+            baris per grup (kolom numerik dijumlahkan, jadi hanya cocok untuk
+            ukuran aditif; kolom lain dikosongkan)
+
+    Returns:
+        DataFrame terurut menurut grup lalu nilai menurun, baris sisa di akhir grupnya
+    """
+    if by is None:
+        codes = np.zeros(len(frame), dtype='intp')
+    else:
+        codes = _factorize(frame[by])[0]
+
+    values = frame[value].to_numpy(dtype='float64', na_value=np.nan)
+    order = np.lexsort((-values, codes))
+
+    # Peringkat = posisi dalam urutan dikurangi posisi awal grupnya
+    sorted_codes = codes[order]
+    is_start = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]
+    starts = np.flatnonzero(is_start)
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+
+    ordered = frame.iloc[order]
+    top = ordered[rank < k]
+
+    if other_label is None or not (rank >= k).any():
+        return top.reset_index(drop=True)
+
+    # Baris sisa sudah terurut per grup: jumlahkan per segmen dengan np.add.reduceat
+    is_tail = rank >= k
+    tail = ordered[is_tail]
+    tail_codes = sorted_codes[is_tail]
+    first = np.flatnonzero(np.r_[True, tail_codes[1:] != tail_codes[:-1]])
+
+    others = {}
+    for col in top.columns:
+        if col == by:
+            others[col] = tail[col].iloc[first].reset_index(drop=True)
+        elif col == label:
+            others[col] = other_label
+        elif pd.api.types.is_numeric_dtype(frame[col]):
+            others[col] = np.add.reduceat(tail[col].to_numpy(), first)
+        else:
+            others[col] = None
+    others = pd.DataFrame(others, index=range(len(first)))
+
+    # Gabungkan lalu urutkan stabil per grup sehingga baris sisa berada di akhir grupnya
+    result = pd.concat([top, others], ignore_index=True)
+    group_codes = np.r_[sorted_codes[~is_tail], tail_codes[first]]
+    return result.iloc[np.argsort(group_codes, kind='stable')].reset_index(drop=True)
+
+
+class AggregateCube:
+    """
+    Kumpulan cuboid: kombinasi dimensi → DataFrame ukuran aditif
+
+    Hasil query selalu berupa salinan sehingga cube aman dipakai bersama.
+    """
+
+    def __init__(self, cuboids: Dict[Tuple[str, ...], pd.DataFrame], measures: List[str]):
+        self._cuboids = cuboids
+        self.measures = measures
+
+    @property
+    def dimensions(self) -> List[Tuple[str, ...]]:
+        """Kombinasi dimensi yang tersedia"""
+        return list(self._cuboids)
+
+    def query(self, *dims: str) -> pd.DataFrame:
+        """
+        Mengambil ukuran aditif per kombinasi dimensi
+
+        Kombinasi yang tidak dihitung langsung di-roll-up dari cuboid terkecil
+        yang memuat semua dimensinya.
+
+        Args:
+            *dims: Nama dimensi; kosong untuk total keseluruhan (satu baris)
+
+        Returns:
+            DataFrame dengan kolom dimensi lalu kolom ukuran, terurut menurut dimensi
+        """
+        if dims in self._cuboids:
+            return self._cuboids[dims].copy()
+
+        candidates = [key for key in self._cuboids if set(dims) <= set(key)]
+        if not candidates:
+            raise KeyError(f"Dimensi {', '.join(dims)} tidak tersedia di cube")
+
+        source = self._cuboids[min(candidates, key=lambda key: len(self._cuboids[key]))]
+        return group_aggregate(source, dims, {measure: 'sum' for measure in self.measures})
+
+    def total(self, measure: str) -> float:
+        """
+        Total keseluruhan sebuah ukuran
+
+        Args:
+            measure: Nama ukuran
+
+        Returns:
+            Nilai total
+        """
+        return self._cuboids[()][measure].iloc[0]
+
+    def mean(self, measure: str) -> float:
+        """
+        Rata-rata per pesanan sebuah ukuran
+
+        Args:
+            measure: Nama ukuran
+
+        Returns:
+            Nilai rata-rata (0 jika dataset kosong)
+        """
+        count = self.total(COUNT)
+        return self.total(measure) / count if count else 0
+
+
+def build_cube(df: pd.DataFrame, backend: str = sql_backend.PANDAS) -> AggregateCube:
+    """
+    Membangun cube agregat dari DataFrame bersih
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        backend: sql_backend.PANDAS (group_aggregate per cuboid) atau
+            sql_backend.DUCKDB (semua cuboid dalam satu query GROUPING SETS)
+
+    Returns:
+        AggregateCube
+    """
+    measures = [COUNT] + [col for col in SUM_MEASURES if col in df.columns]
+    if 'total_returned_qty' in df.columns:
+        measures.append(RETURNED_ORDERS)
+
+    # Kolom ukuran dalam presisi penuh agar jumlah int32/float32 tidak overflow
+    values = pd.DataFrame({COUNT: 1}, index=df.index, dtype='int64')
+    for col in SUM_MEASURES:
+        if col in df.columns:
+            values[col] = df[col].astype('float64')
+    if 'total_returned_qty' in df.columns:
+        values[RETURNED_ORDERS] = (df['total_returned_qty'] > 0).astype('int64')
+
+    cuboids = {(): values.sum().to_frame().T}
+
+    frame = values.assign(**{dim: df[dim] for dim in DIMENSIONS if dim in df.columns})
+    sums = {measure: 'sum' for measure in measures}
+
+    groupings = [(dim,) for dim in DIMENSIONS] + CROSS_DIMENSIONS
+    groupings = [dims for dims in groupings if all(dim in frame.columns for dim in dims)]
+    if backend == sql_backend.DUCKDB:
+        cuboids.update(sql_backend.grouping_sets(frame, groupings, sums))
+    else:
+        for dims in groupings:
+            cuboids[dims] = group_aggregate(frame, dims, sums)
+
+    return AggregateCube(cuboids, measures)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _cached_cube(key: str, backend: str, _df: pd.DataFrame) -> AggregateCube:
+    return build_cube(_df, backend)
+
+
+def get_cube(df: pd.DataFrame) -> AggregateCube:
+    """
+    Cube agregat untuk dataset, dibangun sekali lalu dipakai bersama
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+
+    Returns:
+        AggregateCube
+    """
+    return _cached_cube(dataset_key(df), sql_backend.get_backend(), df)
+
+
+def summary_metrics(cube: AggregateCube) -> dict:
+    """
+    Metrik utama dashboard dari total cube (padanan calculate_metrics)
+
+    Args:
+        cube: Cube agregat dataset
+
+    Returns:
+        Dictionary berisi metrik-metrik
+    """
+    total_qty = cube.total('total_qty')
+    total_returned = cube.total('total_returned_qty')
+
+    return {
+        'total_orders': int(cube.total(COUNT)),
+        'total_revenue': cube.total('Total Pembayaran'),
+        'avg_order_value': cube.mean('Total Pembayaran'),
+        'total_qty_sold': total_qty,
+        'total_discount': cube.total('Total Diskon'),
+        'total_returned': total_returned,
+        'return_rate': (total_returned / total_qty * 100) if total_qty > 0 else 0,
+        'avg_shipping_cost': cube.mean('Ongkos Kirim Dibayar oleh Pembeli'),
+    }
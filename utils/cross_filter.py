@@ -0,0 +1,228 @@
+"""
+Filter global lintas dashboard berbasis bitmap
+
+Untuk setiap kolom filter, setiap nilai unik punya bitmap baris (boolean
+yang dipadatkan np.packbits, 1 bit per baris). Bitmap dibangun sekali per
+dataset; kombinasi filter cukup OR antar nilai terpilih lalu AND antar
+kolom pada array bit yang 8x lebih kecil dari mask boolean, tanpa scan
+isin() berulang. Rentang tanggal pada dataset terurut waktu cukup dua
+binary search. Hasil filter menjadi DataFrame turunan dengan fingerprint
+sendiri sehingga cube, statistik, dan cache grafik tetap valid; hasil filter
+dipakai bersama antar sesi lewat cache terbatas (get_filtered_view).
+"""
+import hashlib
+from datetime import date
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.data_processor import dataset_key, get_date_bounds, time_slice_bounds
+from utils.table_engine import column_codes
+
+
+# Kolom kategorikal yang bisa difilter di panel global
+FILTER_COLUMNS = ['Provinsi', 'Metode Pembayaran', 'Opsi Pengiriman']
+
+# Kolom tanggal untuk filter rentang waktu
+DATE_COLUMN = 'Tanggal'
+
+# Jumlah hasil filter yang disimpan di memori server (dipakai bersama semua sesi)
+FILTERED_VIEW_ENTRIES = 8
+
+
+class GlobalFilters(NamedTuple):
+    """Pilihan filter global (hashable); nilai kosong berarti tanpa filter"""
+    start: Optional[date] = None
+    end: Optional[date] = None
+    values: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()
+
+    @property
+    def active(self) -> bool:
+        """Apakah ada filter yang membatasi baris"""
+        return self.start is not None or self.end is not None or any(selected for _, selected in self.values)
+
+
+class BitmapIndex:
+    """
+    Bitmap per nilai untuk kolom filter, plus batas tanggal dataset
+
+    Bitmap dipakai bersama semua sesi; jangan diubah.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns=FILTER_COLUMNS):
+        self.num_rows = len(df)
+        self.options: Dict[str, list] = {}
+        self._bitmaps: Dict[str, Dict[str, np.ndarray]] = {}
+
+        for col in columns:
+            if col not in df.columns:
+                continue
+            codes, uniques = column_codes(df, col)
+            self.options[col] = uniques.tolist()
+            self._bitmaps[col] = {
+                value: np.packbits(codes == code)
+                for code, value in enumerate(self.options[col])
+            }
+
+        bounds = get_date_bounds(df)
+        self.date_bounds = (bounds[0].date(), bounds[1].date()) if bounds is not None else None
+
+    def bits(self, column: str, values) -> np.ndarray:
+        """Bitmap baris yang bernilai salah satu dari values (OR)"""
+        bitmaps = self._bitmaps[column]
+        result = np.zeros((self.num_rows + 7) // 8, dtype='uint8')
+        for value in values:
+            if value in bitmaps:
+                result |= bitmaps[value]
+        return result
+
+    def mask(self, filters: GlobalFilters) -> Optional[np.ndarray]:
+        """
+        Mask boolean baris yang lolos filter kategorikal (AND antar kolom)
+
+        Args:
+            filters: Pilihan filter global
+
+        Returns:
+            Mask boolean, atau None jika tidak ada filter kategorikal
+        """
+        combined = None
+        for column, values in filters.values:
+            if not values or column not in self._bitmaps:
+                continue
+            column_bits = self.bits(column, values)
+            combined = column_bits if combined is None else combined & column_bits
+
+        if combined is None:
+            return None
+        return np.unpackbits(combined, count=self.num_rows).view(bool)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _cached_bitmap_index(key: str, _df: pd.DataFrame) -> BitmapIndex:
+    return BitmapIndex(_df)
+
+
+def get_bitmap_index(df: pd.DataFrame) -> BitmapIndex:
+    """
+    Bitmap index untuk dataset, dibangun sekali lalu dipakai bersama
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+
+    Returns:
+        BitmapIndex
+    """
+    return _cached_bitmap_index(dataset_key(df), df)
+
+
+def filter_rows(df: pd.DataFrame, filters: GlobalFilters) -> Optional[np.ndarray]:
+    """
+    Posisi baris yang lolos semua filter global
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        filters: Pilihan filter global
+
+    Returns:
+        Array posisi baris, atau None jika tidak ada filter aktif
+    """
+    if not filters.active:
+        return None
+
+    mask = get_bitmap_index(df).mask(filters)
+
+    if filters.start is not None or filters.end is not None:
+        if df.attrs.get('time_sorted'):
+            # Dataset terurut waktu: rentang tanggal = dua binary search
+            lower, upper = time_slice_bounds(df, filters.start, filters.end)
+            if mask is None:
+                return np.arange(lower, upper)
+            return np.flatnonzero(mask[lower:upper]) + lower
+
+        dates = df[DATE_COLUMN].to_numpy()
+        date_mask = np.ones(len(df), dtype=bool)
+        if filters.start is not None:
+            date_mask &= dates >= np.datetime64(filters.start)
+        if filters.end is not None:
+            date_mask &= dates <= np.datetime64(filters.end)
+        mask = date_mask if mask is None else mask & date_mask
+
+    return np.flatnonzero(mask)
+
+
+def filtered_fingerprint(df: pd.DataFrame, filters: GlobalFilters) -> str:
+    """
+    Fingerprint DataFrame hasil filter: fingerprint induk + pilihan filter
+
+    Args:
+        df: DataFrame induk
+        filters: Pilihan filter global
+
+    Returns:
+        Kunci heksadesimal
+    """
+    digest = hashlib.blake2b(dataset_key(df).encode(), digest_size=16)
+    digest.update(repr(tuple(filters)).encode())
+    return digest.hexdigest()
+
+
+def apply_filters(df: pd.DataFrame, filters: GlobalFilters) -> pd.DataFrame:
+    """
+    DataFrame yang hanya berisi baris lolos filter global
+
+    Tanpa filter aktif, DataFrame induk dikembalikan apa adanya (tanpa salinan).
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        filters: Pilihan filter global
+
+    Returns:
+        DataFrame hasil filter dengan fingerprint turunan di attrs
+    """
+    rows = filter_rows(df, filters)
+    if rows is None:
+        return df
+
+    if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+        # Posisi berurutan (mis. hanya filter tanggal): slice tanpa menyalin baris
+        filtered = df.iloc[rows[0]:rows[-1] + 1]
+    else:
+        filtered = df.take(rows)
+
+    # Metadata induk dipertahankan kecuali yang berubah karena jumlah baris berbeda
+    filtered.attrs = {key: value for key, value in df.attrs.items() if key != 'memory_bytes'}
+    filtered.attrs['fingerprint'] = filtered_fingerprint(df, filters)
+    filtered.attrs['parent_rows'] = len(df)
+    if df.attrs.get('time_sorted'):
+        # Posisi naik sehingga urutan waktu tetap; baris tanpa waktu tetap di akhir
+        filtered.attrs['time_valid_rows'] = int(np.searchsorted(rows, df.attrs['time_valid_rows']))
+    return filtered
+
+
+@st.cache_resource(show_spinner=False, max_entries=FILTERED_VIEW_ENTRIES)
+def _cached_filtered_view(key: str, filters: GlobalFilters, _df: pd.DataFrame) -> pd.DataFrame:
+    return apply_filters(_df, filters)
+
+
+def get_filtered_view(df: pd.DataFrame, filters: GlobalFilters) -> pd.DataFrame:
+    """
+    Hasil filter global yang dipakai bersama semua sesi
+
+    Sesi dengan dataset dan pilihan filter yang sama memakai satu salinan baris,
+    dan jumlah salinan di memori server dibatasi FILTERED_VIEW_ENTRIES, bukan
+    bertambah per sesi.
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        filters: Pilihan filter global
+
+    Returns:
+        DataFrame hasil filter (read-only), atau DataFrame induk tanpa filter aktif
+    """
+    if not filters.active:
+        return df
+    return _cached_filtered_view(dataset_key(df), filters, df)
+
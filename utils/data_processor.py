@@ -2,20 +2,398 @@
 Modul untuk memproses dan memuat data e-commerce
 """
 import streamlit as st
+import numpy as np
 import pandas as pd
 import kagglehub
 from kagglehub import KaggleDatasetAdapter
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Sequence, Tuple
+from contextlib import contextmanager
+import codecs
+import csv
+import hashlib
+import io
 import os
 
+from utils import dataset_cache
+from utils.dimensions import add_region_column
+from utils.schema import (
+    REQUIRED_COLUMNS,
+    OPTIONAL_COLUMNS,
+    NUMERIC_COLUMNS,
+    CATEGORICAL_COLUMNS,
+    COMPACT_DTYPES,
+    TIME_DTYPE,
+    parse_options
+)
 
-@st.cache_data(show_spinner=False)
-def load_from_kaggle() -> Optional[pd.DataFrame]:
+
+# Ukuran potongan awal file yang dibaca untuk deteksi delimiter dan header
+SNIFF_BYTES = 64 * 1024
+
+# Jumlah baris maksimal dari potongan awal yang dianalisis csv.Sniffer
+SNIFF_MAX_LINES = 200
+
+# Engine parser cepat: pyarrow (multithread) jika tersedia, jika tidak engine C
+try:
+    import pyarrow  # noqa: F401
+    FAST_CSV_ENGINE = 'pyarrow'
+except ImportError:
+    FAST_CSV_ENGINE = 'c'
+
+
+# Jumlah dan ukuran jendela sampel byte untuk deteksi encoding (awal, tengah, akhir file)
+ENCODING_SAMPLE_WINDOWS = 8
+ENCODING_WINDOW_BYTES = 64 * 1024
+
+# Byte yang tidak terdefinisi di cp1252 (hanya valid sebagai latin1)
+_CP1252_UNDEFINED = frozenset(b'\x81\x8d\x8f\x90\x9d')
+
+
+def _is_path(source) -> bool:
+    """Cek apakah sumber data berupa path file (bukan file-like object)"""
+    return isinstance(source, (str, os.PathLike))
+
+
+def _source_size(source) -> int:
     """
-    Memuat dataset dari Kaggle menggunakan kagglehub
+    Mendapatkan ukuran sumber data dalam byte
     
+    Args:
+        source: Path file atau file-like object
+        
     Returns:
-        DataFrame jika berhasil, None jika gagal
+        Ukuran dalam byte
+    """
+    if _is_path(source):
+        return os.path.getsize(source)
+    
+    size = source.seek(0, os.SEEK_END)
+    source.seek(0)
+    return size
+
+
+def compute_fingerprint(source, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Menghitung fingerprint konten sumber data (hash BLAKE2b dari seluruh byte)
+    
+    Args:
+        source: Path file atau file-like object
+        chunk_size: Ukuran potongan baca
+        
+    Returns:
+        Fingerprint dalam bentuk string heksadesimal
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    
+    handle = open(source, 'rb') if _is_path(source) else source
+    try:
+        handle.seek(0)
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    finally:
+        if _is_path(source):
+            handle.close()
+        else:
+            source.seek(0)
+    
+    return digest.hexdigest()
+
+
+def _read_prefix(source, size: int = SNIFF_BYTES) -> bytes:
+    """
+    Membaca potongan awal file tanpa memindahkan posisi baca
+    
+    Args:
+        source: Path file atau file-like object (mis. file upload Streamlit)
+        size: Jumlah byte yang dibaca
+        
+    Returns:
+        Potongan awal file dalam bentuk bytes
+    """
+    return _read_samples(source, windows=1, window_bytes=size)[0][0]
+
+
+def _read_samples(source, windows: int = ENCODING_SAMPLE_WINDOWS,
+                  window_bytes: int = ENCODING_WINDOW_BYTES) -> Tuple[List[bytes], float]:
+    """
+    Membaca beberapa jendela byte yang tersebar merata dari awal sampai akhir file
+    
+    Args:
+        source: Path file atau file-like object
+        windows: Jumlah jendela sampel
+        window_bytes: Ukuran tiap jendela
+        
+    Returns:
+        Tuple (daftar potongan bytes, cakupan sampel terhadap ukuran file 0-1)
+    """
+    size = _source_size(source)
+    
+    if windows == 1 or size <= window_bytes:
+        offsets = [0]
+    elif size <= windows * window_bytes:
+        # File kecil: seluruh isi file ikut tersampel
+        offsets = list(range(0, size, window_bytes))
+    else:
+        step = (size - window_bytes) / (windows - 1)
+        offsets = [int(i * step) for i in range(windows)]
+    
+    handle = open(source, 'rb') if _is_path(source) else source
+    try:
+        samples = []
+        for offset in offsets:
+            handle.seek(offset)
+            samples.append(handle.read(window_bytes))
+    finally:
+        if _is_path(source):
+            handle.close()
+        else:
+            source.seek(0)
+    
+    coverage = min(1.0, sum(len(sample) for sample in samples) / size) if size else 1.0
+    return samples, coverage
+
+
+def detect_encoding(source) -> Tuple[str, float]:
+    """
+    Mendeteksi encoding file dari sampel byte tanpa mem-parse seluruh file
+    
+    Sampel diambil sekali dari beberapa jendela (awal, tengah, akhir). BOM
+    diperiksa lebih dulu, lalu validitas UTF-8, lalu cp1252/latin1.
+    
+    Args:
+        source: Path file atau file-like object
+        
+    Returns:
+        Tuple (nama codec, tingkat keyakinan 0-1)
+    """
+    samples, coverage = _read_samples(source)
+    head = samples[0]
+    
+    # BOM memberi kepastian penuh
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig', 1.0
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16', 1.0
+    
+    full = coverage >= 1.0
+    is_utf8 = True
+    has_high_bytes = False
+    
+    for i, sample in enumerate(samples):
+        # Jendela tengah bisa dimulai di tengah karakter multibyte, buang byte lanjutan
+        if i > 0:
+            skip = 0
+            while skip < min(3, len(sample)) and 0x80 <= sample[skip] <= 0xBF:
+                skip += 1
+            sample = sample[skip:]
+        
+        has_high_bytes = has_high_bytes or not sample.isascii()
+        
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        except UnicodeDecodeError:
+            is_utf8 = False
+            break
+    
+    if is_utf8:
+        if full:
+            return 'utf-8', 1.0
+        # Urutan multibyte yang valid hampir tidak pernah terjadi di codec lain
+        return 'utf-8', 0.99 if has_high_bytes else 0.9
+    
+    if set().union(*samples) & _CP1252_UNDEFINED:
+        return 'latin1', 0.6
+    return 'cp1252', 0.9 if full else 0.8
+
+
+@contextmanager
+def _open_text(source, encoding: str):
+    """
+    Membuka sumber data sebagai stream teks yang di-decode sekali jalan
+    
+    Byte yang tidak valid diganti (errors='replace') sehingga parser tidak
+    perlu mengulang dari awal dengan encoding lain.
+    
+    Args:
+        source: Path file atau file-like object
+        encoding: Codec hasil deteksi
+    """
+    if _is_path(source):
+        with open(source, 'r', encoding=encoding, errors='replace', newline='') as f:
+            yield f
+        return
+    
+    source.seek(0)
+    wrapper = io.TextIOWrapper(source, encoding=encoding, errors='replace', newline='')
+    try:
+        yield wrapper
+    finally:
+        # Lepas wrapper tanpa menutup file upload milik Streamlit
+        wrapper.detach()
+        source.seek(0)
+
+
+def sniff_csv_format(sample: str) -> Tuple[str, bool, bool]:
+    """
+    Mendeteksi delimiter, header, dan spasi setelah delimiter dari potongan awal CSV
+    
+    Args:
+        sample: Potongan awal file yang sudah di-decode
+        
+    Returns:
+        Tuple (delimiter, has_header, skipinitialspace)
+    """
+    # Buang baris terakhir yang kemungkinan terpotong, batasi jumlah baris
+    lines = sample.splitlines()
+    if len(lines) > 1:
+        lines = lines[:-1]
+    sample = '\n'.join(lines[:SNIFF_MAX_LINES])
+    
+    sniffer = csv.Sniffer()
+    
+    try:
+        dialect = sniffer.sniff(sample, delimiters=',;\t|')
+        delimiter = dialect.delimiter
+        skipinitialspace = bool(dialect.skipinitialspace)
+    except csv.Error:
+        delimiter, skipinitialspace = ',', True
+    
+    try:
+        has_header = sniffer.has_header(sample)
+    except csv.Error:
+        has_header = True
+    
+    return delimiter, has_header, skipinitialspace
+
+
+def _parse_header(sample: str, delimiter: str, skipinitialspace: bool) -> List[str]:
+    """
+    Mengambil nama kolom dari baris pertama potongan awal CSV
+    
+    Args:
+        sample: Potongan awal file yang sudah di-decode
+        delimiter: Delimiter hasil deteksi
+        skipinitialspace: Abaikan spasi setelah delimiter
+        
+    Returns:
+        Daftar nama kolom
+    """
+    reader = csv.reader(io.StringIO(sample), delimiter=delimiter, skipinitialspace=skipinitialspace)
+    return next(reader, [])
+
+
+def read_csv_header(source) -> List[str]:
+    """
+    Membaca nama kolom file CSV tanpa mem-parse isi file
+    
+    Args:
+        source: Path file atau file-like object
+        
+    Returns:
+        Daftar nama kolom, kosong jika file tidak memiliki header
+    """
+    encoding, _ = detect_encoding(source)
+    sample = _read_prefix(source).decode(encoding, errors='replace')
+    delimiter, has_header, skipinitialspace = sniff_csv_format(sample)
+    return _parse_header(sample, delimiter, skipinitialspace) if has_header else []
+
+
+def _read_csv_source(source, extra_columns: Optional[Sequence[str]] = ()) -> Tuple[Optional[pd.DataFrame], str, float, str]:
+    """
+    Membaca CSV sekali jalan dengan encoding hasil deteksi dan parser cepat
+    
+    Encoding dideteksi dari sampel byte, delimiter dan header dari potongan
+    awal file, lalu file di-parse dengan engine pyarrow (multithread) atau C.
+    Registry skema menentukan kolom yang dibaca, dtype-nya, dan kolom tanggal
+    yang di-parse saat pembacaan. Engine python dengan auto-detect separator
+    hanya dipakai jika file benar-benar tidak konsisten.
+    
+    Args:
+        source: Path file atau file-like object
+        extra_columns: Kolom tambahan di luar skema, None untuk memuat semua kolom
+        
+    Returns:
+        Tuple (DataFrame atau None, encoding, keyakinan encoding, engine yang dipakai)
+    """
+    encoding, confidence = detect_encoding(source)
+    
+    sample = _read_prefix(source).decode(encoding, errors='replace')
+    delimiter, has_header, skipinitialspace = sniff_csv_format(sample)
+    
+    # Proyeksi kolom dan dtype hanya bisa diterapkan jika nama kolom diketahui
+    options = {}
+    if has_header:
+        options = parse_options(_parse_header(sample, delimiter, skipinitialspace), extra_columns)
+    
+    # pyarrow tidak mendukung skipinitialspace, gunakan engine C untuk kasus itu
+    engine = 'c' if skipinitialspace else FAST_CSV_ENGINE
+    
+    # Nilai numerik yang kotor membuat dtype eksplisit gagal: ulangi tanpa dtype,
+    # konversi numerik tetap ditangani clean_and_transform
+    attempts = [options, {k: v for k, v in options.items() if k != 'dtype'}]
+    if not options:
+        attempts = attempts[:1]
+    
+    for attempt in attempts:
+        try:
+            with _open_text(source, encoding) as text:
+                df = pd.read_csv(
+                    text,
+                    sep=delimiter,
+                    header=0 if has_header else None,
+                    on_bad_lines='skip',
+                    engine=engine,
+                    **({'skipinitialspace': True} if skipinitialspace else {}),
+                    **attempt
+                )
+            if df is not None and len(df) > 0:
+                return df, encoding, confidence, engine
+        except Exception:
+            continue
+    
+    # Fallback lambat: engine python dengan auto-detect separator
+    with _open_text(source, encoding) as text:
+        df = pd.read_csv(
+            text,
+            on_bad_lines='skip',  # Skip baris yang bermasalah
+            engine='python',
+            sep=None,  # Auto-detect separator
+            skipinitialspace=True,
+            usecols=options.get('usecols'),
+            parse_dates=options.get('parse_dates')
+        )
+    
+    if df is not None and len(df) > 0:
+        return df, encoding, confidence, 'python'
+    
+    return None, encoding, confidence, ''
+
+
+def _attach_source_info(df: pd.DataFrame, encoding: str, confidence: float, engine: str) -> pd.DataFrame:
+    """
+    Menyimpan informasi hasil pembacaan file di metadata DataFrame (df.attrs)
+    
+    Args:
+        df: DataFrame hasil parsing
+        encoding: Codec yang dipakai
+        confidence: Tingkat keyakinan deteksi encoding
+        engine: Engine parser yang dipakai
+        
+    Returns:
+        DataFrame yang sama
+    """
+    df.attrs['encoding'] = encoding
+    df.attrs['encoding_confidence'] = confidence
+    df.attrs['csv_engine'] = engine
+    return df
+
+
+def find_kaggle_csv() -> Optional[str]:
+    """
+    Mengunduh dataset Kaggle (memakai cache lokal kagglehub) dan memilih file CSV-nya
+    
+    Returns:
+        Path file CSV jika ditemukan, None jika gagal
     """
     try:
         # Download dataset dari Kaggle
@@ -38,39 +416,43 @@ def load_from_kaggle() -> Optional[pd.DataFrame]:
             # Pilih file terbesar
             csv_file = max(csv_files, key=os.path.getsize)
         
-        st.info(f"📂 Memuat file: {os.path.basename(csv_file)}")
+        return csv_file
         
-        # Coba berbagai encoding dan parameter (sama seperti load_from_csv)
-        encodings = ['utf-8', 'latin1', 'iso-8859-1', 'cp1252']
+    except Exception as e:
+        st.error(f"❌ Gagal mengunduh data dari Kaggle: {str(e)}")
+        st.info("💡 Tip: Coba gunakan mode 'Upload File CSV' sebagai alternatif")
+        return None
+
+
+def load_from_kaggle(extra_columns: Optional[Tuple[str, ...]] = (), csv_file: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Memuat dataset dari Kaggle menggunakan kagglehub
+    
+    Args:
+        extra_columns: Kolom tambahan di luar skema dashboard, None untuk memuat semua kolom
+        csv_file: Path CSV hasil find_kaggle_csv; None untuk mengunduh/mencari ulang
         
-        for encoding in encodings:
-            try:
-                df = pd.read_csv(
-                    csv_file,
-                    encoding=encoding,
-                    on_bad_lines='skip',
-                    engine='python',
-                    sep=None,
-                    skipinitialspace=True
-                )
-                
-                if df is not None and len(df) > 0:
-                    st.success(f"✅ Data berhasil dimuat dari Kaggle! ({len(df):,} baris, encoding: {encoding})")
-                    return df
-                    
-            except Exception as e:
-                continue
-        
-        # Jika semua encoding gagal, coba dengan parameter paling permisif
-        df = pd.read_csv(
-            csv_file,
-            on_bad_lines='skip',
-            engine='python',
-            encoding_errors='ignore'
-        )
+    Returns:
+        DataFrame jika berhasil, None jika gagal
+    """
+    try:
+        if csv_file is None:
+            csv_file = find_kaggle_csv()
+            if csv_file is None:
+                return None
+        
+        st.info(f"📂 Memuat file: {os.path.basename(csv_file)}")
+        
+        # Deteksi encoding sekali dari sampel byte, lalu parse sekali (sama seperti load_from_csv)
+        df, encoding, confidence, engine = _read_csv_source(csv_file, extra_columns)
         
-        if df is not None and len(df) > 0:
-            st.warning(f"⚠️ Data dimuat dengan beberapa baris dilewati ({len(df):,} baris)")
+        if df is not None:
+            _attach_source_info(df, encoding, confidence, engine)
+            
+            if engine == 'python':
+                st.warning(f"⚠️ Data dimuat dengan beberapa baris dilewati ({len(df):,} baris)")
+            else:
+                st.success(f"✅ Data berhasil dimuat dari Kaggle! ({len(df):,} baris, encoding: {encoding}, keyakinan: {confidence:.0%})")
             return df
         
         return None
@@ -81,56 +463,28 @@ def load_from_kaggle() -> Optional[pd.DataFrame]:
         return None
 
 
-@st.cache_data(show_spinner=False)
-def load_from_csv(uploaded_file) -> Optional[pd.DataFrame]:
+def load_from_csv(uploaded_file, extra_columns: Optional[Tuple[str, ...]] = ()) -> Optional[pd.DataFrame]:
     """
     Memuat data dari file CSV yang diupload
     
     Args:
         uploaded_file: File yang diupload melalui Streamlit
+        extra_columns: Kolom tambahan di luar skema dashboard, None untuk memuat semua kolom
         
     Returns:
         DataFrame jika berhasil, None jika gagal
     """
     try:
-        # Coba berbagai encoding dan parameter
-        encodings = ['utf-8', 'latin1', 'iso-8859-1', 'cp1252']
-        
-        for encoding in encodings:
-            try:
-                # Reset file pointer
-                uploaded_file.seek(0)
-                
-                # Coba baca dengan encoding tertentu
-                df = pd.read_csv(
-                    uploaded_file,
-                    encoding=encoding,
-                    on_bad_lines='skip',  # Skip baris yang bermasalah
-                    engine='python',  # Gunakan engine python untuk lebih fleksibel
-                    sep=None,  # Auto-detect separator
-                    skipinitialspace=True  # Skip spasi di awal
-                )
-                
-                # Jika berhasil dan ada data, return
-                if df is not None and len(df) > 0:
-                    st.success(f"✅ File berhasil dibaca dengan encoding: {encoding}")
-                    return df
-                    
-            except Exception as e:
-                # Lanjut ke encoding berikutnya
-                continue
-        
-        # Jika semua encoding gagal, coba dengan parameter default tapi lebih permisif
-        uploaded_file.seek(0)
-        df = pd.read_csv(
-            uploaded_file,
-            on_bad_lines='skip',
-            engine='python',
-            encoding_errors='ignore'  # Ignore encoding errors
-        )
+        # Deteksi encoding sekali dari sampel byte, lalu parse sekali
+        df, encoding, confidence, engine = _read_csv_source(uploaded_file, extra_columns)
         
-        if df is not None and len(df) > 0:
-            st.warning("⚠️ File dibaca dengan beberapa baris dilewati karena format tidak konsisten")
+        if df is not None:
+            _attach_source_info(df, encoding, confidence, engine)
+            
+            if engine == 'python':
+                st.warning("⚠️ File dibaca dengan beberapa baris dilewati karena format tidak konsisten")
+            else:
+                st.success(f"✅ File berhasil dibaca dengan encoding: {encoding} (keyakinan: {confidence:.0%})")
             return df
         
         return None
@@ -142,6 +496,111 @@ def load_from_csv(uploaded_file) -> Optional[pd.DataFrame]:
 
 
 
+def clean_cache_key(
+    source_fingerprint: str,
+    extra_columns: Optional[Tuple[str, ...]] = (),
+    compact: bool = False,
+    pipeline: Optional[Callable] = None
+) -> str:
+    """
+    Kunci cache dataset bersih untuk sumber dan opsi pemuatan
+    
+    Hasil pipeline alternatif disimpan terpisah dari jalur pandas agar dataset
+    yang diterima sesi tidak bergantung pada pipeline yang lebih dulu mengisi cache.
+    
+    Args:
+        source_fingerprint: Fingerprint byte sumber data
+        extra_columns: Kolom tambahan yang dimuat loader
+        compact: Mode hemat memori
+        pipeline: Pipeline alternatif (nama fungsinya menjadi bagian kunci), atau None
+        
+    Returns:
+        Kunci cache heksadesimal
+    """
+    if pipeline is None:
+        return dataset_cache.cache_key(source_fingerprint, extra_columns, compact)
+    return dataset_cache.cache_key(source_fingerprint, extra_columns, compact, pipeline.__name__)
+
+
+def load_clean_dataset(
+    source_fingerprint: str,
+    loader: Callable[[], Optional[pd.DataFrame]],
+    extra_columns: Optional[Tuple[str, ...]] = (),
+    compact: bool = False,
+    pipeline: Optional[Callable[[], Optional[Tuple[Optional[pd.DataFrame], str]]]] = None
+) -> Tuple[Optional[pd.DataFrame], str]:
+    """
+    Pipeline load → validasi → clean dengan cache kolumnar persisten
+    
+    Jika hasil pembersihan untuk sumber dan opsi yang sama sudah ada di cache
+    disk, dataset dibaca langsung lewat memory-map tanpa parsing CSV.
+    
+    Args:
+        source_fingerprint: Fingerprint byte sumber data (lihat compute_fingerprint)
+        loader: Fungsi tanpa argumen yang memuat DataFrame mentah
+        extra_columns: Kolom tambahan yang dimuat loader (bagian dari kunci cache)
+        compact: Mode hemat memori untuk clean_and_transform
+        pipeline: Alternatif load → validasi → clean sekaligus (mis. Polars) yang
+            mengembalikan (DataFrame atau None, pesan), atau None jika sumber tidak
+            didukung sehingga loader + clean_and_transform yang dipakai. Hasilnya
+            disimpan di kunci cache tersendiri (lihat clean_cache_key).
+        
+    Returns:
+        Tuple (DataFrame bersih atau None, pesan)
+    """
+    key = clean_cache_key(source_fingerprint, extra_columns, compact, pipeline)
+    
+    df = dataset_cache.load(key)
+    if df is not None:
+        df.attrs['fingerprint'] = key
+        st.info("⚡ Data dimuat dari cache (tanpa parsing ulang)")
+        return df, "✅ Data valid!"
+    
+    result = pipeline() if pipeline is not None else None
+    if result is not None:
+        df, message = result
+        if df is None:
+            return None, message
+    else:
+        df = loader()
+        if df is None:
+            return None, "Gagal memuat data"
+        
+        # Validasi data
+        is_valid, message = validate_dataframe(df)
+        if not is_valid:
+            return None, message
+        
+        # Clean dan transform
+        df = clean_and_transform(df, compact=compact)
+    
+    df.attrs['fingerprint'] = key
+    dataset_cache.store(key, df)
+
+    return df, message
+
+
+def dataset_key(df: pd.DataFrame) -> str:
+    """
+    Identitas dataset untuk cache turunan (agregat, grafik, dsb.)
+
+    Memakai fingerprint dari load_clean_dataset; DataFrame tanpa fingerprint
+    (mis. dibuat langsung di kode) di-hash sekali dari isinya.
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+
+    Returns:
+        Kunci heksadesimal
+    """
+    if 'fingerprint' not in df.attrs:
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+        digest.update(repr(list(df.columns)).encode())
+        df.attrs['fingerprint'] = digest.hexdigest()
+    return df.attrs['fingerprint']
+
+
 def validate_dataframe(df: pd.DataFrame) -> Tuple[bool, str]:
     """
     Validasi struktur DataFrame
@@ -152,25 +611,22 @@ def validate_dataframe(df: pd.DataFrame) -> Tuple[bool, str]:
     Returns:
         Tuple (is_valid, message)
     """
-    # Kolom yang diperlukan (core columns)
-    required_columns = [
-        'total_qty', 'Total Pembayaran', 'Waktu Pesanan Dibuat'
-    ]
-    
-    # Kolom opsional tapi penting
-    optional_columns = [
-        'order_id', 'total_weight_gr', 'total_returned_qty',
-        'Total Diskon', 'product_categories', 'num_product_categories',
-        'Status Pesanan', 'Opsi Pengiriman', 'Metode Pembayaran',
-        'Kota/Kabupaten', 'Provinsi', 'Ongkos Kirim Dibayar oleh Pembeli',
-        'Perkiraan Ongkos Kirim', 'Estimasi Potongan Biaya Pengiriman'
-    ]
-    
-    # Cek kolom yang tersedia
-    available_columns = df.columns.tolist()
+    return validate_columns(df.columns.tolist(), len(df))
+
+
+def validate_columns(available_columns: List[str], num_rows: Optional[int] = None) -> Tuple[bool, str]:
+    """
+    Validasi nama kolom dan jumlah baris (tanpa membutuhkan DataFrame)
     
+    Args:
+        available_columns: Nama kolom yang tersedia
+        num_rows: Jumlah baris, None jika belum diketahui (cek jumlah baris dilewati)
+        
+    Returns:
+        Tuple (is_valid, message)
+    """
     # Cek kolom wajib
-    missing_required = [col for col in required_columns if col not in available_columns]
+    missing_required = [col for col in REQUIRED_COLUMNS if col not in available_columns]
     
     if missing_required:
         st.warning(f"⚠️ Kolom wajib yang hilang: {', '.join(missing_required)}")
@@ -178,25 +634,125 @@ def validate_dataframe(df: pd.DataFrame) -> Tuple[bool, str]:
         return False, f"Kolom wajib yang hilang: {', '.join(missing_required)}"
     
     # Cek kolom opsional
-    missing_optional = [col for col in optional_columns if col not in available_columns]
+    missing_optional = [col for col in OPTIONAL_COLUMNS if col not in available_columns]
     
     if missing_optional:
         st.info(f"ℹ️ Beberapa kolom opsional tidak tersedia: {', '.join(missing_optional[:5])}...")
         st.info("Aplikasi akan tetap berjalan dengan fitur terbatas")
     
     # Validasi minimal jumlah baris
-    if len(df) < 10:
-        return False, f"⚠️ Data terlalu sedikit ({len(df)} baris). Minimal 10 baris diperlukan."
+    if num_rows is not None and num_rows < 10:
+        return False, f"⚠️ Data terlalu sedikit ({num_rows} baris). Minimal 10 baris diperlukan."
     
     return True, "✅ Data valid!"
 
 
-def clean_and_transform(df: pd.DataFrame) -> pd.DataFrame:
+# Urutan hari untuk kolom Hari (kategori terurut, Senin = 0 seperti dt.dayofweek)
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def add_time_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Menambahkan kolom waktu turunan bertipe dari 'Waktu Pesanan Dibuat'
+    
+    - Tanggal: datetime64 yang dinormalisasi ke awal hari
+    - Bulan: kategori terurut berlabel 'YYYY-MM', urutan kategori = urutan kronologis
+    - Tahun: integer
+    - Hari: kategori terurut Monday..Sunday
+    
+    Args:
+        df: DataFrame dengan kolom 'Waktu Pesanan Dibuat' bertipe datetime
+        
+    Returns:
+        DataFrame yang sama dengan kolom waktu turunan
+    """
+    timestamps = df['Waktu Pesanan Dibuat']
+    
+    df['Tanggal'] = timestamps.dt.normalize()
+    
+    df['Bulan'] = month_categorical(timestamps.dt.year * 12 + timestamps.dt.month - 1)
+    df['Tahun'] = timestamps.dt.year
+    df['Hari'] = day_categorical(timestamps.dt.dayofweek)
+    
+    return df
+
+
+def month_categorical(month_index: pd.Series) -> pd.Categorical:
+    """
+    Kolom Bulan dari indeks bulan absolut (tahun * 12 + bulan - 1)
+    
+    Indeks langsung menjadi kode kategori berlabel 'YYYY-MM' tanpa format
+    string per baris; urutan kategori = urutan kronologis.
+    
+    Args:
+        month_index: Indeks bulan per baris (NaN/NA untuk waktu kosong)
+        
+    Returns:
+        Kategori terurut
+    """
+    if month_index.notna().any():
+        first, last = int(month_index.min()), int(month_index.max())
+    else:
+        first, last = 0, -1
+    labels = [f"{m // 12}-{m % 12 + 1:02d}" for m in range(first, last + 1)]
+    return pd.Categorical.from_codes(
+        (month_index - first).fillna(-1).astype('int32'),
+        categories=labels,
+        ordered=True
+    )
+
+
+def day_categorical(dayofweek: pd.Series) -> pd.Categorical:
+    """
+    Kolom Hari dari nomor hari (Senin = 0, NaN/NA untuk waktu kosong)
+    
+    Args:
+        dayofweek: Nomor hari per baris
+        
+    Returns:
+        Kategori terurut Monday..Sunday
+    """
+    return pd.Categorical.from_codes(
+        dayofweek.fillna(-1).astype('int8'),
+        categories=DAY_NAMES,
+        ordered=True
+    )
+
+
+def parse_order_time(values: pd.Series) -> pd.Series:
+    """
+    Mengonversi waktu pesanan ke datetime tanpa zona waktu
+    
+    Waktu dengan offset (mis. '2024-05-01T10:00:00+07:00') dinormalisasi ke UTC
+    lalu zona waktunya dilepas, sama seperti hasil parser pyarrow, sehingga
+    pengurutan, filter tanggal, dan searchsorted bekerja pada datetime naive.
+    Resolusi dibakukan ke mikrodetik, apa pun hasil parser CSV (detik untuk
+    file bersih, teks untuk file kotor), sama dengan pipeline Polars dan
+    dataset terpartisi.
+    
+    Args:
+        values: Kolom waktu mentah (teks atau datetime)
+        
+    Returns:
+        Series datetime64[us] naive, nilai tidak valid menjadi NaT
+    """
+    try:
+        timestamps = pd.to_datetime(values, errors='coerce')
+    except ValueError:
+        # Offset zona waktu yang berbeda-beda: samakan ke UTC
+        timestamps = pd.to_datetime(values, errors='coerce', utc=True)
+    if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+        timestamps = timestamps.dt.tz_convert(None)
+    return timestamps.astype(TIME_DTYPE)
+
+
+def clean_and_transform(df: pd.DataFrame, compact: bool = False) -> pd.DataFrame:
     """
     Membersihkan dan mentransformasi data
     
     Args:
         df: DataFrame mentah
+        compact: Gunakan representasi hemat memori (kategorikal, numerik diturunkan)
         
     Returns:
         DataFrame yang sudah dibersihkan
@@ -205,47 +761,165 @@ def clean_and_transform(df: pd.DataFrame) -> pd.DataFrame:
     
     # Generate order_id jika tidak ada
     if 'order_id' not in df.columns:
-        df['order_id'] = [f'ORD_{i:07d}' for i in range(1, len(df) + 1)]
+        if compact:
+            # ID sintetis berupa integer, jauh lebih ringan daripada string Python
+            df['order_id'] = np.arange(1, len(df) + 1, dtype='int32')
+        else:
+            df['order_id'] = [f'ORD_{i:07d}' for i in range(1, len(df) + 1)]
         st.info("ℹ️ Kolom 'order_id' dibuat otomatis")
     
     # Konversi kolom tanggal
     if 'Waktu Pesanan Dibuat' in df.columns:
-        df['Waktu Pesanan Dibuat'] = pd.to_datetime(df['Waktu Pesanan Dibuat'], errors='coerce')
-        df['Tanggal'] = df['Waktu Pesanan Dibuat'].dt.date
-        df['Bulan'] = df['Waktu Pesanan Dibuat'].dt.to_period('M').astype(str)
-        df['Tahun'] = df['Waktu Pesanan Dibuat'].dt.year
-        df['Hari'] = df['Waktu Pesanan Dibuat'].dt.day_name()
-    
-    # Konversi kolom numerik
-    numeric_columns = [
-        'total_qty', 'total_weight_gr', 'total_returned_qty',
-        'Total Diskon', 'Total Pembayaran', 'Ongkos Kirim Dibayar oleh Pembeli',
-        'Perkiraan Ongkos Kirim', 'Estimasi Potongan Biaya Pengiriman'
-    ]
-    
-    for col in numeric_columns:
+        df['Waktu Pesanan Dibuat'] = parse_order_time(df['Waktu Pesanan Dibuat'])
+        add_time_columns(df)
+    
+    # Kolom datetime lain (di luar skema) memakai resolusi yang sama
+    for col in df.columns:
+        if df[col].dtype.kind == 'M' and df[col].dtype != TIME_DTYPE:
+            df[col] = df[col].astype(TIME_DTYPE)
+    
+    # Konversi kolom numerik: selalu float64, tidak bergantung inferensi parser
+    # (file kotor dibaca ulang tanpa dtype sehingga kolom bulat menjadi int64)
+    for col in NUMERIC_COLUMNS:
         if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('float64')
         else:
             # Buat kolom dengan nilai default 0 jika tidak ada
             df[col] = 0
     
     # Bersihkan nilai null di kolom kategorikal
-    categorical_columns = [
-        'Status Pesanan', 'Opsi Pengiriman', 'Metode Pembayaran',
-        'Kota/Kabupaten', 'Provinsi', 'product_categories'
-    ]
-    
-    for col in categorical_columns:
+    for col in CATEGORICAL_COLUMNS:
         if col in df.columns:
             df[col] = df[col].fillna('Tidak Diketahui')
         else:
             # Buat kolom dengan nilai default jika tidak ada
             df[col] = 'Tidak Diketahui'
     
+    # Regional dari tabel dimensi provinsi (lookup per kategori, bukan per baris)
+    add_region_column(df)
+    
     # Handle kolom num_product_categories
     if 'num_product_categories' not in df.columns:
         df['num_product_categories'] = 1
+    else:
+        df['num_product_categories'] = pd.to_numeric(df['num_product_categories'], errors='coerce').astype('float64')
+    
+    if compact:
+        before = df.memory_usage(deep=True).sum()
+        df = compact_dataframe(df)
+        after = df.memory_usage(deep=True).sum()
+        st.info(f"💾 Mode hemat memori: {format_bytes(before)} → {format_bytes(after)} ({1 - after / before:.0%} lebih kecil)")
+    
+    # Urutkan menurut waktu pesanan agar filter rentang tanggal cukup binary search
+    if 'Waktu Pesanan Dibuat' in df.columns:
+        df = sort_by_time(df)
+    
+    df.attrs['memory_bytes'] = int(df.memory_usage(deep=True).sum())
+    
+    return df
+
+
+def sort_by_time(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mengurutkan baris menurut 'Waktu Pesanan Dibuat' (stabil, waktu kosong di akhir)
+    
+    Hasilnya ditandai di attrs: 'time_sorted' dan 'time_valid_rows' (jumlah baris
+    dengan waktu terisi, semuanya berada di depan). Dengan penanda ini rentang
+    tanggal dibaca dari ujung kolom dan filter tanggal memakai searchsorted.
+    
+    Args:
+        df: DataFrame dengan kolom 'Waktu Pesanan Dibuat' bertipe datetime
+        
+    Returns:
+        DataFrame terurut dengan index 0..n-1
+    """
+    timestamps = df['Waktu Pesanan Dibuat']
+    missing = timestamps.isna().to_numpy()
+    
+    # NaT bernilai int64 minimum; dipindah ke akhir lewat kunci maksimum
+    # (asi8 berlaku untuk datetime naive maupun ber-zona waktu)
+    keys = np.where(missing, np.iinfo('int64').max, timestamps.array.asi8)
+    if not (keys[1:] >= keys[:-1]).all():
+        df = df.take(np.argsort(keys, kind='stable')).reset_index(drop=True)
+    
+    df.attrs['time_sorted'] = True
+    df.attrs['time_valid_rows'] = int(len(df) - missing.sum())
+    return df
+
+
+def time_slice_bounds(df: pd.DataFrame, start=None, end=None) -> Tuple[int, int]:
+    """
+    Posisi baris [awal, akhir) untuk rentang tanggal pada dataset terurut waktu
+    
+    Args:
+        df: DataFrame hasil sort_by_time (attrs 'time_sorted')
+        start: Tanggal awal (inklusif), None untuk sejak awal
+        end: Tanggal akhir (inklusif, sepanjang hari itu), None untuk sampai akhir
+        
+    Returns:
+        Tuple (posisi awal, posisi akhir) sehingga df.iloc[awal:akhir] adalah rentangnya
+    """
+    timestamps = df['Waktu Pesanan Dibuat'].to_numpy()[:df.attrs['time_valid_rows']]
+    
+    lower = 0 if start is None else int(np.searchsorted(timestamps, np.datetime64(pd.Timestamp(start)), side='left'))
+    if end is None:
+        upper = len(timestamps)
+    else:
+        end_exclusive = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+        upper = int(np.searchsorted(timestamps, np.datetime64(end_exclusive), side='left'))
+    return lower, max(upper, lower)
+
+
+def _downcast_numeric(series: pd.Series, dtype: Optional[str] = None) -> pd.Series:
+    """
+    Menurunkan tipe kolom numerik tanpa kehilangan nilai
+    
+    Args:
+        series: Kolom numerik yang sudah bersih (tanpa NaN)
+        dtype: Tipe target; None untuk integer terkecil (minimal int32) jika semua nilai bulat
+        
+    Returns:
+        Kolom dengan tipe yang lebih ringkas, atau kolom asli jika tidak aman
+    """
+    values = series.to_numpy()
+    is_integral = np.array_equal(values, np.floor(values)) if values.dtype.kind == 'f' else True
+    
+    if dtype is None:
+        if not is_integral or len(values) == 0:
+            return series
+        info = np.iinfo('int32')
+        if values.min() >= info.min and values.max() <= info.max:
+            return series.astype('int32')
+        return series.astype('int64')
+    
+    if np.dtype(dtype).kind == 'i':
+        info = np.iinfo(dtype)
+        if not is_integral or (len(values) and (values.min() < info.min or values.max() > info.max)):
+            return series.astype('float32')
+    
+    return series.astype(dtype)
+
+
+def compact_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mengubah DataFrame bersih ke representasi hemat memori
+    
+    Kolom kategorikal di-dictionary-encode (dtype category), kuantitas menjadi
+    int32, berat menjadi float32, dan kolom uang bernilai bulat menjadi integer.
+    
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        
+    Returns:
+        DataFrame dengan dtype ringkas
+    """
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    
+    for col in NUMERIC_COLUMNS + ['num_product_categories']:
+        if col in df.columns and df[col].dtype.kind in 'iuf':
+            df[col] = _downcast_numeric(df[col], COMPACT_DTYPES.get(col))
     
     return df
 
@@ -274,6 +948,34 @@ def calculate_metrics(df: pd.DataFrame) -> dict:
     return metrics
 
 
+def get_date_bounds(df: pd.DataFrame) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """
+    Waktu pesanan paling awal dan paling akhir
+    
+    Dataset terurut waktu (sort_by_time) dibaca langsung dari ujung kolom
+    tanpa scan; DataFrame lain memakai min/max.
+    
+    Args:
+        df: DataFrame
+        
+    Returns:
+        Tuple (awal, akhir), atau None jika tidak ada waktu pesanan
+    """
+    if 'Waktu Pesanan Dibuat' not in df.columns:
+        return None
+    
+    timestamps = df['Waktu Pesanan Dibuat']
+    if df.attrs.get('time_sorted'):
+        valid_rows = df.attrs['time_valid_rows']
+        if valid_rows == 0:
+            return None
+        return timestamps.iloc[0], timestamps.iloc[valid_rows - 1]
+    
+    if timestamps.notna().any():
+        return timestamps.min(), timestamps.max()
+    return None
+
+
 def get_date_range(df: pd.DataFrame) -> Tuple[str, str]:
     """
     Mendapatkan rentang tanggal dari data
@@ -284,9 +986,9 @@ def get_date_range(df: pd.DataFrame) -> Tuple[str, str]:
     Returns:
         Tuple (tanggal_awal, tanggal_akhir)
     """
-    if 'Waktu Pesanan Dibuat' in df.columns:
-        min_date = df['Waktu Pesanan Dibuat'].min()
-        max_date = df['Waktu Pesanan Dibuat'].max()
+    bounds = get_date_bounds(df)
+    if bounds is not None:
+        min_date, max_date = bounds
         return min_date.strftime('%d %B %Y'), max_date.strftime('%d %B %Y')
     return "N/A", "N/A"
 
@@ -315,3 +1017,20 @@ def format_number(value: float) -> str:
         String terformat
     """
     return f"{value:,.0f}".replace(',', '.')
+
+
+def format_bytes(value: float) -> str:
+    """
+    Format ukuran memori dalam satuan yang mudah dibaca
+    
+    Args:
+        value: Ukuran dalam byte
+        
+    Returns:
+        String terformat
+    """
+    for unit in ['B', 'KB', 'MB']:
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
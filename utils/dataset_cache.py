@@ -0,0 +1,208 @@
+"""
+Cache persisten (kolumnar) untuk dataset yang sudah dibersihkan
+
+Hasil clean_and_transform disimpan sebagai file Arrow IPC (Feather v2) tanpa
+kompresi sehingga bisa dibaca ulang lewat memory-map. Kunci cache adalah hash
+dari fingerprint sumber, versi kode pembersihan, dan opsi pemuatan. Ukuran
+direktori cache dibatasi dan file yang paling lama tidak dipakai dihapus lebih
+dulu (LRU).
+"""
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from typing import Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+
+# Lokasi dan batas ukuran cache, bisa diubah lewat environment variable
+CACHE_DIR = os.environ.get(
+    'ECOMMERCE_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'ecommerce-dashboard')
+)
+CACHE_MAX_BYTES = int(float(os.environ.get('ECOMMERCE_CACHE_MAX_MB', '2048')) * 1024 * 1024)
+
+CACHE_SUFFIX = '.arrow'
+
+# Modul yang menentukan hasil pembersihan; perubahan isinya membatalkan cache
+_CLEANING_MODULES = ['data_processor.py', 'schema.py', 'dimensions.py']
+
+# Kunci metadata Arrow untuk menyimpan df.attrs
+_ATTRS_KEY = b'dashboard_attrs'
+
+
+def is_available() -> bool:
+    """Cek apakah pyarrow tersedia untuk cache kolumnar"""
+    return feather is not None
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """
+    Versi kode pembersihan: hash dari isi modul pemroses data
+
+    Returns:
+        Hash heksadesimal pendek
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in _CLEANING_MODULES:
+        with open(os.path.join(base_dir, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def cache_key(source_fingerprint: str, *options) -> str:
+    """
+    Menyusun kunci cache dari fingerprint sumber, versi kode, dan opsi pemuatan
+
+    Args:
+        source_fingerprint: Fingerprint byte sumber data
+        *options: Opsi yang memengaruhi hasil (mis. kolom tambahan, mode hemat memori)
+
+    Returns:
+        Kunci cache heksadesimal
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(source_fingerprint.encode())
+    digest.update(code_version().encode())
+    digest.update(repr(options).encode())
+    return digest.hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, key + CACHE_SUFFIX)
+
+
+def load(key: str) -> Optional[pd.DataFrame]:
+    """
+    Membaca dataset dari cache menggunakan memory-map
+
+    Args:
+        key: Kunci cache
+
+    Returns:
+        DataFrame jika ada di cache, None jika tidak
+    """
+    if not is_available():
+        return None
+
+    path = _cache_path(key)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        table = feather.read_table(path, memory_map=True)
+        df = table.to_pandas()
+    except Exception:
+        # File rusak (mis. proses terhenti saat menulis): buang saja
+        _remove(path)
+        return None
+
+    metadata = table.schema.metadata or {}
+    if _ATTRS_KEY in metadata:
+        df.attrs.update(json.loads(metadata[_ATTRS_KEY]))
+
+    # Perbarui waktu akses untuk urutan LRU
+    os.utime(path)
+    return df
+
+
+def store(key: str, df: pd.DataFrame) -> bool:
+    """
+    Menyimpan dataset ke cache lalu menjalankan eviction LRU
+
+    Args:
+        key: Kunci cache
+        df: DataFrame yang sudah dibersihkan
+
+    Returns:
+        True jika berhasil disimpan
+    """
+    if not is_available():
+        return False
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_ATTRS_KEY] = json.dumps(df.attrs, default=str).encode()
+        table = table.replace_schema_metadata(metadata)
+
+        # Tulis ke file sementara lalu rename agar pembaca tidak melihat file setengah jadi
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        os.close(fd)
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, _cache_path(key))
+    except Exception:
+        return False
+
+    evict(CACHE_MAX_BYTES, keep=key)
+    return True
+
+
+def evict(max_bytes: int = CACHE_MAX_BYTES, keep: Optional[str] = None) -> int:
+    """
+    Menghapus file cache yang paling lama tidak dipakai sampai total ukuran di bawah batas
+
+    Args:
+        max_bytes: Batas total ukuran cache
+        keep: Kunci yang tidak boleh dihapus (mis. yang baru saja ditulis)
+
+    Returns:
+        Jumlah file yang dihapus
+    """
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        if not name.endswith(CACHE_SUFFIX):
+            continue
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if keep is not None and path == _cache_path(keep):
+            continue
+        _remove(path)
+        total -= size
+        removed += 1
+
+    return removed
+
+
+def clear() -> int:
+    """
+    Mengosongkan seluruh cache
+
+    Returns:
+        Jumlah file yang dihapus
+    """
+    return evict(max_bytes=0)
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,166 @@
+"""
+Registry dataset bersama untuk semua sesi Streamlit
+
+Setiap dataset bersih disimpan sekali per proses (fingerprint → DataFrame).
+Sesi hanya memegang DatasetHandle yang ringan; jumlah handle yang masih hidup
+menjadi reference count. Saat handle terakhir dilepas (reset, ganti dataset,
+atau sesi berakhir dan session_state dibuang), dataset dikeluarkan dari
+memori. Dengan begitu pemakaian memori mengikuti jumlah dataset yang berbeda,
+bukan jumlah pengguna.
+
+DataFrame di registry dipakai bersama oleh banyak sesi sehingga harus
+diperlakukan read-only: komponen membuat salinan sebelum menambah kolom.
+"""
+import threading
+import weakref
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from utils.data_processor import clean_cache_key, load_clean_dataset
+
+
+class DatasetHandle:
+    """
+    Handle ke dataset bersama yang disimpan di session_state
+
+    Reference di registry dilepas otomatis saat handle di-garbage-collect.
+    """
+
+    def __init__(self, registry: 'DatasetRegistry', key: str):
+        self.key = key
+        self._registry = registry
+        self._finalizer = weakref.finalize(self, registry.release, key)
+
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        """DataFrame bersama (read-only)"""
+        return self._registry.get(self.key)
+
+    def release(self):
+        """Melepas reference secara eksplisit (aman dipanggil berkali-kali)"""
+        self._finalizer()
+
+
+class DatasetRegistry:
+    """
+    Pemetaan fingerprint → DataFrame immutable dengan reference counting
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._refcounts: Dict[str, int] = {}
+        # Lock per kunci agar sesi yang memuat dataset sama tidak mem-parse dua kali
+        self._loading: Dict[str, threading.Lock] = {}
+
+    def acquire(self, key: str, loader: Callable[[], Optional[pd.DataFrame]]) -> Optional[DatasetHandle]:
+        """
+        Mengambil handle ke dataset, memuatnya lewat loader jika belum ada
+
+        Args:
+            key: Fingerprint dataset
+            loader: Fungsi tanpa argumen yang menghasilkan DataFrame bersih (atau None)
+
+        Returns:
+            DatasetHandle, atau None jika loader gagal
+        """
+        with self._lock:
+            if key in self._frames:
+                self._refcounts[key] += 1
+                return DatasetHandle(self, key)
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Sesi lain mungkin sudah selesai memuat selama kita menunggu
+                if key in self._frames:
+                    self._refcounts[key] += 1
+                    return DatasetHandle(self, key)
+
+            df = loader()
+
+            with self._lock:
+                self._loading.pop(key, None)
+                if df is None:
+                    return None
+                self._frames[key] = df
+                self._refcounts[key] = 1
+                return DatasetHandle(self, key)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Mengambil DataFrame berdasarkan fingerprint
+
+        Args:
+            key: Fingerprint dataset
+
+        Returns:
+            DataFrame atau None jika sudah dikeluarkan
+        """
+        with self._lock:
+            return self._frames.get(key)
+
+    def release(self, key: str):
+        """
+        Mengurangi reference count, mengeluarkan dataset yang tidak lagi dipakai
+
+        Args:
+            key: Fingerprint dataset
+        """
+        with self._lock:
+            if key not in self._refcounts:
+                return
+            self._refcounts[key] -= 1
+            if self._refcounts[key] <= 0:
+                del self._refcounts[key]
+                del self._frames[key]
+
+    def stats(self) -> Tuple[int, int]:
+        """
+        Statistik registry
+
+        Returns:
+            Tuple (jumlah dataset di memori, jumlah handle aktif)
+        """
+        with self._lock:
+            return len(self._frames), sum(self._refcounts.values())
+
+
+@st.cache_resource(show_spinner=False)
+def get_dataset_registry() -> DatasetRegistry:
+    """Registry tunggal untuk seluruh proses server"""
+    return DatasetRegistry()
+
+
+def open_dataset(
+    source_fingerprint: str,
+    loader: Callable[[], Optional[pd.DataFrame]],
+    extra_columns: Optional[Tuple[str, ...]] = (),
+    compact: bool = False,
+    pipeline: Optional[Callable[[], Optional[Tuple[Optional[pd.DataFrame], str]]]] = None
+) -> Tuple[Optional[DatasetHandle], str]:
+    """
+    Membuka dataset bersih lewat registry bersama (lalu cache disk, lalu parsing)
+
+    Args:
+        source_fingerprint: Fingerprint byte sumber data
+        loader: Fungsi tanpa argumen yang memuat DataFrame mentah
+        extra_columns: Kolom tambahan yang dimuat loader
+        compact: Mode hemat memori
+        pipeline: Alternatif load → validasi → clean (lihat load_clean_dataset)
+
+    Returns:
+        Tuple (DatasetHandle atau None, pesan)
+    """
+    key = clean_cache_key(source_fingerprint, extra_columns, compact, pipeline)
+    message = "✅ Data valid!"
+
+    def build() -> Optional[pd.DataFrame]:
+        nonlocal message
+        df, message = load_clean_dataset(source_fingerprint, loader, extra_columns, compact, pipeline)
+        return df
+
+    handle = get_dataset_registry().acquire(key, build)
+    return handle, message
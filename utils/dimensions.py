@@ -0,0 +1,234 @@
+"""
+Tabel dimensi geografis Indonesia
+
+Pemetaan provinsi → regional untuk seluruh 38 provinsi, alias penulisan nama
+provinsi, serta pemetaan kota/kabupaten → provinsi untuk kota-kota utama.
+Lookup dilakukan per nilai unik (kategori), bukan per baris, lalu hasilnya
+dipetakan ke baris lewat kode kategori.
+"""
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+OTHER_REGION = 'Lainnya'
+
+# Regional → provinsi (38 provinsi, termasuk pemekaran Papua 2022)
+REGION_PROVINCES = {
+    'Sumatera': [
+        'Aceh', 'Sumatera Utara', 'Sumatera Barat', 'Riau', 'Kepulauan Riau', 'Jambi',
+        'Sumatera Selatan', 'Kepulauan Bangka Belitung', 'Bengkulu', 'Lampung'
+    ],
+    'Jawa': ['DKI Jakarta', 'Jawa Barat', 'Jawa Tengah', 'DI Yogyakarta', 'Jawa Timur', 'Banten'],
+    'Bali & Nusa Tenggara': ['Bali', 'Nusa Tenggara Barat', 'Nusa Tenggara Timur'],
+    'Kalimantan': [
+        'Kalimantan Barat', 'Kalimantan Tengah', 'Kalimantan Selatan', 'Kalimantan Timur', 'Kalimantan Utara'
+    ],
+    'Sulawesi': [
+        'Sulawesi Utara', 'Gorontalo', 'Sulawesi Tengah', 'Sulawesi Barat', 'Sulawesi Selatan', 'Sulawesi Tenggara'
+    ],
+    'Maluku': ['Maluku', 'Maluku Utara'],
+    'Papua': ['Papua', 'Papua Barat', 'Papua Barat Daya', 'Papua Tengah', 'Papua Pegunungan', 'Papua Selatan'],
+}
+
+# Urutan kategori kolom Regional
+REGIONS = list(REGION_PROVINCES) + [OTHER_REGION]
+
+PROVINCE_REGION = {
+    province: region
+    for region, provinces in REGION_PROVINCES.items()
+    for province in provinces
+}
+
+# Penulisan lain yang sering muncul di data marketplace → nama baku
+PROVINCE_ALIASES = {
+    'Nanggroe Aceh Darussalam': 'Aceh',
+    'NAD': 'Aceh',
+    'Bangka Belitung': 'Kepulauan Bangka Belitung',
+    'Babel': 'Kepulauan Bangka Belitung',
+    'Kepri': 'Kepulauan Riau',
+    'Jakarta': 'DKI Jakarta',
+    'Daerah Khusus Ibukota Jakarta': 'DKI Jakarta',
+    'Jabar': 'Jawa Barat',
+    'Jateng': 'Jawa Tengah',
+    'Jatim': 'Jawa Timur',
+    'Yogyakarta': 'DI Yogyakarta',
+    'Daerah Istimewa Yogyakarta': 'DI Yogyakarta',
+    'DIY': 'DI Yogyakarta',
+    'Jogja': 'DI Yogyakarta',
+    'NTB': 'Nusa Tenggara Barat',
+    'NTT': 'Nusa Tenggara Timur',
+    'Kalbar': 'Kalimantan Barat',
+    'Kalteng': 'Kalimantan Tengah',
+    'Kalsel': 'Kalimantan Selatan',
+    'Kaltim': 'Kalimantan Timur',
+    'Kaltara': 'Kalimantan Utara',
+    'Sulut': 'Sulawesi Utara',
+    'Sulteng': 'Sulawesi Tengah',
+    'Sulbar': 'Sulawesi Barat',
+    'Sulsel': 'Sulawesi Selatan',
+    'Sultra': 'Sulawesi Tenggara',
+    'Irian Jaya': 'Papua',
+    'Irian Jaya Barat': 'Papua Barat',
+}
+
+# Kota/kabupaten utama dan ibu kota provinsi → provinsi
+CITY_PROVINCE = {
+    'Banda Aceh': 'Aceh', 'Lhokseumawe': 'Aceh',
+    'Medan': 'Sumatera Utara', 'Deli Serdang': 'Sumatera Utara', 'Pematangsiantar': 'Sumatera Utara',
+    'Padang': 'Sumatera Barat', 'Bukittinggi': 'Sumatera Barat',
+    'Pekanbaru': 'Riau', 'Dumai': 'Riau',
+    'Batam': 'Kepulauan Riau', 'Tanjung Pinang': 'Kepulauan Riau',
+    'Jambi': 'Jambi',
+    'Palembang': 'Sumatera Selatan',
+    'Pangkal Pinang': 'Kepulauan Bangka Belitung',
+    'Bengkulu': 'Bengkulu',
+    'Bandar Lampung': 'Lampung', 'Metro': 'Lampung',
+    'Jakarta Pusat': 'DKI Jakarta', 'Jakarta Utara': 'DKI Jakarta', 'Jakarta Barat': 'DKI Jakarta',
+    'Jakarta Selatan': 'DKI Jakarta', 'Jakarta Timur': 'DKI Jakarta', 'Kepulauan Seribu': 'DKI Jakarta',
+    'Bandung': 'Jawa Barat', 'Bandung Barat': 'Jawa Barat', 'Bekasi': 'Jawa Barat', 'Bogor': 'Jawa Barat',
+    'Depok': 'Jawa Barat', 'Cimahi': 'Jawa Barat', 'Cirebon': 'Jawa Barat', 'Karawang': 'Jawa Barat',
+    'Sukabumi': 'Jawa Barat', 'Tasikmalaya': 'Jawa Barat', 'Garut': 'Jawa Barat',
+    'Semarang': 'Jawa Tengah', 'Surakarta': 'Jawa Tengah', 'Solo': 'Jawa Tengah', 'Magelang': 'Jawa Tengah',
+    'Tegal': 'Jawa Tengah', 'Pekalongan': 'Jawa Tengah', 'Salatiga': 'Jawa Tengah', 'Kudus': 'Jawa Tengah',
+    'Yogyakarta': 'DI Yogyakarta', 'Sleman': 'DI Yogyakarta', 'Bantul': 'DI Yogyakarta',
+    'Surabaya': 'Jawa Timur', 'Malang': 'Jawa Timur', 'Sidoarjo': 'Jawa Timur', 'Gresik': 'Jawa Timur',
+    'Kediri': 'Jawa Timur', 'Madiun': 'Jawa Timur', 'Jember': 'Jawa Timur', 'Banyuwangi': 'Jawa Timur',
+    'Serang': 'Banten', 'Cilegon': 'Banten', 'Tangerang': 'Banten', 'Tangerang Selatan': 'Banten',
+    'Denpasar': 'Bali', 'Badung': 'Bali', 'Gianyar': 'Bali',
+    'Mataram': 'Nusa Tenggara Barat', 'Lombok Barat': 'Nusa Tenggara Barat',
+    'Kupang': 'Nusa Tenggara Timur',
+    'Pontianak': 'Kalimantan Barat', 'Singkawang': 'Kalimantan Barat',
+    'Palangka Raya': 'Kalimantan Tengah',
+    'Banjarmasin': 'Kalimantan Selatan', 'Banjarbaru': 'Kalimantan Selatan',
+    'Samarinda': 'Kalimantan Timur', 'Balikpapan': 'Kalimantan Timur', 'Bontang': 'Kalimantan Timur',
+    'Tanjung Selor': 'Kalimantan Utara', 'Tarakan': 'Kalimantan Utara',
+    'Manado': 'Sulawesi Utara', 'Bitung': 'Sulawesi Utara',
+    'Gorontalo': 'Gorontalo',
+    'Palu': 'Sulawesi Tengah',
+    'Mamuju': 'Sulawesi Barat',
+    'Makassar': 'Sulawesi Selatan', 'Gowa': 'Sulawesi Selatan', 'Parepare': 'Sulawesi Selatan',
+    'Kendari': 'Sulawesi Tenggara', 'Baubau': 'Sulawesi Tenggara',
+    'Ambon': 'Maluku',
+    'Sofifi': 'Maluku Utara', 'Ternate': 'Maluku Utara',
+    'Jayapura': 'Papua',
+    'Manokwari': 'Papua Barat',
+    'Sorong': 'Papua Barat Daya',
+    'Nabire': 'Papua Tengah', 'Mimika': 'Papua Tengah',
+    'Jayawijaya': 'Papua Pegunungan', 'Wamena': 'Papua Pegunungan',
+    'Merauke': 'Papua Selatan',
+}
+
+# Awalan administratif yang dibuang sebelum mencocokkan nama kota
+_CITY_PREFIXES = re.compile(r'^(kota administrasi|kota adm|kabupaten|kab|kota)\s+')
+_PROVINCE_PREFIXES = re.compile(r'^(provinsi|prov)\s+')
+
+
+def _normalize(name: str) -> str:
+    """Huruf kecil, tanda baca dan spasi berlebih dibuang (mis. 'D.I. Yogyakarta' → 'di yogyakarta')"""
+    return re.sub(r'[^a-z0-9]+', ' ', str(name).lower().replace('.', '')).strip()
+
+
+def _lookup_table(mapping: Dict[str, str]) -> Dict[str, str]:
+    return {_normalize(key): value for key, value in mapping.items()}
+
+
+_PROVINCES = _lookup_table({province: province for province in PROVINCE_REGION})
+_PROVINCES.update(_lookup_table(PROVINCE_ALIASES))
+_CITIES = _lookup_table(CITY_PROVINCE)
+
+
+def canonical_province(name: str) -> Optional[str]:
+    """
+    Nama baku provinsi dari berbagai penulisan
+
+    Args:
+        name: Nama provinsi seperti di data (mis. 'JAWA BARAT', 'D.I. Yogyakarta', 'Prov. Bali')
+
+    Returns:
+        Nama baku, atau None jika tidak dikenal
+    """
+    key = _PROVINCE_PREFIXES.sub('', _normalize(name))
+    return _PROVINCES.get(key)
+
+
+def city_province(name: str) -> Optional[str]:
+    """
+    Provinsi dari nama kota/kabupaten
+
+    Args:
+        name: Nama kota/kabupaten (mis. 'KOTA BANDUNG', 'Kab. Sleman')
+
+    Returns:
+        Nama baku provinsi, atau None jika kota tidak ada di tabel
+    """
+    key = _CITY_PREFIXES.sub('', _normalize(name))
+    return _CITIES.get(key)
+
+
+def province_region(name: str) -> str:
+    """
+    Regional dari nama provinsi
+
+    Args:
+        name: Nama provinsi (penulisan bebas)
+
+    Returns:
+        Nama regional, atau 'Lainnya' jika provinsi tidak dikenal
+    """
+    return PROVINCE_REGION.get(canonical_province(name), OTHER_REGION)
+
+
+def _category_codes(series: pd.Series) -> pd.Categorical:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.array
+    return pd.Categorical(series)
+
+
+def _map_categories(categories: pd.Index, lookup, targets: List[str], missing: int) -> np.ndarray:
+    """
+    Tabel kode: kode kategori sumber → kode kategori tujuan
+
+    Elemen terakhir bernilai `missing` sehingga kode -1 (nilai kosong) ikut terpetakan.
+    """
+    index = {target: code for code, target in enumerate(targets)}
+    codes = [index.get(lookup(name), missing) for name in categories]
+    return np.array(codes + [missing], dtype='int16')
+
+
+def add_region_column(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Menambahkan kolom kategorikal 'Regional' dari 'Provinsi'
+
+    Provinsi yang tidak dikenal (termasuk 'Tidak Diketahui') dicoba ditebak dari
+    kolom 'Kota/Kabupaten'; sisanya masuk regional 'Lainnya'. Lookup dijalankan
+    sekali per kategori, lalu dipetakan ke baris lewat kode kategori.
+
+    Args:
+        df: DataFrame dengan kolom 'Provinsi' (dan opsional 'Kota/Kabupaten')
+
+    Returns:
+        DataFrame yang sama dengan kolom 'Regional'
+    """
+    other = REGIONS.index(OTHER_REGION)
+
+    provinces = _category_codes(df['Provinsi'])
+    region_lut = _map_categories(provinces.categories, province_region, REGIONS, other)
+    region_codes = region_lut[provinces.codes]
+
+    if 'Kota/Kabupaten' in df.columns and (region_codes == other).any():
+        cities = _category_codes(df['Kota/Kabupaten'])
+        city_lut = _map_categories(
+            cities.categories,
+            lambda city: PROVINCE_REGION.get(city_province(city)),
+            REGIONS,
+            -1
+        )
+        city_regions = city_lut[cities.codes]
+        unresolved = (region_codes == other) & (city_regions >= 0)
+        region_codes[unresolved] = city_regions[unresolved]
+
+    df['Regional'] = pd.Categorical.from_codes(region_codes, categories=REGIONS)
+    return df
@@ -0,0 +1,324 @@
+"""
+Statistik distribusi yang dihitung di server
+
+Histogram, bin kategori, statistik box plot, dan grid kepadatan 2D dihitung
+dengan NumPy dari seluruh baris lalu di-cache per dataset dan pengaturannya.
+Yang dikirim ke browser hanya ringkasannya (tepi bin, kuartil, sel grid,
+sampel titik), sehingga ukuran payload grafik tetap berapa pun jumlah baris.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import sql_backend
+from utils.aggregation import _factorize
+from utils.data_processor import dataset_key
+
+
+# Kolom hasil box_stats
+BOX_COLUMNS = ['count', 'mean', 'min', 'q1', 'median', 'q3', 'max', 'lowerfence', 'upperfence']
+
+# Label layer tunggal ketika grid kepadatan tidak dipisah per kolom
+ALL_LAYER = 'Semua'
+
+
+def _finite_values(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Nilai kolom sebagai float64 tanpa NaN/inf"""
+    values = df[column].to_numpy(dtype='float64', na_value=np.nan)
+    return values[np.isfinite(values)]
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_histogram(key: str, column: str, bins: int, _df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    values = _finite_values(_df, column)
+    if len(values) == 0:
+        return np.zeros(0, dtype='int64'), np.zeros(1)
+    return np.histogram(values, bins=bins)
+
+
+def histogram(df: pd.DataFrame, column: str, bins: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Histogram sebuah kolom numerik dari seluruh baris
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        column: Nama kolom numerik
+        bins: Jumlah bin dengan lebar sama antara nilai minimum dan maksimum
+
+    Returns:
+        Tuple (jumlah per bin, tepi bin sepanjang bins + 1)
+    """
+    return _cached_histogram(dataset_key(df), column, bins, df)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_bin_totals(
+    key: str,
+    column: str,
+    edges: Tuple[float, ...],
+    sum_column: Optional[str],
+    backend: str,
+    _df: pd.DataFrame
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    if backend == sql_backend.DUCKDB:
+        return sql_backend.bin_totals(_df, column, edges, sum_column)
+
+    values = _df[column].to_numpy(dtype='float64', na_value=np.nan)
+
+    # Interval tertutup kanan (a, b] seperti pd.cut; di luar rentang mendapat indeks -1
+    index = np.searchsorted(np.asarray(edges), values, side='left') - 1
+    num_bins = len(edges) - 1
+    valid = (index >= 0) & (index < num_bins) & ~np.isnan(values)
+    index = index[valid]
+
+    counts = np.bincount(index, minlength=num_bins)
+    sums = None
+    if sum_column is not None:
+        weights = _df[sum_column].to_numpy(dtype='float64', na_value=0.0)[valid]
+        sums = np.bincount(index, weights=weights, minlength=num_bins)
+    return counts, sums
+
+
+def bin_totals(
+    df: pd.DataFrame,
+    column: str,
+    edges: Sequence[float],
+    sum_column: Optional[str] = None
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Jumlah baris (dan total kolom lain) per interval, padanan pd.cut + groupby
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        column: Kolom numerik yang dikelompokkan
+        edges: Tepi interval (a, b] terurut naik, boleh diakhiri inf
+        sum_column: Kolom yang dijumlahkan per interval (opsional)
+
+    Returns:
+        Tuple (jumlah baris per interval, total sum_column per interval atau None)
+    """
+    return _cached_bin_totals(dataset_key(df), column, tuple(edges), sum_column, sql_backend.get_backend(), df)
+
+
+def _sorted_quantile(values: np.ndarray, starts: np.ndarray, sizes: np.ndarray, q: float) -> np.ndarray:
+    """Kuantil interpolasi linear (metode default pandas) per grup yang sudah terurut"""
+    position = starts + q * (sizes - 1)
+    lower = np.floor(position).astype('int64')
+    upper = np.minimum(lower + 1, starts + sizes - 1)
+    fraction = position - lower
+    return values[lower] + (values[upper] - values[lower]) * fraction
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_box_stats(
+    key: str,
+    by: str,
+    value: str,
+    max_outliers: int,
+    _df: pd.DataFrame
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    codes, uniques = _factorize(_df[by])
+    values = _df[value].to_numpy(dtype='float64', na_value=np.nan)
+
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+
+    # Satu kali lexsort: urut per grup, lalu per nilai di dalam grup
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+
+    sizes = np.bincount(codes, minlength=len(uniques))
+    present = np.flatnonzero(sizes)
+    sizes = sizes[present]
+    ends = np.cumsum(sizes)
+    starts = ends - sizes
+
+    q1 = _sorted_quantile(values, starts, sizes, 0.25)
+    median = _sorted_quantile(values, starts, sizes, 0.5)
+    q3 = _sorted_quantile(values, starts, sizes, 0.75)
+    iqr = q3 - q1
+
+    # Whisker: nilai terjauh yang masih di dalam 1.5 IQR (seperti Plotly)
+    group = np.repeat(np.arange(len(present)), sizes)
+    inside = (values >= (q1 - 1.5 * iqr)[group]) & (values <= (q3 + 1.5 * iqr)[group])
+    lowerfence = np.minimum.reduceat(np.where(inside, values, np.inf), starts)
+    upperfence = np.maximum.reduceat(np.where(inside, values, -np.inf), starts)
+
+    stats = pd.DataFrame({
+        by: uniques[present],
+        'count': sizes,
+        'mean': np.add.reduceat(values, starts) / sizes,
+        'min': values[starts],
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'max': values[ends - 1],
+        'lowerfence': lowerfence,
+        'upperfence': upperfence,
+    })
+
+    # Sampel outlier deterministik: maksimal max_outliers per grup, tersebar rata
+    # di sepanjang urutan nilai dan selalu menyertakan nilai paling ekstrem
+    outlier_index = np.flatnonzero(~inside)
+    outlier_group = group[outlier_index]
+    outlier_sizes = np.bincount(outlier_group, minlength=len(present))
+    outlier_starts = np.cumsum(outlier_sizes) - outlier_sizes
+    rank = np.arange(len(outlier_index)) - outlier_starts[outlier_group]
+    total = outlier_sizes[outlier_group]
+    keep = ((rank * max_outliers) % total < max_outliers) | (rank == 0) | (rank == total - 1)
+    outlier_index = outlier_index[keep]
+
+    outliers = pd.DataFrame({
+        by: uniques[present][group[outlier_index]],
+        value: values[outlier_index],
+    })
+    return stats, outliers
+
+
+def box_stats(
+    df: pd.DataFrame,
+    by: str,
+    value: str,
+    max_outliers: int = 200
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Statistik box plot per grup dalam satu kali pengurutan
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        by: Kolom pengelompokan
+        value: Kolom numerik yang diringkas
+        max_outliers: Batas sampel outlier per grup
+
+    Returns:
+        Tuple (DataFrame statistik per grup dengan kolom by + BOX_COLUMNS,
+        DataFrame sampel outlier dengan kolom by dan value)
+    """
+    return _cached_box_stats(dataset_key(df), by, value, max_outliers, df)
+
+
+def _layer_codes(df: pd.DataFrame, by: Optional[str]) -> Tuple[np.ndarray, pd.Index]:
+    """Kode layer per baris; tanpa kolom pemisah semua baris masuk layer ALL_LAYER"""
+    if by is None:
+        return np.zeros(len(df), dtype='int64'), pd.Index([ALL_LAYER])
+    codes, layers = _factorize(df[by])
+    # Kode kategori bisa int8; dilebarkan agar kode sel grid tidak overflow
+    return codes.astype('int64', copy=False), layers
+
+
+def _bin_index(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Indeks bin [a, b) dengan nilai maksimum masuk bin terakhir, seperti np.histogram"""
+    return np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_density_grid(
+    key: str,
+    x: str,
+    y: str,
+    by: Optional[str],
+    bins: int,
+    _df: pd.DataFrame
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, pd.Index]:
+    x_values = _df[x].to_numpy(dtype='float64', na_value=np.nan)
+    y_values = _df[y].to_numpy(dtype='float64', na_value=np.nan)
+    codes, layers = _layer_codes(_df, by)
+
+    valid = np.isfinite(x_values) & np.isfinite(y_values) & (codes >= 0)
+    x_values, y_values, codes = x_values[valid], y_values[valid], codes[valid]
+    if len(x_values) == 0:
+        return np.zeros(1), np.zeros(1), np.zeros((0, 0, 0), dtype='int64'), layers[:0]
+
+    x_edges = np.histogram_bin_edges(x_values, bins=bins)
+    y_edges = np.histogram_bin_edges(y_values, bins=bins)
+
+    # Satu bincount untuk semua layer: kode sel = (layer, baris y, kolom x)
+    cell = (codes * bins + _bin_index(y_values, y_edges)) * bins + _bin_index(x_values, x_edges)
+    counts = np.bincount(cell, minlength=len(layers) * bins * bins).reshape(len(layers), bins, bins)
+
+    present = np.flatnonzero(counts.sum(axis=(1, 2)))
+    return x_edges, y_edges, counts[present], layers[present]
+
+
+def density_grid(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    by: Optional[str] = None,
+    bins: int = 60
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, pd.Index]:
+    """
+    Grid kepadatan 2D dari seluruh baris, dipisah per layer
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        x: Kolom numerik sumbu x
+        y: Kolom numerik sumbu y
+        by: Kolom layer (misalnya 'Opsi Pengiriman'), None untuk satu layer
+        bins: Jumlah bin per sumbu; semua layer memakai tepi bin yang sama
+
+    Returns:
+        Tuple (tepi bin x, tepi bin y, jumlah baris berbentuk (layer, bins y, bins x),
+        label layer)
+    """
+    return _cached_density_grid(dataset_key(df), x, y, by, bins, df)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_stratified_sample(
+    key: str,
+    columns: Tuple[str, ...],
+    by: Optional[str],
+    n: int,
+    _df: pd.DataFrame
+) -> pd.DataFrame:
+    codes, layers = _layer_codes(_df, by)
+    valid = codes >= 0
+    for column in columns:
+        valid &= np.isfinite(_df[column].to_numpy(dtype='float64', na_value=np.nan))
+
+    rows = np.flatnonzero(valid)
+    codes = codes[rows]
+    order = np.argsort(codes, kind='stable')
+    rows, codes = rows[order], codes[order]
+
+    # Kuota proporsional per layer, minimal satu titik agar layer kecil tetap terlihat
+    sizes = np.bincount(codes, minlength=len(layers))
+    quota = np.minimum(sizes, np.maximum(np.round(n * sizes / max(len(rows), 1)), 1)).astype('int64')
+
+    # Sampling sistematis di dalam tiap layer: deterministik dan tersebar merata
+    starts = np.cumsum(sizes) - sizes
+    rank = np.arange(len(rows)) - starts[codes]
+    keep = (rank * quota[codes]) % np.maximum(sizes[codes], 1) < quota[codes]
+    rows = np.sort(rows[keep])
+
+    sample = _df.iloc[rows][list(columns)].reset_index(drop=True)
+    if by is not None:
+        sample[by] = _df[by].iloc[rows].to_numpy()
+    return sample
+
+
+def stratified_sample(
+    df: pd.DataFrame,
+    columns: List[str],
+    by: Optional[str] = None,
+    n: int = 1000
+) -> pd.DataFrame:
+    """
+    Sampel titik deterministik yang proporsional per layer
+
+    Sampel yang sama dipakai ulang di setiap rerun sehingga grafik tidak
+    berkedip dan bisa direproduksi.
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        columns: Kolom numerik yang diambil (baris dengan nilai kosong dilewati)
+        by: Kolom layer untuk stratifikasi, None tanpa stratifikasi
+        n: Perkiraan jumlah titik total
+
+    Returns:
+        DataFrame sampel dengan kolom columns (+ by)
+    """
+    return _cached_stratified_sample(dataset_key(df), tuple(columns), by, n, df)
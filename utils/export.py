@@ -0,0 +1,203 @@
+"""
+Ekspor dataset ke file secara bertahap (per potongan baris)
+
+Data ditulis ke file sementara potongan demi potongan sehingga memori puncak
+saat ekspor hanya sebesar satu potongan, bukan seluruh dataset dalam bentuk
+teks. Format yang didukung: CSV terkompresi gzip, Parquet (jika pyarrow
+tersedia), dan Excel (openpyxl mode write-only).
+"""
+import gzip
+import os
+import tempfile
+import weakref
+from typing import Callable, Dict, Hashable, List, NamedTuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from openpyxl import Workbook
+
+
+# Jumlah baris per potongan yang ditulis sekaligus
+CHUNK_ROWS = 100_000
+
+# Batas baris satu worksheet Excel (termasuk baris header)
+EXCEL_MAX_ROWS = 1_048_576
+
+
+def _chunks(df: pd.DataFrame, columns: List[str], chunk_rows: int):
+    """Potongan baris berurutan dari kolom terpilih"""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows][columns]
+
+
+def write_csv_gz(df: pd.DataFrame, columns: List[str], path: str, chunk_rows: int = CHUNK_ROWS):
+    """
+    Tulis CSV terkompresi gzip per potongan
+
+    Args:
+        df: DataFrame sumber
+        columns: Kolom yang diekspor
+        path: Lokasi file tujuan
+        chunk_rows: Jumlah baris per potongan
+    """
+    with gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=1) as f:
+        if len(df) == 0:
+            df[columns].to_csv(f, index=False)
+        for i, chunk in enumerate(_chunks(df, columns, chunk_rows)):
+            chunk.to_csv(f, index=False, header=(i == 0))
+
+
+def write_parquet(df: pd.DataFrame, columns: List[str], path: str, chunk_rows: int = CHUNK_ROWS):
+    """
+    Tulis Parquet per potongan (satu row group per potongan)
+
+    Args:
+        df: DataFrame sumber
+        columns: Kolom yang diekspor
+        path: Lokasi file tujuan
+        chunk_rows: Jumlah baris per potongan
+    """
+    if pq is None:
+        raise ImportError("pyarrow diperlukan untuk ekspor Parquet")
+
+    # Skema dari potongan pertama; kolom yang seluruhnya kosong di potongan itu dianggap string
+    schema = pa.Schema.from_pandas(df.iloc[:chunk_rows][columns], preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for chunk in _chunks(df, columns, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_excel(df: pd.DataFrame, columns: List[str], path: str, chunk_rows: int = CHUNK_ROWS):
+    """
+    Tulis Excel dengan workbook write-only openpyxl (baris dialirkan ke disk)
+
+    Args:
+        df: DataFrame sumber
+        columns: Kolom yang diekspor
+        path: Lokasi file tujuan
+        chunk_rows: Jumlah baris per potongan
+    """
+    if len(df) + 1 > EXCEL_MAX_ROWS:
+        raise ValueError(f"Excel maksimal {EXCEL_MAX_ROWS - 1:,} baris data, dataset berisi {len(df):,} baris")
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Data')
+    sheet.append(columns)
+
+    for chunk in _chunks(df, columns, chunk_rows):
+        # Nilai kosong (NaN/NaT/NA) ditulis sebagai sel kosong
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append(row)
+
+    workbook.save(path)
+
+
+class ExportFormat(NamedTuple):
+    """Format ekspor: ekstensi file, MIME type, dan fungsi penulis"""
+    extension: str
+    mime: str
+    writer: Callable[..., None]
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    'CSV (gzip)': ExportFormat('.csv.gz', 'application/gzip', write_csv_gz),
+    'Parquet': ExportFormat('.parquet', 'application/vnd.apache.parquet', write_parquet),
+    'Excel': ExportFormat('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', write_excel),
+}
+
+
+def available_formats(num_rows: int) -> List[str]:
+    """
+    Format ekspor yang bisa dipakai untuk dataset dengan jumlah baris tertentu
+
+    Args:
+        num_rows: Jumlah baris dataset
+
+    Returns:
+        Daftar nama format
+    """
+    formats = ['CSV (gzip)']
+    if pq is not None:
+        formats.append('Parquet')
+    if num_rows + 1 <= EXCEL_MAX_ROWS:
+        formats.append('Excel')
+    return formats
+
+
+def _remove_file(path: str):
+    """Hapus file jika masih ada"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class ExportFile:
+    """
+    File hasil ekspor di direktori sementara
+
+    File dihapus saat remove() dipanggil atau saat objek dibuang oleh garbage
+    collector (misalnya ketika sesi Streamlit berakhir).
+    """
+
+    def __init__(self, key: Hashable, path: str, export_format: ExportFormat):
+        self.key = key
+        self.path = path
+        self.format = export_format
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+
+    @property
+    def size(self) -> int:
+        """Ukuran file dalam bytes"""
+        return os.path.getsize(self.path)
+
+    def read(self) -> bytes:
+        """
+        Isi file ekspor
+
+        Dipakai sebagai data tertunda st.download_button: file baru dibaca saat
+        tombol diklik, bukan di setiap rerun selama file ekspor ada.
+        """
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def remove(self):
+        """Hapus file secara eksplisit (aman dipanggil berkali-kali)"""
+        self._finalizer()
+
+
+def export_to_tempfile(df: pd.DataFrame, columns: List[str], format_name: str, key: Hashable = None) -> ExportFile:
+    """
+    Ekspor kolom terpilih ke file sementara
+
+    Args:
+        df: DataFrame sumber
+        columns: Kolom yang diekspor
+        format_name: Nama format di EXPORT_FORMATS
+        key: Penanda isi ekspor (dataset, kolom, format) untuk mendeteksi file usang
+
+    Returns:
+        ExportFile
+    """
+    export_format = EXPORT_FORMATS[format_name]
+    fd, path = tempfile.mkstemp(prefix='ecommerce-export-', suffix=export_format.extension)
+    os.close(fd)
+
+    try:
+        export_format.writer(df, columns, path)
+    except Exception:
+        _remove_file(path)
+        raise
+    return ExportFile(key, path, export_format)
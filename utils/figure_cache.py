@@ -0,0 +1,97 @@
+"""
+Cache figure Plotly lintas rerun dan sesi
+
+Figure dibangun sekali per (fingerprint dataset, id grafik, parameter tampilan)
+lalu objek yang sama dipakai ulang, sehingga rerun yang tidak mengubah grafik
+melewati agregasi dan konstruksi figure dan menghasilkan spesifikasi JSON yang
+identik. Jumlah figure dibatasi dengan eviksi LRU.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from utils.data_processor import dataset_key
+
+
+# Batas jumlah figure di memori server (semua sesi)
+MAX_FIGURES = 256
+
+
+class FigureCache:
+    """
+    Cache LRU thread-safe: key → figure Plotly
+
+    Figure yang dikembalikan dipakai bersama oleh semua sesi; jangan diubah.
+    """
+
+    def __init__(self, max_entries: int = MAX_FIGURES):
+        self.max_entries = max_entries
+        self._figures: 'OrderedDict[Hashable, go.Figure]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], go.Figure]) -> go.Figure:
+        """
+        Mengambil figure dari cache atau membangunnya
+
+        Args:
+            key: Key hashable
+            builder: Fungsi tanpa argumen yang membangun figure saat cache miss
+
+        Returns:
+            Figure Plotly
+        """
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return self._figures[key]
+            self.misses += 1
+
+        # Dibangun di luar lock agar sesi lain tidak ikut menunggu
+        figure = builder()
+
+        with self._lock:
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return figure
+
+    def stats(self) -> Tuple[int, int, int]:
+        """
+        Statistik cache
+
+        Returns:
+            Tuple (jumlah figure, jumlah hit, jumlah miss)
+        """
+        with self._lock:
+            return len(self._figures), self.hits, self.misses
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache() -> FigureCache:
+    """Cache figure tunggal untuk seluruh proses server"""
+    return FigureCache()
+
+
+def cached_figure(builder: Callable[..., go.Figure], df: pd.DataFrame, **params) -> go.Figure:
+    """
+    Figure dari builder(df, **params), di-cache per dataset, builder, dan parameter
+
+    Args:
+        builder: Fungsi pembangun figure tingkat modul; nama lengkapnya menjadi id grafik
+        df: DataFrame yang sudah dibersihkan
+        **params: Parameter tampilan (filter, top-N, pilihan widget); harus hashable
+
+    Returns:
+        Figure Plotly yang dipakai bersama; jangan diubah
+    """
+    chart_id = f'{builder.__module__}.{builder.__qualname__}'
+    key = (dataset_key(df), chart_id, tuple(sorted(params.items())))
+    return get_figure_cache().get_or_build(key, lambda: builder(df, **params))
@@ -0,0 +1,649 @@
+"""
+Mode out-of-core: dataset bersih sebagai Parquet terpartisi Hive (Tahun/Bulan)
+
+Ingest membaca CSV per potongan baris, membersihkan setiap potongan dengan
+clean_and_transform, lalu menuliskannya lewat pyarrow.dataset ke direktori
+Tahun=YYYY/Bulan=YYYY-MM; memori ingest dibatasi ukuran potongan, bukan
+ukuran file. Setiap tampilan hanya membaca kolom yang dibutuhkannya: filter
+rentang tanggal memangkas partisi lalu baris, filter kategori dievaluasi saat
+scan, sehingga memori sebanding dengan hasil query, bukan panjang riwayat.
+
+Kolom waktu turunan (Tanggal, Bulan, Tahun, Hari) tidak disimpan di file,
+melainkan dihitung ulang dari 'Waktu Pesanan Dibuat' saat dibaca. Setiap
+partisi diurutkan menurut waktu sehingga urutan file = urutan waktu, dan
+tabel data mentah bisa dibaca per halaman tanpa memuat seluruh dataset.
+
+Total ukuran dataset terpartisi di disk dibatasi STORE_MAX_BYTES; dataset
+yang paling lama tidak dipakai dihapus lebih dulu (LRU).
+"""
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import dataset_cache
+from utils.cross_filter import FILTER_COLUMNS, GlobalFilters
+from utils.data_processor import (
+    _open_text,
+    _parse_header,
+    _read_prefix,
+    add_time_columns,
+    clean_and_transform,
+    compact_dataframe,
+    detect_encoding,
+    format_bytes,
+    sniff_csv_format,
+    sort_by_time,
+    validate_columns,
+)
+from utils.dimensions import REGIONS
+from utils.schema import NUMERIC_COLUMNS, parse_options
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pc = None
+    ds = None
+    pq = None
+
+
+# Lokasi dataset terpartisi, di dalam direktori cache dataset
+STORE_DIR = os.path.join(dataset_cache.CACHE_DIR, 'partitioned')
+
+# Batas total ukuran dataset terpartisi di disk, terpisah dari batas cache Arrow
+STORE_MAX_BYTES = int(float(os.environ.get('ECOMMERCE_STORE_MAX_MB', '8192')) * 1024 * 1024)
+
+# Jumlah baris CSV per potongan saat ingest (batas memori ingest)
+INGEST_CHUNK_ROWS = 250_000
+
+# Jumlah hasil query yang disimpan di memori server (tampilan aktif + sebelumnya)
+VIEW_CACHE_ENTRIES = 4
+
+# Jumlah halaman tabel data mentah yang disimpan di memori server
+PAGE_CACHE_ENTRIES = 32
+
+# Kolom partisi Hive: nilai Tahun (integer) dan Bulan ('YYYY-MM')
+PARTITION_COLUMNS = ['Tahun', 'Bulan']
+
+# Kolom waktu yang menjadi sumber semua kolom turunan dan urutan baris
+TIME_COLUMN = 'Waktu Pesanan Dibuat'
+
+# Kolom waktu turunan yang dihitung ulang saat dibaca (add_time_columns)
+TIME_DERIVED_COLUMNS = ['Tanggal', 'Bulan', 'Tahun', 'Hari']
+
+# Metadata dataset (awalan '_' diabaikan saat discovery pyarrow.dataset)
+METADATA_FILE = '_dataset.json'
+
+
+def is_available() -> bool:
+    """Cek apakah pyarrow tersedia untuk dataset Parquet terpartisi"""
+    return ds is not None
+
+
+def _partitioning():
+    """Skema partisi Hive Tahun/Bulan"""
+    return ds.partitioning(pa.schema([('Tahun', pa.int32()), ('Bulan', pa.string())]), flavor='hive')
+
+
+class _IngestSummary:
+    """Ringkasan yang dikumpulkan per potongan selama ingest (untuk metadata)"""
+
+    def __init__(self):
+        self.columns: List[str] = []
+        self.num_rows = 0
+        self.time_valid_rows = 0
+        self.start: Optional[pd.Timestamp] = None
+        self.end: Optional[pd.Timestamp] = None
+        self.options: Dict[str, set] = {}
+        self.schema = None
+
+    def update(self, chunk: pd.DataFrame):
+        if not self.columns:
+            self.columns = chunk.columns.tolist()
+        self.num_rows += len(chunk)
+
+        # Potongan sudah terurut waktu: batas tanggal dari ujung baris valid
+        valid_rows = chunk.attrs['time_valid_rows']
+        self.time_valid_rows += valid_rows
+        if valid_rows:
+            first, last = chunk[TIME_COLUMN].iloc[0], chunk[TIME_COLUMN].iloc[valid_rows - 1]
+            self.start = first if self.start is None else min(self.start, first)
+            self.end = last if self.end is None else max(self.end, last)
+
+        for col in FILTER_COLUMNS:
+            if col in chunk.columns:
+                self.options.setdefault(col, set()).update(chunk[col].unique().tolist())
+
+    def to_batches(self, chunk: pd.DataFrame) -> List['pa.RecordBatch']:
+        """Potongan bersih → record batch dengan skema tetap plus kolom partisi"""
+        stored = chunk[[col for col in chunk.columns if col not in TIME_DERIVED_COLUMNS]]
+        table = pa.Table.from_pandas(stored, preserve_index=False).replace_schema_metadata(None)
+
+        month = chunk['Bulan'].astype(object).where(chunk['Bulan'].notna(), None)
+        table = table.append_column('Tahun', pa.array(pd.array(chunk['Tahun'], dtype='Int32'), type=pa.int32()))
+        table = table.append_column('Bulan', pa.array(month, type=pa.string()))
+
+        if self.schema is None:
+            # Resolusi waktu (mikrodetik, TIME_DTYPE) dan teks dibakukan agar semua
+            # potongan berskema sama dan dibaca kembali dengan dtype jalur in-memory
+            fields = []
+            for field in table.schema:
+                if pa.types.is_timestamp(field.type):
+                    field = field.with_type(pa.timestamp('us'))
+                elif pa.types.is_dictionary(field.type) or pa.types.is_large_string(field.type):
+                    field = field.with_type(pa.string())
+                fields.append(field)
+            self.schema = pa.schema(fields)
+        return table.cast(self.schema).to_batches()
+
+    def metadata(self, stored_columns: List[str]) -> dict:
+        return {
+            'columns': self.columns,
+            'stored_columns': stored_columns,
+            'num_rows': self.num_rows,
+            'time_valid_rows': self.time_valid_rows,
+            'date_bounds': None if self.start is None else [self.start.isoformat(), self.end.isoformat()],
+            'options': {col: sorted(values) for col, values in self.options.items()},
+        }
+
+
+def _clean_chunks(reader, compact: bool, summary: _IngestSummary) -> Iterator['pa.RecordBatch']:
+    """Potongan CSV mentah → record batch bersih, satu potongan di memori"""
+    offset = 0
+    for chunk in reader:
+        if len(chunk) == 0:
+            continue
+
+        # Kolom numerik selalu float64 (seperti dtype parsing jalur biasa) agar skema tiap potongan sama
+        for col in NUMERIC_COLUMNS + ['num_product_categories']:
+            if col in chunk.columns:
+                chunk[col] = pd.to_numeric(chunk[col], errors='coerce').astype('float64')
+
+        # order_id sintetis berlanjut antar potongan
+        if 'order_id' not in chunk.columns:
+            ids = np.arange(offset + 1, offset + len(chunk) + 1)
+            chunk['order_id'] = ids.astype('int32') if compact else [f'ORD_{i:07d}' for i in ids]
+        offset += len(chunk)
+
+        chunk = clean_and_transform(chunk)
+        # Regional disimpan sebagai teks; kategorinya dipulihkan saat dibaca
+        chunk['Regional'] = chunk['Regional'].astype(str)
+        summary.update(chunk)
+        yield from summary.to_batches(chunk)
+
+
+def _store_path(key: str) -> str:
+    return os.path.join(STORE_DIR, key)
+
+
+def _data_files(path: str) -> List[str]:
+    """File Parquet dataset terurut path (= urutan partisi kronologis)"""
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs[:] = [name for name in dirs if not name.startswith(('.', '_'))]
+        files += [os.path.join(root, name) for name in names if name.endswith('.parquet')]
+    return sorted(files)
+
+
+def _dir_bytes(path: str) -> int:
+    """Total ukuran file di bawah direktori"""
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _touch(path: str):
+    """Perbarui waktu akses dataset (file metadata) untuk urutan LRU"""
+    try:
+        os.utime(os.path.join(path, METADATA_FILE))
+    except OSError:
+        pass
+
+
+def _sort_partitions(path: str):
+    """
+    Urutkan baris setiap partisi menurut waktu pesanan (stabil, waktu kosong di akhir)
+
+    Potongan CSV hanya terurut di dalam potongannya sendiri; setelah partisi
+    diurutkan, urutan file sama dengan urutan waktu seluruh dataset. Memori
+    sebesar satu partisi (satu bulan).
+    """
+    partitions: Dict[str, List[str]] = {}
+    for file in _data_files(path):
+        partitions.setdefault(os.path.dirname(file), []).append(file)
+
+    for directory, files in partitions.items():
+        table = pa.concat_tables([pq.read_table(file) for file in files])
+        # Nilai kosong berada di akhir (default sort_indices)
+        indices = pc.sort_indices(table, sort_keys=[(TIME_COLUMN, 'ascending')])
+        sorted_path = os.path.join(directory, '.sorted.parquet')
+        pq.write_table(table.take(indices), sorted_path)
+        del table, indices
+        for file in files:
+            os.remove(file)
+        os.rename(sorted_path, os.path.join(directory, 'part-0.parquet'))
+
+
+def evict(max_bytes: int = STORE_MAX_BYTES, keep: Optional[str] = None) -> int:
+    """
+    Menghapus dataset terpartisi yang paling lama tidak dipakai sampai total ukuran di bawah batas
+
+    Args:
+        max_bytes: Batas total ukuran dataset terpartisi
+        keep: Kunci dataset yang tidak boleh dihapus (mis. yang baru saja ditulis)
+
+    Returns:
+        Jumlah dataset yang dihapus
+    """
+    if not os.path.isdir(STORE_DIR):
+        return 0
+
+    entries = []
+    for name in os.listdir(STORE_DIR):
+        # Direktori ingest yang sedang berjalan (awalan '.') tidak dihitung
+        path = os.path.join(STORE_DIR, name)
+        if name.startswith('.') or not os.path.isdir(path):
+            continue
+        try:
+            mtime = os.stat(os.path.join(path, METADATA_FILE)).st_mtime
+        except OSError:
+            mtime = 0
+        entries.append((mtime, _dir_bytes(path), name, path))
+
+    total = sum(size for _, size, _, _ in entries)
+    removed = 0
+
+    for _, size, name, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if name == keep:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed += 1
+
+    return removed
+
+
+def ingest(
+    source,
+    source_fingerprint: str,
+    extra_columns: Optional[Tuple[str, ...]] = (),
+    compact: bool = False
+) -> Tuple[Optional['PartitionedDataset'], str]:
+    """
+    Menulis CSV sebagai dataset Parquet terpartisi Tahun/Bulan (sekali per sumber)
+
+    Args:
+        source: Path file atau file-like object
+        source_fingerprint: Fingerprint byte sumber data (lihat compute_fingerprint)
+        extra_columns: Kolom tambahan di luar skema, None untuk memuat semua kolom
+        compact: Mode hemat memori untuk tampilan yang dibaca
+
+    Returns:
+        Tuple (PartitionedDataset atau None, pesan)
+    """
+    key = dataset_cache.cache_key(source_fingerprint, extra_columns, compact)
+    path = _store_path(key)
+    if os.path.exists(os.path.join(path, METADATA_FILE)):
+        _touch(path)
+        st.info("⚡ Dataset terpartisi sudah ada di disk (tanpa parsing ulang)")
+        return open_store(path), "✅ Data valid!"
+
+    encoding, confidence = detect_encoding(source)
+    sample = _read_prefix(source).decode(encoding, errors='replace')
+    delimiter, has_header, skipinitialspace = sniff_csv_format(sample)
+    if not has_header:
+        return None, "Mode out-of-core membutuhkan file CSV dengan header"
+
+    columns = parse_options(_parse_header(sample, delimiter, skipinitialspace), extra_columns)['usecols']
+    is_valid, message = validate_columns(columns)
+    if not is_valid:
+        return None, message
+
+    if 'order_id' not in columns:
+        st.info("ℹ️ Kolom 'order_id' dibuat otomatis")
+
+    os.makedirs(STORE_DIR, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=STORE_DIR, prefix='.ingest-')
+    summary = _IngestSummary()
+    try:
+        with _open_text(source, encoding) as text:
+            reader = pd.read_csv(
+                text,
+                sep=delimiter,
+                usecols=columns,
+                dtype=str,
+                on_bad_lines='skip',
+                chunksize=INGEST_CHUNK_ROWS,
+                **({'skipinitialspace': True} if skipinitialspace else {})
+            )
+            batches = _clean_chunks(reader, compact, summary)
+            first = next(batches, None)
+            if first is None:
+                return None, "Gagal memuat data"
+
+            ds.write_dataset(
+                pa.RecordBatchReader.from_batches(summary.schema, itertools.chain([first], batches)),
+                tmp_dir,
+                format='parquet',
+                partitioning=_partitioning(),
+                basename_template='part-{i}.parquet',
+                existing_data_behavior='overwrite_or_ignore',
+                preserve_order=True
+            )
+        _sort_partitions(tmp_dir)
+
+        is_valid, message = validate_columns(columns, summary.num_rows)
+        if not is_valid:
+            return None, message
+
+        stored_columns = [name for name in summary.schema.names if name not in PARTITION_COLUMNS]
+        metadata = summary.metadata(stored_columns)
+        metadata.update({'encoding': encoding, 'encoding_confidence': confidence, 'compact': compact})
+        with open(os.path.join(tmp_dir, METADATA_FILE), 'w') as f:
+            json.dump(metadata, f)
+
+        # Direktori sementara di-rename agar pembaca tidak melihat dataset setengah jadi
+        try:
+            os.rename(tmp_dir, path)
+        except OSError:
+            # Sesi lain sudah selesai menulis dataset yang sama
+            pass
+    except Exception as e:
+        return None, f"Gagal menulis dataset terpartisi: {str(e)}"
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    # Dataset lama yang paling jarang dipakai dihapus jika melebihi batas disk
+    evict(STORE_MAX_BYTES, keep=key)
+
+    store = open_store(path)
+    st.success(f"✅ {store.num_rows:,} baris ditulis ke {store.num_partitions} partisi Parquet ({format_bytes(store.disk_bytes)})")
+    return store, message
+
+
+def filter_expression(filters: GlobalFilters):
+    """
+    Ekspresi pyarrow.dataset untuk filter global
+
+    Rentang tanggal membatasi partisi lewat Bulan ('YYYY-MM' terurut leksikografis
+    = kronologis) lalu baris lewat 'Waktu Pesanan Dibuat'; filter kategori
+    menjadi isin. Baris tanpa waktu pesanan tidak lolos filter tanggal.
+
+    Args:
+        filters: Pilihan filter global
+
+    Returns:
+        Ekspresi filter, atau None jika tidak ada filter aktif
+    """
+    conditions = []
+    if filters.start is not None:
+        start = pd.Timestamp(filters.start)
+        conditions.append(ds.field('Bulan') >= f'{start:%Y-%m}')
+        conditions.append(ds.field(TIME_COLUMN) >= pa.scalar(start.to_pydatetime(), type=pa.timestamp('us')))
+    if filters.end is not None:
+        end = pd.Timestamp(filters.end)
+        end_exclusive = end.normalize() + pd.Timedelta(days=1)
+        conditions.append(ds.field('Bulan') <= f'{end:%Y-%m}')
+        conditions.append(ds.field(TIME_COLUMN) < pa.scalar(end_exclusive.to_pydatetime(), type=pa.timestamp('us')))
+    for column, values in filters.values:
+        if values:
+            conditions.append(ds.field(column).isin(list(values)))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def view_fingerprint(key: str, columns: Sequence[str], filters: GlobalFilters) -> str:
+    """
+    Fingerprint hasil query: kunci dataset + kolom + pilihan filter
+
+    Args:
+        key: Kunci dataset terpartisi
+        columns: Kolom hasil query
+        filters: Pilihan filter global
+
+    Returns:
+        Kunci heksadesimal
+    """
+    digest = hashlib.blake2b(key.encode(), digest_size=16)
+    digest.update(repr((tuple(columns), tuple(filters))).encode())
+    return digest.hexdigest()
+
+
+class PartitionedDataset:
+    """
+    Dataset Parquet terpartisi hasil ingest; tidak menyimpan baris di memori
+
+    Atribut metadata (jumlah baris, batas tanggal, nilai filter) dibaca dari
+    file metadata tanpa scan data.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.key = os.path.basename(path)
+
+        with open(os.path.join(path, METADATA_FILE)) as f:
+            metadata = json.load(f)
+        self.columns: List[str] = metadata['columns']
+        self.stored_columns: List[str] = metadata['stored_columns']
+        self.num_rows: int = metadata['num_rows']
+        self.options: Dict[str, list] = metadata['options']
+        self.compact: bool = metadata['compact']
+        self.encoding: str = metadata['encoding']
+        self.encoding_confidence: float = metadata['encoding_confidence']
+
+        bounds = metadata['date_bounds']
+        self.date_bounds: Optional[Tuple[date, date]] = None
+        if bounds is not None:
+            self.date_bounds = (pd.Timestamp(bounds[0]).date(), pd.Timestamp(bounds[1]).date())
+
+        # Daftar file eksplisit agar urutan scan = urutan partisi = urutan waktu
+        files = _data_files(path)
+        self._dataset = ds.dataset(files, format='parquet', partitioning=_partitioning(), partition_base_dir=path)
+        self.num_partitions = len({os.path.dirname(file) for file in files})
+        self.disk_bytes = sum(os.path.getsize(file) for file in files)
+
+    @property
+    def exists(self) -> bool:
+        """False jika dataset sudah dihapus dari disk (eviction atau kosongkan cache)"""
+        return os.path.exists(os.path.join(self.path, METADATA_FILE))
+
+    def count(self, filters: GlobalFilters) -> int:
+        """Jumlah baris yang lolos filter (hanya kolom filter yang dibaca)"""
+        return self._dataset.count_rows(filter=filter_expression(filters))
+
+    def _projection(self, columns: Optional[Sequence[str]]) -> Tuple[List[str], List[str]]:
+        """Kolom hasil (urutan dataset) dan kolom yang dibaca dari file"""
+        wanted = set(self.columns if columns is None else columns) | {TIME_COLUMN}
+        output = [col for col in self.columns if col in wanted]
+        return output, [col for col in self.stored_columns if col in wanted]
+
+    def _to_frame(self, table: 'pa.Table', output: List[str]) -> pd.DataFrame:
+        """Tabel Arrow → DataFrame dengan kolom turunan dan dtype seperti jalur in-memory"""
+        df = table.to_pandas()
+
+        if any(col in output for col in TIME_DERIVED_COLUMNS):
+            add_time_columns(df)
+        if 'Regional' in df.columns:
+            df['Regional'] = pd.Categorical(df['Regional'], categories=REGIONS)
+        df = df[output]
+
+        if self.compact:
+            df = compact_dataframe(df)
+        return df
+
+    def read(self, columns: Optional[Sequence[str]], filters: GlobalFilters) -> pd.DataFrame:
+        """
+        Membaca kolom yang diminta untuk baris yang lolos filter
+
+        Hasilnya sama dengan jalur in-memory (kolom, dtype termasuk resolusi
+        datetime64[us], urutan waktu) untuk subset kolom dan baris tersebut, plus 'Waktu Pesanan Dibuat' yang selalu
+        ikut dibaca untuk urutan waktu dan kolom turunannya.
+
+        Args:
+            columns: Kolom yang dibutuhkan tampilan, None untuk semua kolom
+            filters: Pilihan filter global (didorong ke scan Parquet)
+
+        Returns:
+            DataFrame bersih dengan fingerprint hasil query di attrs
+        """
+        _touch(self.path)
+        output, read = self._projection(columns)
+
+        table = self._dataset.to_table(columns=read, filter=filter_expression(filters))
+        df = self._to_frame(table, output)
+        del table
+        df = sort_by_time(df)
+
+        df.attrs['fingerprint'] = view_fingerprint(self.key, output, filters)
+        df.attrs['encoding'] = self.encoding
+        df.attrs['encoding_confidence'] = self.encoding_confidence
+        df.attrs['memory_bytes'] = int(df.memory_usage(deep=True).sum())
+        return df
+
+
+    def read_page(self, columns: Optional[Sequence[str]], filters: GlobalFilters, offset: int, limit: int) -> pd.DataFrame:
+        """
+        Membaca satu halaman baris (urutan waktu) tanpa memuat seluruh dataset
+
+        Partisi di depan halaman hanya dihitung jumlah barisnya (dari metadata
+        Parquet, atau dari kolom filter jika ada filter), lalu batch dibaca
+        berurutan sampai halaman penuh. Memori sebanding dengan ukuran halaman.
+
+        Args:
+            columns: Kolom yang ditampilkan, None untuk semua kolom
+            filters: Pilihan filter global
+            offset: Indeks baris pertama di antara baris yang lolos filter
+            limit: Jumlah baris maksimal
+
+        Returns:
+            DataFrame halaman (paling banyak limit baris)
+        """
+        _touch(self.path)
+        output, read = self._projection(columns)
+        expression = filter_expression(filters)
+        schema = self._dataset.schema
+
+        batches = []
+        remaining = limit
+        for fragment in self._dataset.get_fragments(filter=expression):
+            if remaining <= 0:
+                break
+            scanner = fragment.scanner(schema=schema, columns=read, filter=expression)
+            num_rows = scanner.count_rows()
+            if offset >= num_rows:
+                offset -= num_rows
+                continue
+
+            for batch in scanner.to_batches():
+                if offset >= batch.num_rows:
+                    offset -= batch.num_rows
+                    continue
+                batch = batch.slice(offset, remaining)
+                offset = 0
+                batches.append(batch)
+                remaining -= batch.num_rows
+                if remaining <= 0:
+                    break
+
+        table = pa.Table.from_batches(batches, schema=pa.schema([schema.field(col) for col in read]))
+        return self._to_frame(table, output)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def open_store(path: str) -> PartitionedDataset:
+    """Dataset terpartisi per direktori, dibuka sekali lalu dipakai bersama"""
+    return PartitionedDataset(path)
+
+
+@st.cache_resource(show_spinner=False, max_entries=VIEW_CACHE_ENTRIES)
+def _cached_view(key: str, columns: Optional[Tuple[str, ...]], filters: GlobalFilters, _store: PartitionedDataset) -> pd.DataFrame:
+    return _store.read(columns, filters)
+
+
+def read_view(store: PartitionedDataset, columns: Optional[Sequence[str]], filters: GlobalFilters) -> pd.DataFrame:
+    """
+    Hasil query untuk tampilan, di-cache per (dataset, kolom, filter)
+
+    Args:
+        store: Dataset terpartisi
+        columns: Kolom yang dibutuhkan tampilan, None untuk semua kolom
+        filters: Pilihan filter global
+
+    Returns:
+        DataFrame yang dipakai bersama; jangan diubah
+    """
+    return _cached_view(store.key, None if columns is None else tuple(columns), filters, store)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_count(key: str, filters: GlobalFilters, _store: PartitionedDataset) -> int:
+    return _store.count(filters)
+
+
+def count_rows(store: PartitionedDataset, filters: GlobalFilters) -> int:
+    """Jumlah baris yang lolos filter, di-cache per (dataset, filter)"""
+    return _cached_count(store.key, filters, store)
+
+
+@st.cache_data(show_spinner=False, max_entries=PAGE_CACHE_ENTRIES)
+def _cached_page(
+    key: str,
+    columns: Optional[Tuple[str, ...]],
+    filters: GlobalFilters,
+    offset: int,
+    limit: int,
+    _store: PartitionedDataset
+) -> pd.DataFrame:
+    return _store.read_page(columns, filters, offset, limit)
+
+
+def read_page(
+    store: PartitionedDataset,
+    columns: Optional[Sequence[str]],
+    filters: GlobalFilters,
+    offset: int,
+    limit: int
+) -> pd.DataFrame:
+    """Satu halaman tabel data mentah, di-cache per (dataset, kolom, filter, halaman)"""
+    return _cached_page(store.key, None if columns is None else tuple(columns), filters, offset, limit, store)
+
+
+def clear() -> int:
+    """
+    Menghapus semua dataset terpartisi
+
+    Returns:
+        Jumlah dataset yang dihapus
+    """
+    if not os.path.isdir(STORE_DIR):
+        return 0
+    removed = 0
+    for name in os.listdir(STORE_DIR):
+        shutil.rmtree(os.path.join(STORE_DIR, name), ignore_errors=True)
+        removed += 1
+    open_store.clear()
+    _cached_view.clear()
+    _cached_page.clear()
+    return removed
@@ -0,0 +1,310 @@
+"""
+Pipeline load → validasi → clean alternatif berbasis Polars lazy frame (opsional)
+
+Parsing CSV, konversi tipe, pengisian nilai kosong, kolom pengganti, order_id,
+kolom waktu turunan, dan pengurutan waktu disusun sebagai satu rencana lazy
+yang dioptimasi Polars (proyeksi kolom, eksekusi multi-thread) lalu dijalankan
+sekali. Hasilnya diserahkan ke komponen sebagai DataFrame pandas dengan kolom,
+urutan, dan nilai yang sama seperti load_from_csv + clean_and_transform.
+
+Sumber yang tidak didukung (encoding selain UTF-8, tanpa header, atau spasi
+setelah delimiter) tetap memakai jalur pandas. Polars tidak wajib dipasang.
+"""
+import os
+from typing import Callable, Optional, Sequence, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from utils.data_processor import (
+    _is_path,
+    _parse_header,
+    _read_prefix,
+    compact_dataframe,
+    day_categorical,
+    detect_encoding,
+    format_bytes,
+    month_categorical,
+    sniff_csv_format,
+    sort_by_time,
+    validate_columns,
+)
+from utils.dimensions import add_region_column
+from utils.schema import COLUMN_SCHEMA, NUMERIC, NUMERIC_COLUMNS, CATEGORICAL_COLUMNS, TIME_DTYPE, parse_options
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+
+PANDAS = 'pandas'
+POLARS = 'polars'
+
+# Pipeline default, bisa diubah lewat environment variable
+DEFAULT_PIPELINE = os.environ.get('ECOMMERCE_PIPELINE', PANDAS).lower()
+
+# Nilai yang dibaca sebagai kosong, sama dengan default pandas.read_csv
+NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+# Kolom bantu sementara di rencana lazy (diganti kategori Bulan/Hari di pandas)
+_MONTH_INDEX = '__month_index'
+_DAY_OF_WEEK = '__day_of_week'
+
+
+def is_available() -> bool:
+    """Cek apakah polars tersedia untuk pipeline lazy"""
+    return pl is not None
+
+
+def available_pipelines() -> list:
+    """Pipeline yang bisa dipilih di lingkungan ini"""
+    return [PANDAS, POLARS] if is_available() else [PANDAS]
+
+
+def get_pipeline() -> str:
+    """
+    Pipeline aktif: pilihan sesi (sidebar), lalu ECOMMERCE_PIPELINE, lalu pandas
+
+    Returns:
+        PANDAS atau POLARS; POLARS hanya jika polars terpasang
+    """
+    pipeline = st.session_state.get('load_pipeline', DEFAULT_PIPELINE) if st.runtime.exists() else DEFAULT_PIPELINE
+    return pipeline if pipeline in available_pipelines() else PANDAS
+
+
+def sniff_source(source) -> Optional[Tuple[str, float, str, list]]:
+    """
+    Deteksi format sumber dan cek apakah bisa dibaca Polars
+
+    Args:
+        source: Path file atau file-like object
+
+    Returns:
+        Tuple (encoding, keyakinan, delimiter, header), atau None jika sumber
+        harus dibaca lewat jalur pandas
+    """
+    encoding, confidence = detect_encoding(source)
+    # Parser Polars hanya membaca UTF-8 (BOM dilewati otomatis)
+    if encoding not in ('utf-8', 'utf-8-sig'):
+        return None
+
+    sample = _read_prefix(source).decode(encoding, errors='replace')
+    delimiter, has_header, skipinitialspace = sniff_csv_format(sample)
+    if not has_header or skipinitialspace or len(delimiter) != 1:
+        return None
+    return encoding, confidence, delimiter, _parse_header(sample, delimiter, skipinitialspace)
+
+
+def _scan(source, delimiter: str, columns: Sequence[str]) -> 'pl.LazyFrame':
+    """
+    LazyFrame CSV: kolom numerik skema di-parse sebagai Float64, kolom skema lain teks
+
+    Nilai numerik yang tidak valid menjadi null (lalu 0), seperti
+    pd.to_numeric(errors='coerce') di clean_and_transform. Kolom di luar skema
+    diberi tipe lewat inferensi atas seluruh file (termasuk tanggal), seperti
+    inferensi parser CSV di jalur pandas.
+    """
+    if not _is_path(source):
+        source.seek(0)
+        source = source.read()
+
+    extras = [col for col in columns if col not in COLUMN_SCHEMA]
+    return pl.scan_csv(
+        source,
+        separator=delimiter,
+        has_header=True,
+        infer_schema=bool(extras),
+        infer_schema_length=None,
+        try_parse_dates=bool(extras),
+        schema_overrides={
+            col: pl.Float64 if COLUMN_SCHEMA[col][0] == NUMERIC else pl.String
+            for col in columns if col in COLUMN_SCHEMA
+        },
+        null_values=NA_VALUES,
+        encoding='utf8-lossy',
+        truncate_ragged_lines=True,
+        ignore_errors=True,
+    )
+
+
+def build_plan(lf: 'pl.LazyFrame', columns: Sequence[str], compact: bool = False) -> 'pl.LazyFrame':
+    """
+    Rencana lazy padanan clean_and_transform (tanpa kolom kategori dan Regional)
+
+    Args:
+        lf: LazyFrame mentah dari _scan
+        columns: Kolom yang dibaca dari file (urutan header)
+        compact: Mode hemat memori (kolom kategorikal sebagai Categorical,
+            order_id sintetis berupa integer)
+
+    Returns:
+        LazyFrame dengan urutan kolom akhir; Bulan dan Hari masih berupa
+        indeks bulan dan nomor hari di kolom bantu
+    """
+    columns = list(columns)
+    plan = lf.select(columns)
+    output = list(columns)
+
+    expressions = []
+    for col in NUMERIC_COLUMNS:
+        if col in columns:
+            expressions.append(pl.col(col).fill_nan(0).fill_null(0))
+    for col in CATEGORICAL_COLUMNS:
+        if col in columns:
+            value = pl.col(col).fill_null('Tidak Diketahui')
+            # Categorical membuat pengurutan cukup memindahkan kode, bukan string
+            expressions.append(value.cast(pl.Categorical) if compact else value)
+
+    if 'order_id' not in columns:
+        row_number = pl.int_range(1, pl.len() + 1, dtype=pl.Int32)
+        if compact:
+            # ID sintetis berupa integer, jauh lebih ringan daripada string
+            expressions.append(row_number.alias('order_id'))
+        else:
+            expressions.append(pl.format('ORD_{}', row_number.cast(pl.String).str.zfill(7)).alias('order_id'))
+        output.append('order_id')
+
+    timestamps = pl.col('Waktu Pesanan Dibuat').str.strip_chars().str.to_datetime(time_unit='us', strict=False)
+    expressions.append(timestamps.alias('Waktu Pesanan Dibuat'))
+    plan = plan.with_columns(expressions)
+
+    timestamps = pl.col('Waktu Pesanan Dibuat')
+    plan = plan.with_columns(
+        timestamps.dt.truncate('1d').alias('Tanggal'),
+        (timestamps.dt.year() * 12 + timestamps.dt.month() - 1).alias(_MONTH_INDEX),
+        timestamps.dt.year().alias('Tahun'),
+        (timestamps.dt.weekday() - 1).alias(_DAY_OF_WEEK),
+    )
+    output += ['Tanggal', _MONTH_INDEX, 'Tahun', _DAY_OF_WEEK]
+
+    # Kolom yang tidak ada di file diisi nilai default
+    missing = [pl.lit(0, dtype=pl.Int64).alias(col) for col in NUMERIC_COLUMNS if col not in columns]
+    missing += [pl.lit('Tidak Diketahui').alias(col) for col in CATEGORICAL_COLUMNS if col not in columns]
+    if missing:
+        plan = plan.with_columns(missing)
+    output += [expression.meta.output_name() for expression in missing]
+
+    # Urutan waktu stabil dengan waktu kosong di akhir, seperti sort_by_time
+    return plan.sort('Waktu Pesanan Dibuat', nulls_last=True, maintain_order=True).select(output)
+
+
+def _to_pandas(result: 'pl.DataFrame') -> pd.DataFrame:
+    """DataFrame Polars → pandas dengan dtype, kategori Bulan/Hari, dan Regional seperti jalur pandas"""
+    dates = [col for col, dtype in result.schema.items() if dtype == pl.Date]
+    df = result.to_pandas()
+
+    # Tanggal tanpa jam dibaca pandas sebagai objek datetime.date
+    for col in dates:
+        df[col] = pd.Series(result[col].to_list(), index=df.index, dtype=object)
+
+    # Resolusi datetime dibakukan seperti clean_and_transform
+    for col in df.columns:
+        if df[col].dtype.kind == 'M' and df[col].dtype != TIME_DTYPE:
+            df[col] = df[col].astype(TIME_DTYPE)
+
+    # Categorical Polars berurutan kemunculan; astype('category') di pandas terurut nilai
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+
+    position = df.columns.get_loc(_MONTH_INDEX)
+    df.insert(position, 'Bulan', month_categorical(df.pop(_MONTH_INDEX)))
+    position = df.columns.get_loc(_DAY_OF_WEEK)
+    df.insert(position, 'Hari', day_categorical(df.pop(_DAY_OF_WEEK)))
+
+    # Regional dari tabel dimensi provinsi (lookup per kategori, bukan per baris)
+    add_region_column(df)
+    if 'num_product_categories' not in df.columns:
+        df['num_product_categories'] = 1
+    return df
+
+
+def load_clean_csv(
+    source,
+    extra_columns: Optional[Sequence[str]] = (),
+    compact: bool = False
+) -> Optional[Tuple[Optional[pd.DataFrame], str]]:
+    """
+    Load → validasi → clean dalam satu rencana Polars lazy
+
+    Args:
+        source: Path file atau file-like object
+        extra_columns: Kolom tambahan di luar skema, None untuk memuat semua kolom
+        compact: Mode hemat memori
+
+    Returns:
+        Tuple (DataFrame bersih atau None, pesan), atau None jika sumber tidak
+        didukung Polars dan harus dimuat lewat jalur pandas
+    """
+    sniffed = sniff_source(source)
+    if sniffed is None:
+        return None
+    encoding, confidence, delimiter, header = sniffed
+
+    columns = parse_options(header, extra_columns)['usecols']
+
+    # Kolom wajib dicek dari header, sebelum file di-parse
+    is_valid, message = validate_columns(columns)
+    if not is_valid:
+        return None, message
+
+    try:
+        result = build_plan(_scan(source, delimiter, columns), columns, compact).collect()
+    except Exception as e:
+        st.error(f"❌ Gagal membaca file CSV dengan Polars: {str(e)}")
+        return None, "Gagal memuat data"
+
+    is_valid, message = validate_columns(columns, result.height)
+    if not is_valid:
+        return None, message
+
+    st.success(f"✅ File berhasil dibaca dengan Polars ({result.height:,} baris, encoding: {encoding}, keyakinan: {confidence:.0%})")
+    if 'order_id' not in columns:
+        st.info("ℹ️ Kolom 'order_id' dibuat otomatis")
+
+    df = _to_pandas(result)
+    del result
+
+    if compact:
+        before = df.memory_usage(deep=True).sum()
+        df = compact_dataframe(df)
+        after = df.memory_usage(deep=True).sum()
+        st.info(f"💾 Mode hemat memori: {format_bytes(before)} → {format_bytes(after)} ({1 - after / before:.0%} lebih kecil)")
+
+    # Sudah terurut di rencana: hanya pengecekan linear dan penanda attrs
+    df = sort_by_time(df)
+
+    df.attrs['encoding'] = encoding
+    df.attrs['encoding_confidence'] = confidence
+    df.attrs['csv_engine'] = POLARS
+    df.attrs['memory_bytes'] = int(df.memory_usage(deep=True).sum())
+    return df, message
+
+
+def pipeline_for(
+    source,
+    extra_columns: Optional[Sequence[str]] = (),
+    compact: bool = False
+) -> Optional[Callable[[], Optional[Tuple[Optional[pd.DataFrame], str]]]]:
+    """
+    Argumen pipeline untuk load_clean_dataset/open_dataset sesuai pipeline aktif
+
+    Args:
+        source: Path file atau file-like object
+        extra_columns: Kolom tambahan di luar skema, None untuk memuat semua kolom
+        compact: Mode hemat memori
+
+    Returns:
+        Fungsi tanpa argumen untuk pipeline Polars, atau None untuk jalur pandas
+    """
+    if get_pipeline() != POLARS:
+        return None
+
+    # Nama fungsi ikut menjadi bagian kunci cache (lihat clean_cache_key)
+    def polars():
+        return load_clean_csv(source, extra_columns, compact)
+    return polars
@@ -0,0 +1,116 @@
+"""
+Registry skema kolom dataset e-commerce
+
+Satu sumber kebenaran untuk kolom yang dipakai dashboard: peran kolom
+(wajib/opsional), jenisnya (numerik, kategorikal, tanggal), dan dtype yang
+diberikan langsung ke parser CSV.
+"""
+from typing import Dict, List, Optional, Sequence
+
+
+NUMERIC = 'numeric'
+CATEGORICAL = 'categorical'
+DATETIME = 'datetime'
+IDENTIFIER = 'identifier'
+
+# Registry kolom: nama -> (jenis, wajib)
+COLUMN_SCHEMA = {
+    'order_id': (IDENTIFIER, False),
+    'Waktu Pesanan Dibuat': (DATETIME, True),
+    'total_qty': (NUMERIC, True),
+    'total_weight_gr': (NUMERIC, False),
+    'total_returned_qty': (NUMERIC, False),
+    'Total Diskon': (NUMERIC, False),
+    'Total Pembayaran': (NUMERIC, True),
+    'Ongkos Kirim Dibayar oleh Pembeli': (NUMERIC, False),
+    'Perkiraan Ongkos Kirim': (NUMERIC, False),
+    'Estimasi Potongan Biaya Pengiriman': (NUMERIC, False),
+    'num_product_categories': (NUMERIC, False),
+    'product_categories': (CATEGORICAL, False),
+    'Status Pesanan': (CATEGORICAL, False),
+    'Opsi Pengiriman': (CATEGORICAL, False),
+    'Metode Pembayaran': (CATEGORICAL, False),
+    'Kota/Kabupaten': (CATEGORICAL, False),
+    'Provinsi': (CATEGORICAL, False),
+}
+
+# dtype per jenis kolom saat parsing (tanggal ditangani lewat parse_dates)
+PARSE_DTYPES = {
+    NUMERIC: 'float64',
+    CATEGORICAL: str,
+    IDENTIFIER: str,
+}
+
+
+def columns_of(kind: Optional[str] = None, required: Optional[bool] = None) -> List[str]:
+    """
+    Mengambil daftar kolom dari registry berdasarkan jenis dan/atau peran
+
+    Args:
+        kind: Jenis kolom (NUMERIC, CATEGORICAL, DATETIME, IDENTIFIER), None untuk semua
+        required: True hanya kolom wajib, False hanya kolom opsional, None untuk semua
+
+    Returns:
+        Daftar nama kolom sesuai urutan registry
+    """
+    return [
+        name for name, (col_kind, col_required) in COLUMN_SCHEMA.items()
+        if (kind is None or col_kind == kind) and (required is None or col_required == required)
+    ]
+
+
+# Kolom yang diperlukan (core columns)
+REQUIRED_COLUMNS = columns_of(required=True)
+
+# Kolom opsional tapi penting
+OPTIONAL_COLUMNS = columns_of(required=False)
+
+# Kolom numerik yang dibersihkan di clean_and_transform
+NUMERIC_COLUMNS = [col for col in columns_of(NUMERIC) if col != 'num_product_categories']
+
+# Resolusi semua kolom datetime setelah dibersihkan, sama di pipeline pandas,
+# Polars, dan dataset terpartisi (tidak bergantung parser CSV)
+TIME_DTYPE = 'datetime64[us]'
+
+# Kolom kategorikal yang nilai kosongnya diisi 'Tidak Diketahui'
+CATEGORICAL_COLUMNS = columns_of(CATEGORICAL)
+
+# dtype ringkas untuk mode hemat memori. Kolom uang tidak diturunkan ke float32
+# agar total pendapatan tetap presisi; kolom uang bernilai bulat dijadikan integer
+COMPACT_DTYPES = {
+    'total_qty': 'int32',
+    'total_returned_qty': 'int32',
+    'num_product_categories': 'int16',
+    'total_weight_gr': 'float32',
+}
+
+
+def parse_options(header: Sequence[str], extra_columns: Optional[Sequence[str]] = ()) -> Dict:
+    """
+    Menyusun argumen read_csv (usecols, dtype, parse_dates) dari registry
+
+    Args:
+        header: Nama kolom pada header file
+        extra_columns: Kolom tambahan di luar registry yang ingin dimuat,
+            None berarti muat semua kolom
+
+    Returns:
+        Dictionary argumen untuk pd.read_csv
+    """
+    header = list(header)
+
+    # Header tanpa kolom wajib: muat semua agar pesan validasi menampilkan kolom asli
+    if extra_columns is None or not any(col in header for col in REQUIRED_COLUMNS):
+        usecols = header
+    else:
+        wanted = set(COLUMN_SCHEMA) | set(extra_columns)
+        usecols = [col for col in header if col in wanted]
+
+    dtype = {
+        col: PARSE_DTYPES[COLUMN_SCHEMA[col][0]]
+        for col in usecols
+        if col in COLUMN_SCHEMA and COLUMN_SCHEMA[col][0] in PARSE_DTYPES
+    }
+    parse_dates = [col for col in columns_of(DATETIME) if col in usecols]
+
+    return {'usecols': usecols, 'dtype': dtype, 'parse_dates': parse_dates}
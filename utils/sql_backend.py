@@ -0,0 +1,231 @@
+"""
+Backend eksekusi agregasi: pandas/NumPy (default) atau DuckDB (opsional)
+
+Dengan backend DuckDB, DataFrame didaftarkan ke database DuckDB in-process
+(tanpa salinan; kolom kategorikal terbaca sebagai ENUM) lalu agregasi
+dijalankan sebagai SQL yang tervektorisasi dan multi-thread. Semua cuboid
+cube dihitung dalam satu scan lewat GROUPING SETS. Hasilnya mengikuti
+semantik group_aggregate dan bin_totals (kolom, urutan, dtype), sehingga
+komponen tidak perlu tahu backend mana yang dipakai.
+
+Backend dipilih lewat environment variable ECOMMERCE_BACKEND atau dari
+sidebar; DuckDB tidak wajib dipasang.
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+
+PANDAS = 'pandas'
+DUCKDB = 'duckdb'
+
+# Backend default, bisa diubah lewat environment variable
+DEFAULT_BACKEND = os.environ.get('ECOMMERCE_BACKEND', PANDAS).lower()
+
+
+def is_available() -> bool:
+    """Cek apakah duckdb tersedia untuk backend SQL"""
+    return duckdb is not None
+
+
+def available_backends() -> List[str]:
+    """Backend yang bisa dipilih di lingkungan ini"""
+    return [PANDAS, DUCKDB] if is_available() else [PANDAS]
+
+
+def get_backend() -> str:
+    """
+    Backend aktif: pilihan sesi (sidebar), lalu ECOMMERCE_BACKEND, lalu pandas
+
+    Returns:
+        PANDAS atau DUCKDB; DUCKDB hanya jika duckdb terpasang
+    """
+    backend = st.session_state.get('backend', DEFAULT_BACKEND) if st.runtime.exists() else DEFAULT_BACKEND
+    return backend if backend in available_backends() else PANDAS
+
+
+_connection = None
+_connection_lock = threading.Lock()
+
+
+def _cursor():
+    """Cursor baru pada database DuckDB in-memory milik proses (aman dipakai antar thread)"""
+    global _connection
+    with _connection_lock:
+        if _connection is None:
+            _connection = duckdb.connect(':memory:')
+        return _connection.cursor()
+
+
+def _quote(name: str) -> str:
+    """Identifier SQL dengan tanda kutip ganda"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _aggregate_expressions(df: pd.DataFrame, agg: Dict[str, Union[str, List[str]]]) -> Tuple[List[str], List[str]]:
+    """Ekspresi SQL dan nama kolom hasil untuk dict agregasi group_aggregate"""
+    expressions, names = [], []
+    for col, funcs in agg.items():
+        func_list = [funcs] if isinstance(funcs, str) else list(funcs)
+        column = _quote(col)
+        is_integer = df[col].dtype.kind in 'iub'
+
+        for func in func_list:
+            if func == 'size':
+                expression = 'COUNT(*)'
+            elif func == 'count':
+                expression = f'COUNT({column})'
+            elif func == 'sum':
+                # Jumlah grup tanpa nilai adalah 0, seperti bincount berbobot
+                expression = f'COALESCE(SUM(CAST({column} AS DOUBLE)), 0)'
+                if is_integer:
+                    expression = f'CAST({expression} AS BIGINT)'
+            elif func == 'mean':
+                expression = f'AVG(CAST({column} AS DOUBLE))'
+            elif func == 'nunique':
+                expression = f'COUNT(DISTINCT {column})'
+            else:
+                raise ValueError(f"Fungsi agregasi '{func}' tidak didukung backend DuckDB")
+
+            expressions.append(expression)
+            names.append(col if isinstance(funcs, str) else f"{col}_{func}")
+    return expressions, names
+
+
+def _restore_keys(result: pd.DataFrame, df: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    """Kembalikan dtype kolom kunci seperti di DataFrame sumber lalu urutkan menurut kunci"""
+    for key in keys:
+        dtype = df[key].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            result[key] = pd.Categorical(result[key].astype(object), dtype=dtype)
+        else:
+            result[key] = result[key].astype(dtype)
+    # Kategori terurut menurut kode, kolom lain menurut nilai (sama dengan factorize terurut)
+    return result.sort_values(list(keys), kind='stable').reset_index(drop=True)
+
+
+def grouping_sets(
+    df: pd.DataFrame,
+    groupings: Sequence[Tuple[str, ...]],
+    agg: Dict[str, Union[str, List[str]]]
+) -> Dict[Tuple[str, ...], pd.DataFrame]:
+    """
+    Beberapa group_aggregate sekaligus dalam satu query GROUPING SETS
+
+    Args:
+        df: DataFrame sumber
+        groupings: Daftar tuple kolom kunci
+        agg: Dictionary kolom → fungsi atau daftar fungsi (sum, mean, count, size, nunique)
+
+    Returns:
+        Dictionary tuple kunci → DataFrame dengan format yang sama seperti group_aggregate
+    """
+    groupings = [tuple(dims) for dims in groupings]
+    all_keys = list(dict.fromkeys(key for dims in groupings for key in dims))
+    expressions, names = _aggregate_expressions(df, agg)
+
+    # GROUPING(...) memberi bit 1 untuk kunci yang tidak ikut dikelompokkan
+    key_list = ', '.join(_quote(key) for key in all_keys)
+    sets = ', '.join('(' + ', '.join(_quote(key) for key in dims) + ')' for dims in groupings)
+    select = ', '.join([key_list, f'GROUPING({key_list}) AS _grouping'] + [
+        f'{expression} AS {_quote(name)}' for expression, name in zip(expressions, names)
+    ])
+    query = f'SELECT {select} FROM frame GROUP BY GROUPING SETS ({sets})'
+
+    cursor = _cursor()
+    try:
+        # Hanya kolom yang dipakai query yang didaftarkan (tanpa salinan)
+        cursor.register('frame', df[all_keys + [col for col in agg if col not in all_keys]])
+        result = cursor.execute(query).df()
+    finally:
+        cursor.close()
+
+    grouping_ids = result.pop('_grouping').to_numpy()
+    width = len(all_keys)
+    cuboids = {}
+    for dims in groupings:
+        grouping_id = sum(1 << (width - 1 - i) for i, key in enumerate(all_keys) if key not in dims)
+        part = result.loc[grouping_ids == grouping_id, list(dims) + names]
+        # Grup dengan kunci kosong diabaikan, seperti group_aggregate
+        part = part.dropna(subset=list(dims)).reset_index(drop=True)
+        cuboids[dims] = _restore_keys(part, df, dims)
+    return cuboids
+
+
+def group_aggregate(
+    df: pd.DataFrame,
+    by: Union[str, Sequence[str]],
+    agg: Dict[str, Union[str, List[str]]]
+) -> pd.DataFrame:
+    """
+    Padanan SQL dari aggregation.group_aggregate
+
+    Args:
+        df: DataFrame sumber
+        by: Nama kolom kunci atau daftar kolom kunci
+        agg: Dictionary kolom → fungsi atau daftar fungsi
+
+    Returns:
+        DataFrame datar dengan format yang sama seperti group_aggregate
+    """
+    keys = (by,) if isinstance(by, str) else tuple(by)
+    return grouping_sets(df, [keys], agg)[keys]
+
+
+def bin_totals(
+    df: pd.DataFrame,
+    column: str,
+    edges: Sequence[float],
+    sum_column: Optional[str] = None
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Padanan SQL dari distributions.bin_totals (interval tertutup kanan (a, b])
+
+    Args:
+        df: DataFrame sumber
+        column: Kolom numerik yang di-bin
+        edges: Tepi bin menaik
+        sum_column: Kolom yang dijumlahkan per bin (opsional)
+
+    Returns:
+        Tuple (jumlah baris per bin, jumlah sum_column per bin atau None)
+    """
+    num_bins = len(edges) - 1
+    value = f'CAST({_quote(column)} AS DOUBLE)'
+
+    # Indeks bin lewat CASE berurutan; tepi ditulis sebagai literal DOUBLE (mendukung inf)
+    def literal(edge):
+        return f"CAST('{float(edge)!r}' AS DOUBLE)"
+
+    cases = ' '.join(f'WHEN {value} <= {literal(upper)} THEN {i}' for i, upper in enumerate(edges[1:]))
+    weight = f'COALESCE(SUM(CAST({_quote(sum_column)} AS DOUBLE)), 0)' if sum_column else '0'
+    query = (
+        f'SELECT CASE {cases} END AS bin, COUNT(*) AS count, {weight} AS total FROM frame '
+        f'WHERE {value} > {literal(edges[0])} AND {value} <= {literal(edges[-1])} '
+        f'GROUP BY bin'
+    )
+
+    cursor = _cursor()
+    try:
+        cursor.register('frame', df[[column] if sum_column is None else [column, sum_column]])
+        result = cursor.execute(query).df()
+    finally:
+        cursor.close()
+
+    index = result['bin'].to_numpy()
+    counts = np.zeros(num_bins, dtype='int64')
+    counts[index] = result['count'].to_numpy()
+    sums = None
+    if sum_column is not None:
+        sums = np.zeros(num_bins)
+        sums[index] = result['total'].to_numpy()
+    return counts, sums
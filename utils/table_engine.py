@@ -0,0 +1,227 @@
+"""
+Mesin tabel di server: urut, filter, dan pagination tanpa menyalin dataset
+
+Indeks urutan (argsort stabil) dihitung sekali per kolom dan arah lalu
+di-cache per dataset. Filter dievaluasi pada kode integer kolom kategorikal
+lewat tabel lookup boolean, bukan perbandingan string per baris. Hasil
+gabungan urutan + filter berupa array posisi baris; setiap halaman hanya
+mengambil potongan posisi itu sehingga yang disalin cuma baris halaman aktif.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.aggregation import _factorize
+from utils.data_processor import dataset_key
+from utils.schema import CATEGORICAL_COLUMNS
+
+
+# Batas jumlah nilai unik agar sebuah kolom ditawarkan sebagai filter
+FILTER_MAX_VALUES = 2000
+
+# Filter: tuple (kolom, tuple nilai yang dipertahankan), hashable untuk cache
+Filters = Tuple[Tuple[str, Tuple], ...]
+
+
+def _positions_dtype(num_rows: int) -> np.dtype:
+    """int32 untuk posisi baris jika cukup (separuh memori int64)"""
+    return np.dtype('int32') if num_rows < np.iinfo('int32').max else np.dtype('int64')
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _cached_codes(key: str, column: str, _df: pd.DataFrame) -> Tuple[np.ndarray, pd.Index]:
+    return _factorize(_df[column])
+
+
+def column_codes(df: pd.DataFrame, column: str) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Kode integer dan nilai unik sebuah kolom, di-cache per dataset
+
+    Kolom kategorikal memakai kode kategorinya langsung; kolom lain
+    di-factorize terurut sekali. Nilai kosong mendapat kode -1.
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        column: Nama kolom
+
+    Returns:
+        Tuple (kode per baris, nilai unik)
+    """
+    return _cached_codes(dataset_key(df), column, df)
+
+
+def filter_columns(df: pd.DataFrame) -> List[str]:
+    """
+    Kolom yang bisa difilter berdasarkan nilai
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+
+    Returns:
+        Kolom kategorikal (dtype category atau kolom kategorikal di skema)
+        dengan nilai unik paling banyak FILTER_MAX_VALUES
+    """
+    columns = []
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) or col in CATEGORICAL_COLUMNS:
+            if len(column_codes(df, col)[1]) <= FILTER_MAX_VALUES:
+                columns.append(col)
+    return columns
+
+
+def _sort_key(df: pd.DataFrame, column: str, ascending: bool) -> np.ndarray:
+    """
+    Kunci numerik untuk argsort; nilai kosong selalu di akhir
+
+    Urutan turun dibentuk dengan membalik kunci (bukan membalik hasil urut naik)
+    sehingga baris dengan nilai sama tetap dalam urutan aslinya.
+    """
+    series = df[column]
+    kind = series.dtype.kind
+
+    if isinstance(series.dtype, pd.CategoricalDtype) or kind in 'OSUb' or isinstance(series.dtype, pd.StringDtype):
+        # Kategori/teks: urutan kode (kategori atau hasil factorize terurut)
+        codes, uniques = column_codes(df, column)
+        codes = codes.astype('int64')
+        key = codes if ascending else len(uniques) - 1 - codes
+        return np.where(codes < 0, len(uniques), key)
+
+    if kind == 'M':
+        values = series.to_numpy().view('int64')
+        missing = series.isna().to_numpy()
+        key = values if ascending else ~values
+        return np.where(missing, np.iinfo('int64').max, key)
+
+    if kind in 'iu':
+        values = series.to_numpy()
+        return values if ascending else ~values.astype('int64')
+
+    # Float dan numerik nullable: NaN otomatis di akhir argsort
+    values = series.to_numpy(dtype='float64', na_value=np.nan)
+    return values if ascending else -values
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _cached_sort_index(key: str, column: str, ascending: bool, _df: pd.DataFrame) -> np.ndarray:
+    order = np.argsort(_sort_key(_df, column, ascending), kind='stable')
+    return order.astype(_positions_dtype(len(_df)), copy=False)
+
+
+def sort_index(df: pd.DataFrame, column: str, ascending: bool = True) -> np.ndarray:
+    """
+    Posisi baris terurut menurut sebuah kolom (stabil, nilai kosong di akhir)
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        column: Kolom pengurut
+        ascending: Urutan naik (True) atau turun (False)
+
+    Returns:
+        Array posisi baris; dipakai bersama, jangan diubah
+    """
+    return _cached_sort_index(dataset_key(df), column, ascending, df)
+
+
+def filter_mask(df: pd.DataFrame, filters: Filters) -> Optional[np.ndarray]:
+    """
+    Mask baris yang lolos semua filter (AND antar kolom, OR antar nilai)
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        filters: Tuple (kolom, nilai yang dipertahankan)
+
+    Returns:
+        Mask boolean, atau None jika tidak ada filter
+    """
+    mask = None
+    for column, values in filters:
+        codes, uniques = column_codes(df, column)
+
+        # Lookup per kode; slot terakhir (kode -1 = kosong) tidak pernah lolos
+        lookup = np.zeros(len(uniques) + 1, dtype=bool)
+        positions = uniques.get_indexer(list(values))
+        lookup[positions[positions >= 0]] = True
+
+        column_mask = lookup[codes]
+        mask = column_mask if mask is None else mask & column_mask
+    return mask
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _cached_view(
+    key: str,
+    sort_by: Optional[str],
+    ascending: bool,
+    filters: Filters,
+    _df: pd.DataFrame
+) -> Optional[np.ndarray]:
+    mask = filter_mask(_df, filters)
+
+    if sort_by is None:
+        if mask is None:
+            return None
+        return np.flatnonzero(mask).astype(_positions_dtype(len(_df)), copy=False)
+
+    order = sort_index(_df, sort_by, ascending)
+    if mask is None:
+        return order
+    return order[mask[order]]
+
+
+def table_view(
+    df: pd.DataFrame,
+    sort_by: Optional[str] = None,
+    ascending: bool = True,
+    filters: Filters = ()
+) -> Optional[np.ndarray]:
+    """
+    Posisi baris hasil filter lalu urut, di-cache per dataset dan pengaturannya
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        sort_by: Kolom pengurut, None untuk urutan asli
+        ascending: Urutan naik atau turun
+        filters: Tuple (kolom, tuple nilai yang dipertahankan)
+
+    Returns:
+        Array posisi baris, atau None jika tanpa urut dan filter (semua baris apa adanya)
+    """
+    return _cached_view(dataset_key(df), sort_by, ascending, filters, df)
+
+
+def table_page(
+    df: pd.DataFrame,
+    columns: Sequence[str],
+    page: int,
+    rows_per_page: int,
+    sort_by: Optional[str] = None,
+    ascending: bool = True,
+    filters: Filters = ()
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Satu halaman tabel setelah filter dan urut
+
+    Args:
+        df: DataFrame yang sudah dibersihkan
+        columns: Kolom yang ditampilkan
+        page: Nomor halaman (mulai dari 1)
+        rows_per_page: Jumlah baris per halaman
+        sort_by: Kolom pengurut, None untuk urutan asli
+        ascending: Urutan naik atau turun
+        filters: Tuple (kolom, tuple nilai yang dipertahankan)
+
+    Returns:
+        Tuple (DataFrame halaman dengan index asli, jumlah baris yang lolos filter)
+    """
+    view = table_view(df, sort_by, ascending, filters)
+    total_rows = len(df) if view is None else len(view)
+
+    start = (page - 1) * rows_per_page
+    end = min(start + rows_per_page, total_rows)
+    positions = np.arange(start, end) if view is None else view[start:end]
+
+    # Hanya baris halaman ini dan kolom terpilih yang disalin
+    page_df = df.iloc[positions, df.columns.get_indexer(list(columns))]
+    return page_df, total_rows
@@ -0,0 +1,171 @@
+"""
+Deret waktu multi-resolusi untuk grafik tren
+
+Rollup harian, mingguan, dan bulanan dihitung sekali per dataset dari cuboid
+`Tanggal` di cube agregat. Grafik meminta rentang tanggal tertentu dan
+mendapat resolusi paling halus yang masih muat dalam batas jumlah titik;
+jika tetap terlalu panjang, deret diperkecil dengan min/max per bucket
+sehingga puncak dan lembah tetap terlihat.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.aggregation import get_cube
+from utils.data_processor import dataset_key
+
+
+# Resolusi dari paling halus ke paling kasar → aturan resample pandas
+RESOLUTIONS = {
+    'Harian': 'D',
+    'Mingguan': 'W-MON',
+    'Bulanan': 'MS',
+}
+
+AUTO_RESOLUTION = 'Otomatis'
+
+# Batas default jumlah titik per trace
+MAX_POINTS = 500
+
+
+def minmax_downsample(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Indeks titik yang dipertahankan: minimum dan maksimum tiap bucket
+
+    Bucket dibentuk berdasarkan posisi, jadi y harus sudah terurut menurut x.
+
+    Args:
+        y: Nilai sumbu y
+        max_points: Batas jumlah titik hasil (minimal 4)
+
+    Returns:
+        Array indeks terurut, selalu memuat titik pertama dan terakhir
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    # Titik pertama/terakhir dipertahankan; sisanya dibagi ke bucket berukuran sama
+    num_buckets = max(1, (max_points - 2) // 2)
+    bucket = (np.arange(n - 2) * num_buckets) // (n - 2)
+    inner = np.arange(1, n - 1)
+
+    # Urut per bucket lalu per nilai: elemen pertama = argmin, terakhir = argmax
+    order = inner[np.lexsort((y[1:-1], bucket))]
+    sizes = np.bincount(bucket, minlength=num_buckets)
+    ends = np.cumsum(sizes)
+    starts = ends - sizes
+
+    keep = np.concatenate(([0], order[starts], order[ends - 1], [n - 1]))
+    return np.unique(keep)
+
+
+class TimeSeriesStore:
+    """
+    Rollup ukuran aditif per hari, minggu, dan bulan
+
+    Tiap level adalah DataFrame dengan kolom 'Tanggal' (awal periode) lalu
+    kolom ukuran, terurut menurut tanggal.
+    """
+
+    def __init__(self, levels: Dict[str, pd.DataFrame]):
+        self._levels = levels
+
+    @property
+    def resolutions(self) -> List[str]:
+        """Nama resolusi yang tersedia, dari paling halus"""
+        return list(self._levels)
+
+    def date_range(self) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        """Tanggal pertama dan terakhir pada level harian"""
+        daily = self._levels['Harian']
+        if daily.empty:
+            return None, None
+        return daily['Tanggal'].iloc[0], daily['Tanggal'].iloc[-1]
+
+    def _slice(self, resolution: str, start, end) -> pd.DataFrame:
+        """Periode yang beririsan dengan [start, end] lewat searchsorted"""
+        level = self._levels[resolution]
+        dates = level['Tanggal'].to_numpy()
+        lower = 0
+        if start is not None:
+            # Periode yang dimulai sebelum start tetap diambil bila mencakup start
+            lower = max(np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side='right') - 1, 0)
+        upper = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side='right')
+        return level.iloc[lower:upper]
+
+    def series(
+        self,
+        measure: str,
+        start=None,
+        end=None,
+        resolution: str = AUTO_RESOLUTION,
+        max_points: int = MAX_POINTS
+    ) -> Tuple[pd.DataFrame, str]:
+        """
+        Deret satu ukuran untuk rentang tanggal dengan jumlah titik terbatas
+
+        Args:
+            measure: Nama kolom ukuran
+            start: Tanggal awal (inklusif), None dari awal data
+            end: Tanggal akhir (inklusif), None sampai akhir data
+            resolution: Nama resolusi atau AUTO_RESOLUTION untuk resolusi
+                paling halus yang muat dalam max_points
+            max_points: Batas jumlah titik
+
+        Returns:
+            Tuple (DataFrame kolom 'Tanggal' dan measure, resolusi yang dipakai)
+        """
+        if resolution == AUTO_RESOLUTION:
+            for resolution in self._levels:
+                if len(self._slice(resolution, start, end)) <= max_points:
+                    break
+
+        frame = self._slice(resolution, start, end)[['Tanggal', measure]]
+        if len(frame) > max_points:
+            keep = minmax_downsample(frame[measure].to_numpy(), max_points)
+            frame = frame.iloc[keep]
+        return frame.reset_index(drop=True), resolution
+
+
+def build_timeseries(daily: pd.DataFrame) -> TimeSeriesStore:
+    """
+    Membangun rollup multi-resolusi dari ukuran harian
+
+    Args:
+        daily: DataFrame kolom 'Tanggal' (datetime64, awal hari) lalu kolom ukuran aditif
+
+    Returns:
+        TimeSeriesStore
+    """
+    daily = daily.dropna(subset=['Tanggal']).sort_values('Tanggal')
+    indexed = daily.set_index('Tanggal')
+
+    levels = {}
+    for name, rule in RESOLUTIONS.items():
+        if rule == 'D':
+            levels[name] = daily.reset_index(drop=True)
+            continue
+        # Minggu diberi label hari Senin (awal minggu), bulan diberi label tanggal 1
+        levels[name] = indexed.resample(rule, label='left', closed='left').sum().reset_index()
+    return TimeSeriesStore(levels)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _cached_timeseries(key: str, _df: pd.DataFrame) -> TimeSeriesStore:
+    return build_timeseries(get_cube(_df).query('Tanggal'))
+
+
+def get_timeseries(df: pd.DataFrame) -> TimeSeriesStore:
+    """
+    Deret waktu multi-resolusi untuk dataset, di-cache per fingerprint
+
+    Args:
+        df: DataFrame yang sudah dibersihkan (harus memiliki kolom 'Tanggal')
+
+    Returns:
+        TimeSeriesStore yang dipakai bersama; jangan diubah
+    """
+    return _cached_timeseries(dataset_key(df), df)